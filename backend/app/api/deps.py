@@ -3,13 +3,15 @@
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from jose import JWTError
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.core.security import decode_token
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from app.schemas.user import TokenPayload
+from app.services.principal_cache import Principal, principal_cache
 
 
 # Security scheme
@@ -19,16 +21,20 @@ security = HTTPBearer()
 def get_current_user(
     db: Session = Depends(get_db),
     credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
+) -> Principal:
     """
     Get current authenticated user.
 
+    The user is read through the principal cache, so most requests run no
+    query here. Handlers that need the ORM row (relationships, writes) load
+    it themselves by ``current_user.id``.
+
     Args:
         db: Database session
         credentials: JWT token from Authorization header
 
     Returns:
-        User: Current authenticated user
+        Principal: Current authenticated user
 
     Raises:
         HTTPException: If authentication fails
@@ -52,7 +58,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == int(token_data.sub)).first()
+    user = principal_cache.get(db, int(token_data.sub))
     if not user:
         # 401 (not 404) so clients treat a deleted/invalid subject as an auth
         # failure and trigger refresh / re-login instead of a hard error.
@@ -72,8 +78,8 @@ def get_current_user(
 
 
 def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
     """
     Get current active user.
 
@@ -81,7 +87,7 @@ def get_current_active_user(
         current_user: Current authenticated user
 
     Returns:
-        User: Current active user
+        Principal: Current active user
 
     Raises:
         HTTPException: If user is inactive
@@ -95,8 +101,8 @@ def get_current_active_user(
 
 
 def get_current_vendor(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: Principal = Depends(get_current_active_user)
+) -> Principal:
     """
     Get current vendor user.
 
@@ -104,7 +110,7 @@ def get_current_vendor(
         current_user: Current authenticated user
 
     Returns:
-        User: Current vendor user
+        Principal: Current vendor user; ``vendor_id`` is always set
 
     Raises:
         HTTPException: If user is not a vendor
@@ -115,10 +121,10 @@ def get_current_vendor(
             detail="Not enough permissions"
         )
 
-    # Vendor-scoped endpoints dereference vendor_profile downstream. Admins have
-    # no vendor_profile, so require it for ANY caller of this dependency — returns
-    # a clean 403 instead of a 500 AttributeError. Admins use the admin API.
-    if not current_user.vendor_profile:
+    # Vendor-scoped endpoints scope their queries by vendor_id downstream. Admins
+    # have no vendor profile, so require it for ANY caller of this dependency —
+    # returns a clean 403 instead of matching nothing. Admins use the admin API.
+    if current_user.vendor_id is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Vendor profile required for this endpoint"
@@ -128,8 +134,8 @@ def get_current_vendor(
 
 
 def get_current_admin(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+    current_user: Principal = Depends(get_current_active_user)
+) -> Principal:
     """
     Get current admin user.
 
@@ -137,7 +143,7 @@ def get_current_admin(
         current_user: Current authenticated user
 
     Returns:
-        User: Current admin user
+        Principal: Current admin user
 
     Raises:
         HTTPException: If user is not an admin
@@ -150,10 +156,23 @@ def get_current_admin(
     return current_user
 
 
+def _optional_subject(credentials: Optional[HTTPAuthorizationCredentials]) -> Optional[int]:
+    """User id of a valid access token, or None."""
+    if not credentials:
+        return None
+    try:
+        token_data = TokenPayload(**decode_token(credentials.credentials))
+        if token_data.type != "access":
+            return None
+        return int(token_data.sub)
+    except (JWTError, ValueError):
+        return None
+
+
 def get_optional_current_user(
     db: Session = Depends(get_db),
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
-) -> Optional[User]:
+) -> Optional[Principal]:
     """
     Get current user if authenticated, otherwise None.
 
@@ -162,23 +181,27 @@ def get_optional_current_user(
         credentials: Optional JWT token
 
     Returns:
-        Optional[User]: Current user or None
+        Optional[Principal]: Current user or None
     """
-    if not credentials:
+    user_id = _optional_subject(credentials)
+    if user_id is None:
         return None
+    user = principal_cache.get(db, user_id)
+    return user if user and user.is_active else None
 
-    try:
-        token = credentials.credentials
-        payload = decode_token(token)
-        token_data = TokenPayload(**payload)
-
-        if token_data.type != "access":
-            return None
 
-        user = db.query(User).filter(User.id == int(token_data.sub)).first()
-        if user and user.is_active:
-            return user
-    except (JWTError, ValueError):
-        pass
+async def get_optional_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+) -> Optional[Principal]:
+    """
+    get_optional_current_user for async endpoints.
 
-    return None
\ No newline at end of file
+    Shares the endpoint's async session and needs no threadpool hop; a
+    principal cache hit (or an anonymous request) touches no connection.
+    """
+    user_id = _optional_subject(credentials)
+    if user_id is None:
+        return None
+    user = await db.run_sync(principal_cache.get, user_id)
+    return user if user and user.is_active else None
@@ -1,42 +1,55 @@
 """Activity endpoints."""
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Header
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Header
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, cast, false, literal_column, Float
 from decimal import Decimal
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models import (
     Activity, Category, Destination, ActivityImage,
     ActivityCategory, ActivityDestination, ActivityHighlight,
-    ActivityInclude, ActivityFAQ, MeetingPoint, Vendor,
-    ActivityTimeline, ActivityTimeSlot, ActivityPricingTier,
-    ActivityAddOn, MeetingPointPhoto, ActivityTranslation,
-    DestinationTranslation, CategoryTranslation
+    ActivityInclude, ActivityFAQ, MeetingPoint, Vendor, ActivityFacet, ActivitySearchDocument
 )
 from app.schemas.activity import (
     ActivityResponse, ActivityDetailResponse, ActivitySearchParams,
     CategoryResponse, DestinationResponse, ActivityCreate, ActivityUpdate
 )
 from app.schemas.common import PaginationParams, PaginatedResponse
-from app.api.deps import get_optional_current_user, get_current_vendor
-from app.utils.translation import (
-    validate_language, get_translated_activity, get_translated_highlights,
-    get_translated_includes, get_translated_faqs, get_translated_timelines,
-    get_translated_pricing_tiers, get_translated_add_ons, get_translated_meeting_point
+from app.api.deps import get_optional_current_user, get_optional_current_user_async, get_current_vendor
+from app.services.activity_import import ActivityImporter, import_stream
+from app.services.activity_loader import (
+    ACTIVITY_DETAIL_OPTIONS, hydrate_activity_cards, load_activity_detail
 )
+from app.services.cache import activity_cache
+from app.services.child_sync import (
+    COLLECTIONS, MEETING_POINT_FIELDS, WriteCounts, sync_children, sync_links, sync_meeting_points
+)
+from app.services.facets import get_facet_counts, refresh_activity_facets
+from app.services.search_documents import document_cards, refresh_search_documents
+from app.services.search_index import apply_text_search, refresh_search_index
+from app.services.similarity import refresh_similarities, similar_activity_ids
+from app.services.stats import record_activity_created, record_activity_status
+from app.utils.pagination import paginate
+from app.utils.brands import BRAND_ORDER, BRAND_SENTINELS, brand_for_vendor
+from app.utils.translation import validate_language
 from slugify import slugify
 
 router = APIRouter()
 
 
 @router.get("/categories", response_model=List[CategoryResponse])
-def get_categories(
+async def get_categories(
     language: str = Query('en', description="Language for translation (en, es, zh, fr)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all categories."""
+    return await db.run_sync(_get_categories, language)
+
+
+def _get_categories(db: Session, language: str) -> List[CategoryResponse]:
     from app.utils.translation import get_translated_category, validate_language
     
     language = validate_language(language)
@@ -44,25 +57,29 @@ def get_categories(
     
     # Apply translations if needed
     if language == 'en':
-        return categories
+        return [CategoryResponse.model_validate(category) for category in categories]
     
     translated_categories = []
     for category in categories:
         translated_data = get_translated_category(category, language, db)
         # Create a mock category object for the response
         translated_category = type('Category', (), translated_data)()
-        translated_categories.append(translated_category)
+        translated_categories.append(CategoryResponse.model_validate(translated_category))
     
     return translated_categories
 
 
 @router.get("/destinations", response_model=List[DestinationResponse])
-def get_destinations(
+async def get_destinations(
     featured_only: bool = False,
     language: str = Query('en', description="Language for translation (en, es, zh, fr)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all destinations."""
+    return await db.run_sync(_get_destinations, featured_only, language)
+
+
+def _get_destinations(db: Session, featured_only: bool, language: str) -> List[DestinationResponse]:
     from app.utils.translation import get_translated_destination, validate_language
     
     language = validate_language(language)
@@ -75,14 +92,14 @@ def get_destinations(
     
     # Apply translations if needed
     if language == 'en':
-        return destinations
+        return [DestinationResponse.model_validate(destination) for destination in destinations]
     
     translated_destinations = []
     for destination in destinations:
         translated_data = get_translated_destination(destination, language, db)
         # Create a mock destination object for the response
         translated_destination = type('Destination', (), translated_data)()
-        translated_destinations.append(translated_destination)
+        translated_destinations.append(DestinationResponse.model_validate(translated_destination))
     
     return translated_destinations
 
@@ -104,53 +121,76 @@ def get_destination_by_slug(
     return destination
 
 
-# Every activity is presented to customers under one of three display brands,
-# derived from the underlying vendor: Finuo's own activities keep their brand,
-# Girafe activities map to "Finuo-Giraffe", and everything else (all other
-# vendors) is clubbed under "Nordic Adventure".
-BRAND_FINUO = "Finuo"
-BRAND_GIRAFFE = "Finuo-Giraffe"
-BRAND_NORDIC = "Nordic Adventure"
-
-# Negative sentinel "vendor_id" values let the providers filter select a whole
-# brand group (real vendor ids are positive).
-BRAND_SENTINELS = {-2: BRAND_FINUO, -3: BRAND_GIRAFFE, -1: BRAND_NORDIC}
-
-
-def brand_for_vendor(company_name: Optional[str]) -> str:
-    """Map a real vendor company name to its customer-facing display brand."""
-    name = (company_name or "").lower()
-    if "girafe" in name or "giraffe" in name:
-        return BRAND_GIRAFFE
-    if name.startswith("finuo"):
-        return BRAND_FINUO
-    return BRAND_NORDIC
-
-
 @router.get("/providers")
 def get_providers(db: Session = Depends(get_db)):
     """Group active activities into the three display brands, with counts."""
-    rows = (
-        db.query(Vendor.company_name, func.count(Activity.id))
-        .join(Activity, Activity.vendor_id == Vendor.id)
-        .filter(Activity.is_active == True)
-        .group_by(Vendor.company_name)
+    counts = dict(
+        db.query(ActivityFacet.brand, func.count(ActivityFacet.activity_id))
+        .filter(ActivityFacet.is_active == True)
+        .group_by(ActivityFacet.brand)
         .all()
     )
-    counts = {BRAND_FINUO: 0, BRAND_GIRAFFE: 0, BRAND_NORDIC: 0}
-    for company_name, n in rows:
-        counts[brand_for_vendor(company_name)] += n
     # Keep a stable order; only surface brands that actually have activities.
-    order = [(-2, BRAND_FINUO), (-3, BRAND_GIRAFFE), (-1, BRAND_NORDIC)]
     return [
         {"id": sid, "company_name": brand, "activity_count": counts[brand]}
-        for sid, brand in order
-        if counts[brand] > 0
+        for sid, brand in BRAND_ORDER
+        if counts.get(brand)
     ]
 
 
+@router.get("/facets")
+def get_search_facets(
+    q: Optional[str] = Query(None, description="Search query"),
+    destination_id: Optional[int] = Query(None, description="Destination ID"),
+    destination_slug: Optional[str] = Query(None, description="Destination slug"),
+    category_id: Optional[int] = Query(None, description="Category ID"),
+    category_slug: Optional[str] = Query(None, description="Category slug"),
+    vendor_id: Optional[int] = Query(None, description="Provider / vendor ID"),
+    min_price: Optional[Decimal] = Query(None, ge=0, description="Minimum price"),
+    max_price: Optional[Decimal] = Query(None, ge=0, description="Maximum price"),
+    min_duration: Optional[int] = Query(None, ge=0, description="Min duration in minutes"),
+    max_duration: Optional[int] = Query(None, ge=0, description="Max duration in minutes"),
+    min_rating: Optional[float] = Query(None, ge=0, le=5, description="Minimum rating"),
+    languages: Optional[List[str]] = Query(None, description="Languages"),
+    free_cancellation: Optional[bool] = Query(None, description="Free cancellation only"),
+    instant_confirmation: Optional[bool] = Query(None, description="Instant confirmation only"),
+    skip_the_line: Optional[bool] = Query(None, description="Skip the line only"),
+    bestseller: Optional[bool] = Query(None, description="Bestsellers only"),
+    is_available: Optional[bool] = Query(None, description="Filter by availability (true=available, false=unavailable)"),
+    language: str = Query('en', description="Language for translation (en, es, zh, fr)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Sidebar facet counts for a search.
+
+    Takes the same filters as /search. Each facet is counted with every
+    other filter applied, so the counts show what selecting a value yields.
+    """
+    return get_facet_counts(
+        db,
+        language=validate_language(language),
+        q=q,
+        category_id=category_id,
+        category_slug=category_slug,
+        destination_id=destination_id,
+        destination_slug=destination_slug,
+        vendor_id=vendor_id,
+        min_price=min_price,
+        max_price=max_price,
+        min_duration=min_duration,
+        max_duration=max_duration,
+        min_rating=min_rating,
+        languages=languages,
+        free_cancellation=free_cancellation,
+        instant_confirmation=instant_confirmation,
+        skip_the_line=skip_the_line,
+        bestseller=bestseller,
+        is_available=is_available,
+    )
+
+
 @router.get("/search", response_model=PaginatedResponse[ActivityResponse])
-def search_activities(
+async def search_activities(
     q: Optional[str] = Query(None, description="Search query"),
     destination_id: Optional[int] = Query(None, description="Destination ID"),
     destination_slug: Optional[str] = Query(None, description="Destination slug"),
@@ -169,152 +209,165 @@ def search_activities(
     bestseller: Optional[bool] = Query(None, description="Bestsellers only"),
     is_available: Optional[bool] = Query(None, description="Filter by availability (true=available, false=unavailable)"),
     vendor_only: Optional[bool] = Query(None, description="Show only current vendor's activities"),
-    sort_by: str = Query("recommended", description="Sort: recommended, price_asc, price_desc, rating, duration"),
+    sort_by: str = Query("recommended", description="Sort: recommended, relevance, price_asc, price_desc, rating, duration"),
     language: str = Query('en', description="Language for translation (en, es, zh, fr)"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_optional_current_user)
+    cursor: Optional[str] = Query(None, description="Keyset cursor (pagination.next_cursor of the previous page)"),
+    estimate_total: bool = Query(False, description="Return an estimated total instead of an exact count"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_optional_current_user_async)
 ):
     """
     Search and filter activities.
     """
+    return await db.run_sync(
+        _search_activities,
+        current_user,
+        q=q,
+        destination_id=destination_id,
+        destination_slug=destination_slug,
+        category_id=category_id,
+        category_slug=category_slug,
+        vendor_id=vendor_id,
+        min_price=min_price,
+        max_price=max_price,
+        min_duration=min_duration,
+        max_duration=max_duration,
+        min_rating=min_rating,
+        languages=languages,
+        free_cancellation=free_cancellation,
+        instant_confirmation=instant_confirmation,
+        skip_the_line=skip_the_line,
+        bestseller=bestseller,
+        is_available=is_available,
+        vendor_only=vendor_only,
+        sort_by=sort_by,
+        language=language,
+        page=page,
+        per_page=per_page,
+        cursor=cursor,
+        estimate_total=estimate_total,
+    )
+
+
+def _search_activities(
+    db: Session,
+    current_user,
+    q: Optional[str],
+    destination_id: Optional[int],
+    destination_slug: Optional[str],
+    category_id: Optional[int],
+    category_slug: Optional[str],
+    vendor_id: Optional[int],
+    min_price: Optional[Decimal],
+    max_price: Optional[Decimal],
+    min_duration: Optional[int],
+    max_duration: Optional[int],
+    min_rating: Optional[float],
+    languages: Optional[List[str]],
+    free_cancellation: Optional[bool],
+    instant_confirmation: Optional[bool],
+    skip_the_line: Optional[bool],
+    bestseller: Optional[bool],
+    is_available: Optional[bool],
+    vendor_only: Optional[bool],
+    sort_by: str,
+    language: str,
+    page: int,
+    per_page: int,
+    cursor: Optional[str],
+    estimate_total: bool,
+) -> PaginatedResponse[ActivityResponse]:
+    """Body of /search, run on the sync view of the request's AsyncSession."""
     # Validate language parameter
     language = validate_language(language)
-    
-    # Base query with eager loading
+
+    # Every page is served from activity_search_documents: one row per
+    # (activity, language) holding the finished card plus filter/sort keys.
+    query = db.query(ActivitySearchDocument).filter(ActivitySearchDocument.language == language)
+
     # For vendor_only queries, show all activities (including inactive ones)
     # For public queries, only show active activities
-    if vendor_only and current_user:
-        query = db.query(Activity)
-    else:
-        query = db.query(Activity).filter(Activity.is_active == True)
-
-    # Join for filtering
-    if destination_id or destination_slug or category_id or category_slug:
-        if destination_id or destination_slug:
-            query = query.join(ActivityDestination).join(Destination)
-            if destination_id:
-                query = query.filter(Destination.id == destination_id)
-            if destination_slug:
-                query = query.filter(Destination.slug == destination_slug)
-
-        if category_id or category_slug:
-            query = query.join(ActivityCategory).join(Category)
-            if category_id:
-                query = query.filter(Category.id == category_id)
-            if category_slug:
-                query = query.filter(Category.slug == category_slug)
-
-    # Text search — match English columns, any-language translated content
-    # (zh/es/fr), and the destination & category names, so queries like
+    if not (vendor_only and current_user):
+        query = query.filter(ActivitySearchDocument.is_active == True)
+
+    # Destination / category filters: slugs resolve to ids, then match the
+    # GIN-indexed id arrays.
+    if destination_slug:
+        slug_id = db.query(Destination.id).filter(Destination.slug == destination_slug).scalar()
+        query = query.filter(ActivitySearchDocument.destination_ids.any(slug_id) if slug_id is not None else false())
+    if destination_id:
+        query = query.filter(ActivitySearchDocument.destination_ids.any(destination_id))
+
+    if category_slug:
+        slug_id = db.query(Category.id).filter(Category.slug == category_slug).scalar()
+        query = query.filter(ActivitySearchDocument.category_ids.any(slug_id) if slug_id is not None else false())
+    if category_id:
+        query = query.filter(ActivitySearchDocument.category_ids.any(category_id))
+
+    # Text search — matches English columns, any-language translated content
+    # (zh/es/fr), and the destination & category names through the
+    # activity_search_index (tsvector + pg_trgm), so queries like
     # "桂林"/"Guilin", "Beijing", "Museums", "美食" work regardless of UI language.
+    relevance = None
     if q and q.strip():
-        # Escape LIKE wildcards so % and _ in the query are treated literally.
-        safe_q = q.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
-        pattern = f"%{safe_q}%"
-        esc = "\\"
-
-        def il(col):
-            return col.ilike(pattern, escape=esc)
-
-        translated_ids = db.query(ActivityTranslation.activity_id).filter(
-            or_(
-                il(ActivityTranslation.title),
-                il(ActivityTranslation.short_description),
-                il(ActivityTranslation.description),
-            )
-        )
-        destination_ids = (
-            db.query(ActivityDestination.activity_id)
-            .join(Destination, Destination.id == ActivityDestination.destination_id)
-            .outerjoin(
-                DestinationTranslation,
-                DestinationTranslation.destination_id == Destination.id,
-            )
-            .filter(or_(il(Destination.name), il(DestinationTranslation.name)))
-        )
-        category_ids = (
-            db.query(ActivityCategory.activity_id)
-            .join(Category, Category.id == ActivityCategory.category_id)
-            .outerjoin(
-                CategoryTranslation,
-                CategoryTranslation.category_id == Category.id,
-            )
-            .filter(or_(il(Category.name), il(CategoryTranslation.name)))
-        )
-        search_filter = or_(
-            il(Activity.title),
-            il(Activity.description),
-            il(Activity.short_description),
-            Activity.id.in_(translated_ids),
-            Activity.id.in_(destination_ids),
-            Activity.id.in_(category_ids),
-        )
-        query = query.filter(search_filter)
+        query, relevance = apply_text_search(query, q, activity_id=ActivitySearchDocument.activity_id)
 
     # Price filter
     if min_price is not None:
-        query = query.filter(Activity.price_adult >= min_price)
+        query = query.filter(ActivitySearchDocument.price_adult >= min_price)
     if max_price is not None:
-        query = query.filter(Activity.price_adult <= max_price)
+        query = query.filter(ActivitySearchDocument.price_adult <= max_price)
 
     # Duration filter
     if min_duration is not None:
-        query = query.filter(Activity.duration_minutes >= min_duration)
+        query = query.filter(ActivitySearchDocument.duration_minutes >= min_duration)
     if max_duration is not None:
-        query = query.filter(Activity.duration_minutes <= max_duration)
+        query = query.filter(ActivitySearchDocument.duration_minutes <= max_duration)
 
     # Rating filter
     if min_rating is not None:
-        query = query.filter(Activity.average_rating >= min_rating)
+        query = query.filter(ActivitySearchDocument.average_rating >= min_rating)
 
     # Languages filter
     if languages:
-        for language in languages:
-            query = query.filter(Activity.languages.contains([language]))
+        for spoken_language in languages:
+            query = query.filter(ActivitySearchDocument.languages.contains([spoken_language]))
 
     # Boolean filters
     if free_cancellation is not None:
         if free_cancellation:
-            query = query.filter(Activity.free_cancellation_hours > 0)
+            query = query.filter(ActivitySearchDocument.free_cancellation_hours > 0)
         else:
-            query = query.filter(Activity.free_cancellation_hours == 0)
+            query = query.filter(ActivitySearchDocument.free_cancellation_hours == 0)
 
     if instant_confirmation is not None:
-        query = query.filter(Activity.instant_confirmation == instant_confirmation)
+        query = query.filter(ActivitySearchDocument.instant_confirmation == instant_confirmation)
 
     if skip_the_line is not None:
-        query = query.filter(Activity.is_skip_the_line == skip_the_line)
+        query = query.filter(ActivitySearchDocument.is_skip_the_line == skip_the_line)
 
     if bestseller is not None:
-        query = query.filter(Activity.is_bestseller == bestseller)
+        query = query.filter(ActivitySearchDocument.is_bestseller == bestseller)
 
     # Availability filter (provider-set "available for booking" flag)
     if is_available is not None:
-        query = query.filter(Activity.is_available == is_available)
+        query = query.filter(ActivitySearchDocument.is_available == is_available)
 
-    # Provider / vendor filter. Negative ids are brand-group sentinels that map
-    # to a set of real vendors; positive ids select a single real vendor; a
-    # falsy id (0 / None) means "all brands".
+    # Provider / vendor filter. Negative ids are brand-group sentinels that
+    # match the document's display brand; positive ids select a single real
+    # vendor; a falsy id (0 / None) means "all brands".
     if vendor_id is not None and vendor_id < 0:
         brand = BRAND_SENTINELS.get(vendor_id)
-        brand_vendor_ids = [
-            v.id
-            for v in db.query(Vendor.id, Vendor.company_name).all()
-            if brand_for_vendor(v.company_name) == brand
-        ]
-        # Use an impossible id when a brand has no vendors so nothing matches.
-        query = query.filter(Activity.vendor_id.in_(brand_vendor_ids or [-999]))
+        query = query.filter(ActivitySearchDocument.brand == brand if brand else false())
     elif vendor_id:
-        query = query.filter(Activity.vendor_id == vendor_id)
+        query = query.filter(ActivitySearchDocument.vendor_id == vendor_id)
 
     # Vendor filter
     if vendor_only and current_user:
-        # Get vendor ID from current user
-        vendor = db.query(Vendor).filter(Vendor.user_id == current_user.id).first()
-        if vendor:
-            query = query.filter(Activity.vendor_id == vendor.id)
+        if current_user.vendor_id is not None:
+            query = query.filter(ActivitySearchDocument.vendor_id == current_user.vendor_id)
         else:
             # If vendor_only is True but user is not a vendor, return empty results
             return PaginatedResponse.create(
@@ -325,108 +378,103 @@ def search_activities(
                 message="No activities found"
             )
 
-    # Get total count
-    total = query.count()
-
-    # Sorting
+    # Sorting. Each sort ends in the activity id so keys are unique for keyset
+    # cursors; nullable columns are coalesced so cursor comparisons never hit NULL.
+    rating_key = ("average_rating", ActivitySearchDocument.average_rating, True)
     if sort_by == "price_asc":
-        query = query.order_by(Activity.price_adult.asc())
+        sort_keys = [("price_adult", ActivitySearchDocument.price_adult, False)]
     elif sort_by == "price_desc":
-        query = query.order_by(Activity.price_adult.desc())
+        sort_keys = [("price_adult", ActivitySearchDocument.price_adult, True)]
     elif sort_by == "rating":
-        query = query.order_by(Activity.average_rating.desc())
+        sort_keys = [rating_key]
     elif sort_by == "duration":
-        query = query.order_by(Activity.duration_minutes.asc())
+        # Activities without a duration sort last, as NULLs did before.
+        # Inline literal (not a bind parameter) so the expression index matches.
+        duration = func.coalesce(ActivitySearchDocument.duration_minutes, literal_column("2147483647"))
+        sort_keys = [("duration_minutes", duration, False)]
     else:  # recommended
-        query = query.order_by(
-            Activity.is_bestseller.desc(),
-            Activity.average_rating.desc(),
-            Activity.total_bookings.desc()
-        )
-
-    # Pagination
-    offset = (page - 1) * per_page
-    activities = query.offset(offset).limit(per_page).all()
-
-    # Prepare response with eager loading
-    response_activities = []
-    for activity in activities:
-        # Get primary image
-        primary_image = db.query(ActivityImage).filter(
-            ActivityImage.activity_id == activity.id,
-            ActivityImage.is_primary == True
-        ).first()
+        sort_keys = [
+            ("is_bestseller", ActivitySearchDocument.is_bestseller, True),
+            rating_key,
+            ("total_bookings", ActivitySearchDocument.total_bookings, True),
+        ]
+        if relevance is not None:  # recommended / relevance with a text query
+            # ts_rank_cd returns float4; compare as float8 so the cursor value
+            # round-trips exactly.
+            sort_keys.insert(0, ("relevance", cast(relevance, Float), True))
+    sort_keys.append(("id", ActivitySearchDocument.activity_id, False))
+
+    result = paginate(
+        db, query, sort_keys,
+        page=page, per_page=per_page, cursor=cursor, estimate_total=estimate_total
+    )
 
-        # Get categories
-        activity_categories = db.query(Category).join(ActivityCategory).filter(
-            ActivityCategory.activity_id == activity.id
-        ).all()
-
-        # Get destinations
-        activity_destinations = db.query(Destination).join(ActivityDestination).filter(
-            ActivityDestination.activity_id == activity.id
-        ).all()
-
-        # Apply translations if needed
-        if language != 'en':
-            translated_data = get_translated_activity(activity, language, db)
-            title = translated_data.get('title', activity.title)
-            short_description = translated_data.get('short_description', activity.short_description)
-        else:
-            title = activity.title
-            short_description = activity.short_description
-        
-        activity_dict = {
-            "id": activity.id,
-            "title": title,
-            "slug": activity.slug,
-            "short_description": short_description,
-            "price_adult": activity.price_adult,
-            "price_child": activity.price_child,
-            "duration_minutes": activity.duration_minutes,
-            "average_rating": float(activity.average_rating) if activity.average_rating else 0,
-            "total_reviews": activity.total_reviews,
-            "is_bestseller": activity.is_bestseller,
-            "is_skip_the_line": activity.is_skip_the_line,
-            "is_active": activity.is_active,
-            "is_available": activity.is_available,
-            "free_cancellation_hours": activity.free_cancellation_hours,
-            "languages": activity.languages,
-            "primary_image": primary_image,
-            "categories": activity_categories,
-            "destinations": activity_destinations
-        }
-        response_activities.append(ActivityResponse(**activity_dict))
-
-    return PaginatedResponse.create(
-        data=response_activities,
-        page=page,
-        per_page=per_page,
-        total=total,
+    return PaginatedResponse.from_page(
+        data=document_cards(result.items),
+        page=result,
         message="Activities found"
     )
 
 
 @router.get("/slug/{slug}", response_model=ActivityDetailResponse)
-def get_activity_by_slug(
+async def get_activity_by_slug(
+    request: Request,
     slug: str,
     language: str = Query('en', regex="^(en|es|zh|fr)$", description="Language code"),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_optional_current_user)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get activity details by slug."""
-    activity = db.query(Activity).filter(
+    return await db.run_sync(_get_activity_by_slug, slug, language, _content_version(request))
+
+
+def _content_version(request: Request) -> str:
+    """The activity's updated_at as read by the HTTP cache middleware ("" without it)."""
+    return getattr(request.state, "content_version", "")
+
+
+def _get_activity_by_slug(db: Session, slug: str, language: str, content_version: str = "") -> ActivityDetailResponse:
+    activity_id = db.query(Activity.id).filter(
         Activity.slug == slug,
         Activity.is_active == True
-    ).first()
+    ).scalar()
 
-    if not activity:
+    if activity_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Activity not found"
         )
 
-    return _get_activity_details(activity, db, language)
+    return _get_cached_activity_details(activity_id, db, language, content_version)
+
+
+def _get_cached_activity_details(
+    activity_id: int, db: Session, language: str, content_version: str = ""
+) -> ActivityDetailResponse:
+    """
+    Serve an active activity's detail payload through the versioned cache.
+
+    ``content_version`` is the updated_at the response's ETag was derived
+    from. It is part of the cache key, so a worker whose in-process versions
+    missed another worker's bump still cannot pair a new ETag with an old
+    body.
+    """
+    language = validate_language(language)
+
+    def load() -> ActivityDetailResponse:
+        activity = db.query(Activity).options(*ACTIVITY_DETAIL_OPTIONS).filter(
+            Activity.id == activity_id,
+            Activity.is_active == True
+        ).first()
+
+        if not activity:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Activity not found"
+            )
+
+        return _get_activity_details(activity, db, language)
+
+    return activity_cache.get_or_load(activity_id, language, load, content_version)
 
 
 def _get_activity_details(activity: Activity, db: Session, language: str = 'en') -> ActivityDetailResponse:
@@ -434,74 +482,10 @@ def _get_activity_details(activity: Activity, db: Session, language: str = 'en')
     # Validate language
     language = validate_language(language)
 
-    # Load related data
-    images = db.query(ActivityImage).filter(
-        ActivityImage.activity_id == activity.id
-    ).order_by(ActivityImage.order_index).all()
-
-    categories = db.query(Category).join(ActivityCategory).filter(
-        ActivityCategory.activity_id == activity.id
-    ).all()
-
-    destinations = db.query(Destination).join(ActivityDestination).filter(
-        ActivityDestination.activity_id == activity.id
-    ).all()
-
-    highlights = db.query(ActivityHighlight).filter(
-        ActivityHighlight.activity_id == activity.id
-    ).order_by(ActivityHighlight.order_index).all()
-
-    includes = db.query(ActivityInclude).filter(
-        ActivityInclude.activity_id == activity.id
-    ).order_by(ActivityInclude.order_index).all()
-
-    faqs = db.query(ActivityFAQ).filter(
-        ActivityFAQ.activity_id == activity.id
-    ).order_by(ActivityFAQ.order_index).all()
-
-    meeting_point = db.query(MeetingPoint).filter(
-        MeetingPoint.activity_id == activity.id
-    ).first()
-
-    # Load meeting point photos if meeting point exists
-    if meeting_point:
-        meeting_point.photos = db.query(MeetingPointPhoto).filter(
-            MeetingPointPhoto.meeting_point_id == meeting_point.id
-        ).order_by(MeetingPointPhoto.order_index).all()
-
-    # Load new enhanced data
-    timelines = db.query(ActivityTimeline).filter(
-        ActivityTimeline.activity_id == activity.id
-    ).order_by(ActivityTimeline.order_index).all()
-
-    time_slots = db.query(ActivityTimeSlot).filter(
-        ActivityTimeSlot.activity_id == activity.id
-    ).order_by(ActivityTimeSlot.slot_time).all()
-
-    pricing_tiers = db.query(ActivityPricingTier).filter(
-        ActivityPricingTier.activity_id == activity.id,
-        ActivityPricingTier.is_active == True
-    ).order_by(ActivityPricingTier.order_index).all()
-
-    add_ons = db.query(ActivityAddOn).filter(
-        ActivityAddOn.activity_id == activity.id
-    ).order_by(ActivityAddOn.order_index).all()
-
-    # Get vendor info
-    vendor = db.query(Vendor).filter(Vendor.id == activity.vendor_id).first()
-
-    # Get translated content
-    translated_activity = get_translated_activity(activity, language, db)
-    translated_highlights = get_translated_highlights(highlights, language, db)
-    translated_includes = get_translated_includes(includes, language, db)
-    translated_faqs = get_translated_faqs(faqs, language, db)
-    translated_timelines = get_translated_timelines(timelines, language, db)
-    translated_pricing_tiers = get_translated_pricing_tiers(pricing_tiers, language, db)
-    translated_add_ons = get_translated_add_ons(add_ons, language, db)
-    translated_meeting_point = get_translated_meeting_point(meeting_point, language, db)
-
-    # Prepare response
-    primary_image = next((img for img in images if img.is_primary), None)
+    # Children and translations come from the batched detail loader.
+    detail = load_activity_detail(db, activity, language)
+    translated_activity = detail['translated_activity']
+    vendor = detail['vendor']
 
     # Use translated content WITHOUT fallback (user requirement: Option 2)
     response_dict = {
@@ -525,14 +509,14 @@ def _get_activity_details(activity: Activity, db: Session, language: str = 'en')
         "is_active": activity.is_active,
         "is_available": activity.is_available,
         "product_features": activity.product_features,
-        "primary_image": primary_image,
-        "images": images,
-        "categories": categories,
-        "destinations": destinations,
-        "highlights": translated_highlights,
-        "includes": translated_includes,
-        "faqs": translated_faqs,
-        "meeting_point": translated_meeting_point,
+        "primary_image": detail['primary_image'],
+        "images": detail['images'],
+        "categories": detail['categories'],
+        "destinations": detail['destinations'],
+        "highlights": detail['highlights'],
+        "includes": detail['includes'],
+        "faqs": detail['faqs'],
+        "meeting_point": detail['meeting_point'],
         "vendor": {
             "id": vendor.id,
             "company_name": brand_for_vendor(vendor.company_name),
@@ -563,10 +547,11 @@ def _get_activity_details(activity: Activity, db: Session, language: str = 'en')
         "allows_reserve_now_pay_later": activity.allows_reserve_now_pay_later,
         "reserve_payment_deadline_hours": activity.reserve_payment_deadline_hours,
         # New relationships
-        "timelines": translated_timelines,
-        "time_slots": time_slots,
-        "pricing_tiers": translated_pricing_tiers,
-        "add_ons": translated_add_ons
+        "timelines": detail['timelines'],
+        "time_slots": detail['time_slots'],
+        "pricing_tiers": detail['pricing_tiers'],
+        "add_ons": detail['add_ons'],
+        "rating_summary": detail['rating_summary']
     }
 
     return ActivityDetailResponse(**response_dict)
@@ -574,24 +559,14 @@ def _get_activity_details(activity: Activity, db: Session, language: str = 'en')
 
 @router.get("/{activity_id}", response_model=ActivityDetailResponse)
 def get_activity(
+    request: Request,
     activity_id: int,
     language: str = Query('en', regex="^(en|es|zh|fr)$", description="Language code"),
     db: Session = Depends(get_db),
     current_user = Depends(get_optional_current_user)
 ):
     """Get activity details by ID."""
-    activity = db.query(Activity).filter(
-        Activity.id == activity_id,
-        Activity.is_active == True
-    ).first()
-
-    if not activity:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Activity not found"
-        )
-
-    return _get_activity_details(activity, db, language)
+    return _get_cached_activity_details(activity_id, db, language, _content_version(request))
 
 
 @router.get("/{activity_id}/similar", response_model=List[ActivityResponse])
@@ -600,79 +575,42 @@ def get_similar_activities(
     limit: int = Query(4, ge=1, le=10),
     db: Session = Depends(get_db)
 ):
-    """Get similar activities based on category and destination."""
-    # Get the activity
-    activity = db.query(Activity).filter(Activity.id == activity_id).first()
-    if not activity:
+    """Get similar activities from the precomputed similarity index."""
+    neighbor_ids = similar_activity_ids(db, activity_id)
+    if neighbor_ids is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Activity not found"
         )
+    if not neighbor_ids:
+        return []
 
-    # Get activity's categories and destinations
-    category_ids = db.query(ActivityCategory.category_id).filter(
-        ActivityCategory.activity_id == activity_id
-    ).subquery()
-
-    destination_ids = db.query(ActivityDestination.destination_id).filter(
-        ActivityDestination.activity_id == activity_id
-    ).subquery()
+    # Stored neighbours may have been deactivated since; keep index order.
+    activities = {
+        activity.id: activity for activity in
+        db.query(Activity).filter(Activity.id.in_(neighbor_ids), Activity.is_active == True).all()
+    }
+    similar = [activities[neighbor_id] for neighbor_id in neighbor_ids if neighbor_id in activities][:limit]
+    return hydrate_activity_cards(db, similar)
 
-    # Find similar activities
-    query = db.query(Activity).filter(
-        Activity.id != activity_id,
-        Activity.is_active == True
-    )
 
-    # Join and filter by same categories or destinations
-    similar_activities = (
-        query.join(ActivityCategory)
-        .filter(ActivityCategory.category_id.in_(category_ids))
-        .union(
-            query.join(ActivityDestination)
-            .filter(ActivityDestination.destination_id.in_(destination_ids))
-        )
-    ).limit(limit).all()
-
-    # Prepare response
-    response_activities = []
-    for act in similar_activities[:limit]:
-        primary_image = db.query(ActivityImage).filter(
-            ActivityImage.activity_id == act.id,
-            ActivityImage.is_primary == True
-        ).first()
+@router.post("/import")
+async def import_activities(
+    request: Request,
+    dry_run: bool = Query(False, description="Report the changes without writing them"),
+    db: Session = Depends(get_db),
+    current_vendor = Depends(get_current_vendor)
+):
+    """
+    Bulk create/update the vendor's activities from an NDJSON body (vendor only).
 
-        categories = db.query(Category).join(ActivityCategory).filter(
-            ActivityCategory.activity_id == act.id
-        ).all()
-
-        destinations = db.query(Destination).join(ActivityDestination).filter(
-            ActivityDestination.activity_id == act.id
-        ).all()
-
-        activity_dict = {
-            "id": act.id,
-            "title": act.title,
-            "slug": act.slug,
-            "short_description": act.short_description,
-            "price_adult": act.price_adult,
-            "price_child": act.price_child,
-            "duration_minutes": act.duration_minutes,
-            "average_rating": float(act.average_rating) if act.average_rating else 0,
-            "total_reviews": act.total_reviews,
-            "is_bestseller": act.is_bestseller,
-            "is_skip_the_line": act.is_skip_the_line,
-            "is_active": act.is_active,
-            "is_available": act.is_available,
-            "free_cancellation_hours": act.free_cancellation_hours,
-            "languages": act.languages,
-            "primary_image": primary_image,
-            "categories": categories,
-            "destinations": destinations
-        }
-        response_activities.append(ActivityResponse(**activity_dict))
-
-    return response_activities
+    One activity aggregate per line (app.schemas.ActivityImport), matched on
+    slug. Only rows that differ are written; the report lists per-line errors,
+    rows written per table and the throughput.
+    """
+    importer = ActivityImporter(db, vendor_id=current_vendor.vendor_id, restrict_to_vendor=True, dry_run=dry_run)
+    report = await import_stream(importer, request.stream())
+    return report.as_dict()
 
 
 @router.post("", response_model=ActivityDetailResponse, status_code=status.HTTP_201_CREATED)
@@ -682,17 +620,9 @@ def create_activity(
     current_vendor = Depends(get_current_vendor)
 ):
     """Create a new activity (vendor only)."""
-    # Get vendor record from user
-    vendor = db.query(Vendor).filter(Vendor.user_id == current_vendor.id).first()
-    if not vendor:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Vendor profile not found"
-        )
-
     # Create activity
     activity = Activity(
-        vendor_id=vendor.id,
+        vendor_id=current_vendor.vendor_id,
         title=activity_data.title,
         slug=slugify(activity_data.title),
         short_description=activity_data.short_description,
@@ -791,7 +721,15 @@ def create_activity(
             longitude=mp.get('longitude')
         ))
 
+    db.flush()
+    refresh_search_index(db, [activity.id])
+    refresh_activity_facets(db, [activity.id])
+    refresh_search_documents(db, [activity.id])
+    refresh_similarities(db, [activity.id])
+    record_activity_created(db, activity.is_active)
+
     db.commit()
+    activity_cache.bump(activity.id)
     db.refresh(activity)
 
     return _get_activity_details(activity, db)
@@ -805,14 +743,6 @@ def update_activity(
     current_vendor = Depends(get_current_vendor)
 ):
     """Update an activity (vendor only)."""
-    # Get vendor record from user
-    vendor = db.query(Vendor).filter(Vendor.user_id == current_vendor.id).first()
-    if not vendor:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Vendor profile not found"
-        )
-
     activity = db.query(Activity).filter(Activity.id == activity_id).first()
 
     if not activity:
@@ -821,7 +751,7 @@ def update_activity(
             detail="Activity not found"
         )
 
-    if activity.vendor_id != vendor.id:
+    if activity.vendor_id != current_vendor.vendor_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to update this activity"
@@ -832,85 +762,57 @@ def update_activity(
         'category_ids', 'destination_ids', 'highlights', 'includes', 'faqs', 
         'meeting_point', 'translations', 'supported_languages'
     })
+    was_active = activity.is_active
     for field, value in update_data.items():
         if value is not None:
             setattr(activity, field, value)
+    if activity.is_active != was_active:
+        record_activity_status(db, activity.is_active)
 
     # Update slug if title changed
     if activity_data.title:
         activity.slug = slugify(activity_data.title)
+    # Checked before the child sync, whose flush clears the pending changes.
+    activity_changed = db.is_modified(activity)
 
-    # Update category relationships
+    # Child rows are diffed against the stored ones (app.services.child_sync):
+    # unchanged rows keep their ids and translations, and only the
+    # differences are written.
+    writes = WriteCounts()
     if activity_data.category_ids is not None:
-        # Remove existing categories
-        db.query(ActivityCategory).filter(ActivityCategory.activity_id == activity_id).delete()
-        # Add new categories
-        for category_id in activity_data.category_ids:
-            db.add(ActivityCategory(activity_id=activity_id, category_id=category_id))
+        sync_links(db, ActivityCategory, "category_id", {activity_id: activity_data.category_ids}, writes)
 
-    # Update destination relationships
     if activity_data.destination_ids is not None:
-        # Remove existing destinations
-        db.query(ActivityDestination).filter(ActivityDestination.activity_id == activity_id).delete()
-        # Add new destinations
-        for destination_id in activity_data.destination_ids:
-            db.add(ActivityDestination(activity_id=activity_id, destination_id=destination_id))
+        sync_links(db, ActivityDestination, "destination_id", {activity_id: activity_data.destination_ids}, writes)
 
-    # Update highlights
     if activity_data.highlights is not None:
-        # Remove existing highlights
-        db.query(ActivityHighlight).filter(ActivityHighlight.activity_id == activity_id).delete()
-        # Add new highlights
-        for idx, highlight_text in enumerate(activity_data.highlights):
-            if highlight_text.strip():  # Only add non-empty highlights
-                db.add(ActivityHighlight(
-                    activity_id=activity_id,
-                    text=highlight_text,
-                    order_index=idx
-                ))
-
-    # Update includes/excludes
+        sync_children(db, COLLECTIONS["highlights"], {activity_id: [
+            {"text": highlight_text}
+            for highlight_text in activity_data.highlights
+            if highlight_text.strip()  # Only keep non-empty highlights
+        ]}, writes)
+
     if activity_data.includes is not None:
-        # Remove existing includes
-        db.query(ActivityInclude).filter(ActivityInclude.activity_id == activity_id).delete()
-        # Add new includes
-        for idx, include_data in enumerate(activity_data.includes):
-            if include_data.get('item', '').strip():  # Only add non-empty items
-                db.add(ActivityInclude(
-                    activity_id=activity_id,
-                    item=include_data['item'],
-                    is_included=include_data.get('is_included', True),
-                    order_index=idx
-                ))
-
-    # Update FAQs
+        sync_children(db, COLLECTIONS["includes"], {activity_id: [
+            {"item": include_data['item'], "is_included": include_data.get('is_included', True)}
+            for include_data in activity_data.includes
+            if include_data.get('item', '').strip()  # Only keep non-empty items
+        ]}, writes)
+
     if activity_data.faqs is not None:
-        # Remove existing FAQs
-        db.query(ActivityFAQ).filter(ActivityFAQ.activity_id == activity_id).delete()
-        # Add new FAQs
-        for idx, faq_data in enumerate(activity_data.faqs):
-            if faq_data.get('question', '').strip() and faq_data.get('answer', '').strip():  # Only add complete FAQs
-                db.add(ActivityFAQ(
-                    activity_id=activity_id,
-                    question=faq_data['question'],
-                    answer=faq_data['answer'],
-                    order_index=idx
-                ))
-
-    # Update meeting point
+        sync_children(db, COLLECTIONS["faqs"], {activity_id: [
+            {"question": faq_data['question'], "answer": faq_data['answer']}
+            for faq_data in activity_data.faqs
+            # Only keep complete FAQs
+            if faq_data.get('question', '').strip() and faq_data.get('answer', '').strip()
+        ]}, writes)
+
     if activity_data.meeting_point is not None:
-        # Remove existing meeting point
-        db.query(MeetingPoint).filter(MeetingPoint.activity_id == activity_id).delete()
-        # Add new meeting point if address provided
-        if activity_data.meeting_point.get('address', '').strip():
-            mp = activity_data.meeting_point
-            db.add(MeetingPoint(
-                activity_id=activity_id,
-                address=mp['address'],
-                instructions=mp.get('instructions'),
-                latitude=mp.get('latitude'),
-                longitude=mp.get('longitude')
-            ))
+        # An empty address removes the meeting point.
+        mp = activity_data.meeting_point
+        sync_meeting_points(db, {activity_id: (
+            {field: mp.get(field) for field in MEETING_POINT_FIELDS} if mp.get('address', '').strip() else None
+        )}, writes)
 
     # Handle multilingual translations
     if activity_data.translations is not None:
@@ -918,7 +820,23 @@ def update_activity(
         # This would require additional models for translations
         pass
 
+    # A form saved without edits writes nothing and keeps every cache.
+    if not writes.total and not activity_changed:
+        return _get_activity_details(activity, db)
+
+    if writes.total:
+        # Child rows were written with core statements; stamp the activity
+        # itself so Last-Modified and ETags move.
+        activity.updated_at = func.now()
+
+    db.flush()
+    refresh_search_index(db, [activity_id])
+    refresh_activity_facets(db, [activity_id])
+    refresh_search_documents(db, [activity_id])
+    refresh_similarities(db, [activity_id])
+
     db.commit()
+    activity_cache.bump(activity_id)
     db.refresh(activity)
 
     return _get_activity_details(activity, db)
@@ -931,14 +849,6 @@ def delete_activity(
     current_vendor = Depends(get_current_vendor)
 ):
     """Delete an activity (vendor only). Actually just marks as inactive."""
-    # Get vendor record from user
-    vendor = db.query(Vendor).filter(Vendor.user_id == current_vendor.id).first()
-    if not vendor:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Vendor profile not found"
-        )
-
     activity = db.query(Activity).filter(Activity.id == activity_id).first()
 
     if not activity:
@@ -947,15 +857,20 @@ def delete_activity(
             detail="Activity not found"
         )
 
-    if activity.vendor_id != vendor.id:
+    if activity.vendor_id != current_vendor.vendor_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to delete this activity"
         )
 
     # Soft delete - mark as inactive
+    if activity.is_active:
+        record_activity_status(db, False)
     activity.is_active = False
+    refresh_activity_facets(db, [activity_id])
+    refresh_search_documents(db, [activity_id])
     db.commit()
+    activity_cache.bump(activity_id)
 
     return None
 
@@ -967,14 +882,6 @@ def toggle_activity_status(
     current_vendor = Depends(get_current_vendor)
 ):
     """Toggle activity active/inactive status (vendor only)."""
-    # Get vendor record from user
-    vendor = db.query(Vendor).filter(Vendor.user_id == current_vendor.id).first()
-    if not vendor:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Vendor profile not found"
-        )
-
     activity = db.query(Activity).filter(Activity.id == activity_id).first()
 
     if not activity:
@@ -983,7 +890,7 @@ def toggle_activity_status(
             detail="Activity not found"
         )
 
-    if activity.vendor_id != vendor.id:
+    if activity.vendor_id != current_vendor.vendor_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to modify this activity"
@@ -991,7 +898,11 @@ def toggle_activity_status(
 
     # Toggle the status
     activity.is_active = not activity.is_active
+    record_activity_status(db, activity.is_active)
+    refresh_activity_facets(db, [activity_id])
+    refresh_search_documents(db, [activity_id])
     db.commit()
+    activity_cache.bump(activity_id)
     db.refresh(activity)
 
     return _get_activity_details(activity, db)
@@ -1004,14 +915,6 @@ def toggle_activity_availability(
     current_vendor = Depends(get_current_vendor)
 ):
     """Toggle activity available/unavailable tag (vendor only)."""
-    # Get vendor record from user
-    vendor = db.query(Vendor).filter(Vendor.user_id == current_vendor.id).first()
-    if not vendor:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Vendor profile not found"
-        )
-
     activity = db.query(Activity).filter(Activity.id == activity_id).first()
 
     if not activity:
@@ -1020,7 +923,7 @@ def toggle_activity_availability(
             detail="Activity not found"
         )
 
-    if activity.vendor_id != vendor.id:
+    if activity.vendor_id != current_vendor.vendor_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to modify this activity"
@@ -1028,7 +931,10 @@ def toggle_activity_availability(
 
     # Toggle the availability tag
     activity.is_available = not activity.is_available
+    refresh_activity_facets(db, [activity_id])
+    refresh_search_documents(db, [activity_id])
     db.commit()
+    activity_cache.bump(activity_id)
     db.refresh(activity)
 
     return _get_activity_details(activity, db)
\ No newline at end of file
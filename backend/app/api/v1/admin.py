@@ -1,15 +1,30 @@
 """Admin endpoints."""
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from datetime import datetime, timedelta
+from sqlalchemy import desc, func
+from datetime import date, datetime, timedelta
 
 from app.database import get_db
-from app.models import User, Vendor, Activity, Booking, Review, UserRole, ActivityCategory, Category
+from app.models import User, Vendor, Activity, Booking, BookingStatus, Review, UserRole, ActivityCategory, Category
 from app.schemas.common import PaginatedResponse, MessageResponse
 from app.api.deps import get_current_admin
+from app.services.principal_cache import Principal, principal_cache
+from app.services.activity_import import ActivityImporter, import_stream
+from app.services.cache import activity_cache
+from app.services.booking_export import ADMIN_COLUMNS, EXPORT_FORMATS, export_filename, stream_export
+from app.services.cart_holds import hold_metrics
+from app.services import email_outbox
+from app.services.facets import refresh_activity_facets
+from app.services.ratings import average_rating, remove_activity_ratings, remove_review_rating
+from app.services.review_loader import activity_titles, user_names
+from app.services.search_documents import refresh_search_documents
+from app.services import stats
+from app.services.stats import record_activity_deleted, record_activity_status, record_review_deleted
+from app.utils.translation import translation_store, warm_translation_store
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
@@ -17,42 +32,37 @@ router = APIRouter()
 @router.get("/stats")
 def get_platform_stats(
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
-    """Get platform statistics."""
-    # User stats
-    total_users = db.query(User).count()
-    total_customers = db.query(User).filter(User.role == UserRole.CUSTOMER).count()
-    total_vendors = db.query(User).filter(User.role == UserRole.VENDOR).count()
-
-    # Activity stats
-    total_activities = db.query(Activity).count()
-    active_activities = db.query(Activity).filter(Activity.is_active == True).count()
-
-    # Booking stats
-    total_bookings = db.query(Booking).count()
-    total_revenue = db.query(func.sum(Booking.total_price)).scalar() or 0
+    """
+    Get platform statistics.
+
+    Reads the incrementally maintained counters and daily rows
+    (app.services.stats) instead of scanning users, bookings and reviews.
+    """
+    counters = stats.get_counters(db)
+    total_users = int(counters[stats.USERS])
+    total_customers = int(counters[stats.CUSTOMERS])
+    total_vendors = int(counters[stats.VENDORS])
+    total_activities = int(counters[stats.ACTIVITIES])
+    active_activities = int(counters[stats.ACTIVE_ACTIVITIES])
+    total_bookings = int(counters[stats.BOOKINGS])
+    total_revenue = counters[stats.REVENUE]
+    total_reviews = int(counters[stats.REVIEWS])
+    avg_rating = counters[stats.RATING_SUM] / total_reviews if total_reviews else 0
 
     # Recent bookings (last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    recent_bookings = db.query(Booking).filter(
-        Booking.created_at >= thirty_days_ago
-    ).count()
-    recent_revenue = db.query(func.sum(Booking.total_price)).filter(
-        Booking.created_at >= thirty_days_ago
-    ).scalar() or 0
-
-    # Review stats
-    total_reviews = db.query(Review).count()
-    avg_rating = db.query(func.avg(Review.rating)).scalar() or 0
-
-    # Top activities by bookings
+    recent = stats.get_window_totals(db, 30)
+    recent_bookings = recent["bookings"]
+    recent_revenue = recent["revenue"]
+
+    # Top activities by bookings (activities.total_bookings is kept by the booking endpoints)
     top_activities = db.query(
         Activity.id,
         Activity.title,
-        func.count(Booking.id).label('booking_count')
-    ).join(Booking).group_by(Activity.id, Activity.title).order_by(
-        desc('booking_count')
+        Activity.total_bookings.label('booking_count')
+    ).filter(Activity.total_bookings > 0).order_by(
+        desc('booking_count'), Activity.id
     ).limit(5).all()
 
     return {
@@ -92,13 +102,133 @@ def get_platform_stats(
     }
 
 
+@router.get("/stats/timeseries")
+def get_stats_timeseries(
+    days: int = Query(30, ge=1, le=366, description="Number of days, ending today"),
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Per-day bookings, revenue, reviews and sign-ups from the daily rollup."""
+    return {
+        "success": True,
+        "data": {
+            "days": days,
+            "series": stats.get_daily_series(db, days)
+        }
+    }
+
+
+@router.post("/stats/rollup")
+def rollup_platform_stats(
+    days: Optional[int] = Query(None, ge=1, description="Only rebuild daily rows for the last N days"),
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Recompute counters and daily rows from the source tables."""
+    since = datetime.utcnow().date() - timedelta(days=days - 1) if days else None
+    rows = stats.rollup_stats(db, since=since)
+    db.commit()
+    return {
+        "success": True,
+        "data": {"daily_rows": rows},
+        "message": "Statistics recomputed"
+    }
+
+
+@router.get("/cache/stats")
+def get_cache_stats(
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Activity detail cache counters for this worker."""
+    return {
+        "success": True,
+        "data": activity_cache.stats()
+    }
+
+
+@router.get("/cache/principals")
+def get_principal_cache_stats(
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Authenticated-principal cache counters for this worker."""
+    return {
+        "success": True,
+        "data": principal_cache.stats()
+    }
+
+
+@router.get("/inventory/holds")
+def get_inventory_holds(
+    activity_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """
+    Held vs free vs booked capacity per slot from today (or start_date).
+
+    Without activity_id only slots with active cart holds are listed. Sweeper
+    counters are for this worker.
+    """
+    return {
+        "success": True,
+        "data": hold_metrics(db, activity_id=activity_id, start_date=start_date, end_date=end_date)
+    }
+
+
+@router.get("/emails/outbox")
+def get_email_outbox(
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Outbound email queue: messages per status, recent dead letters, worker counters."""
+    return {
+        "success": True,
+        "data": email_outbox.outbox_stats(db)
+    }
+
+
+@router.post("/emails/outbox/requeue")
+def requeue_dead_emails(
+    email_id: Optional[int] = Query(None, description="Requeue one message; all dead messages if omitted"),
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Give dead-lettered emails a fresh set of delivery attempts."""
+    count = email_outbox.requeue(db, email_id)
+    db.commit()
+    return {
+        "success": True,
+        "data": {"requeued": count},
+        "message": f"{count} email(s) requeued"
+    }
+
+
+@router.post("/translations/reload")
+def reload_translations(
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Reload the translation store after translation scripts ran (this worker only)."""
+    translation_store.invalidate()
+    warm_translation_store(db)
+    return {
+        "success": True,
+        "data": translation_store.stats(),
+        "message": "Translations reloaded"
+    }
+
+
 @router.get("/users")
 def list_users(
     role: Optional[str] = Query(None, description="Filter by role"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(False, description="Return an estimated total instead of an exact count"),
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """List all users."""
     query = db.query(User)
@@ -113,13 +243,14 @@ def list_users(
                 detail=f"Invalid role: {role}"
             )
 
-    query = query.order_by(desc(User.created_at))
-
-    total = query.count()
-    offset = (page - 1) * per_page
-    users = query.offset(offset).limit(per_page).all()
+    listing = paginate(
+        db, query,
+        [("created_at", User.created_at, True), ("id", User.id, True)],
+        page=page, per_page=per_page, cursor=cursor, estimate_total=estimate_total
+    )
+    users = listing.items
 
-    return PaginatedResponse.create(
+    return PaginatedResponse.from_page(
         data=[
             {
                 "id": u.id,
@@ -131,9 +262,7 @@ def list_users(
             }
             for u in users
         ],
-        page=page,
-        per_page=per_page,
-        total=total,
+        page=listing,
         message="Users retrieved"
     )
 
@@ -142,7 +271,7 @@ def list_users(
 def toggle_user_status(
     user_id: int,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """Toggle user active status."""
     user = db.query(User).filter(User.id == user_id).first()
@@ -176,15 +305,19 @@ def toggle_user_status(
 def list_vendors(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(False, description="Return an estimated total instead of an exact count"),
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """List all vendors with their activities."""
-    query = db.query(Vendor).join(User).order_by(desc(Vendor.created_at))
-
-    total = query.count()
-    offset = (page - 1) * per_page
-    vendors = query.offset(offset).limit(per_page).all()
+    query = db.query(Vendor).join(User)
+    listing = paginate(
+        db, query,
+        [("created_at", Vendor.created_at, True), ("id", Vendor.id, True)],
+        page=page, per_page=per_page, cursor=cursor, estimate_total=estimate_total
+    )
+    vendors = listing.items
 
     result = []
     for vendor in vendors:
@@ -210,11 +343,9 @@ def list_vendors(
             "created_at": vendor.created_at
         })
 
-    return PaginatedResponse.create(
+    return PaginatedResponse.from_page(
         data=result,
-        page=page,
-        per_page=per_page,
-        total=total,
+        page=listing,
         message="Vendors retrieved"
     )
 
@@ -223,7 +354,7 @@ def list_vendors(
 def toggle_vendor_verification(
     vendor_id: int,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """Toggle vendor verification status."""
     vendor = db.query(Vendor).filter(Vendor.id == vendor_id).first()
@@ -235,7 +366,17 @@ def toggle_vendor_verification(
         )
 
     vendor.is_verified = not vendor.is_verified
+    # The detail page shows the vendor's verified badge; stamp the vendor's
+    # activities so their ETags move.
+    activity_ids = [
+        activity_id for (activity_id,) in
+        db.query(Activity.id).filter(Activity.vendor_id == vendor_id).all()
+    ]
+    db.query(Activity).filter(Activity.vendor_id == vendor_id).update(
+        {Activity.updated_at: func.now()}, synchronize_session=False
+    )
     db.commit()
+    activity_cache.bump(*activity_ids)
 
     return {
         "success": True,
@@ -252,8 +393,10 @@ def list_all_activities(
     status_filter: Optional[str] = Query(None, description="Filter by status: active, inactive"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(False, description="Return an estimated total instead of an exact count"),
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """List all activities for moderation."""
     query = db.query(Activity)
@@ -263,11 +406,12 @@ def list_all_activities(
     elif status_filter == "inactive":
         query = query.filter(Activity.is_active == False)
 
-    query = query.order_by(desc(Activity.created_at))
-
-    total = query.count()
-    offset = (page - 1) * per_page
-    activities = query.offset(offset).limit(per_page).all()
+    listing = paginate(
+        db, query,
+        [("created_at", Activity.created_at, True), ("id", Activity.id, True)],
+        page=page, per_page=per_page, cursor=cursor, estimate_total=estimate_total
+    )
+    activities = listing.items
 
     result = []
     for activity in activities:
@@ -295,11 +439,9 @@ def list_all_activities(
             "created_at": activity.created_at
         })
 
-    return PaginatedResponse.create(
+    return PaginatedResponse.from_page(
         data=result,
-        page=page,
-        per_page=per_page,
-        total=total,
+        page=listing,
         message="Activities retrieved"
     )
 
@@ -308,7 +450,7 @@ def list_all_activities(
 def admin_toggle_activity_status(
     activity_id: int,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """Admin toggle activity status."""
     activity = db.query(Activity).filter(Activity.id == activity_id).first()
@@ -320,7 +462,11 @@ def admin_toggle_activity_status(
         )
 
     activity.is_active = not activity.is_active
+    record_activity_status(db, activity.is_active)
+    refresh_activity_facets(db, [activity_id])
+    refresh_search_documents(db, [activity_id])
     db.commit()
+    activity_cache.bump(activity_id)
 
     return {
         "success": True,
@@ -336,7 +482,7 @@ def admin_toggle_activity_status(
 def admin_toggle_activity_availability(
     activity_id: int,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """Admin toggle activity available/unavailable tag."""
     activity = db.query(Activity).filter(Activity.id == activity_id).first()
@@ -348,7 +494,10 @@ def admin_toggle_activity_availability(
         )
 
     activity.is_available = not activity.is_available
+    refresh_activity_facets(db, [activity_id])
+    refresh_search_documents(db, [activity_id])
     db.commit()
+    activity_cache.bump(activity_id)
 
     return {
         "success": True,
@@ -364,7 +513,7 @@ def admin_toggle_activity_availability(
 def admin_delete_activity(
     activity_id: int,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """Admin delete activity."""
     activity = db.query(Activity).filter(Activity.id == activity_id).first()
@@ -383,25 +532,55 @@ def admin_delete_activity(
             detail=f"Cannot delete activity with {booking_count} existing bookings"
         )
 
+    record_activity_deleted(db, activity)
+    remove_activity_ratings(db, activity)
     db.delete(activity)
     db.commit()
+    activity_cache.bump(activity_id)
 
     return MessageResponse(message="Activity deleted successfully")
 
 
+@router.post("/activities/import")
+async def admin_import_activities(
+    request: Request,
+    vendor_id: Optional[int] = Query(None, description="Vendor of new activities whose line names none"),
+    dry_run: bool = Query(False, description="Report the changes without writing them"),
+    db: Session = Depends(get_db),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """
+    Bulk create/update activities from an NDJSON body, one aggregate per line.
+
+    Lines may name any vendor. Only rows that differ are written; the report
+    lists per-line errors and the rows written per table.
+    """
+    importer = ActivityImporter(db, vendor_id=vendor_id, dry_run=dry_run)
+    report = await import_stream(importer, request.stream())
+    return {
+        "success": True,
+        "data": report.as_dict(),
+        "message": f"{report.created} created, {report.updated} updated, "
+                   f"{report.unchanged} unchanged, {report.failed} failed"
+    }
+
+
 @router.get("/bookings")
 def list_all_bookings(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(False, description="Return an estimated total instead of an exact count"),
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """List all bookings."""
-    query = db.query(Booking).order_by(desc(Booking.created_at))
-
-    total = query.count()
-    offset = (page - 1) * per_page
-    bookings = query.offset(offset).limit(per_page).all()
+    listing = paginate(
+        db, db.query(Booking),
+        [("created_at", Booking.created_at, True), ("id", Booking.id, True)],
+        page=page, per_page=per_page, cursor=cursor, estimate_total=estimate_total
+    )
+    bookings = listing.items
 
     result = []
     for booking in bookings:
@@ -422,38 +601,66 @@ def list_all_bookings(
             "created_at": booking.created_at
         })
 
-    return PaginatedResponse.create(
+    return PaginatedResponse.from_page(
         data=result,
-        page=page,
-        per_page=per_page,
-        total=total,
+        page=listing,
         message="Bookings retrieved"
     )
 
 
+@router.get("/bookings/export")
+def export_all_bookings(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    status: Optional[BookingStatus] = Query(None, description="Filter by status"),
+    vendor_id: Optional[int] = Query(None, description="Filter by vendor"),
+    date_from: Optional[date] = Query(None, description="Booking date from (inclusive)"),
+    date_to: Optional[date] = Query(None, description="Booking date to (inclusive)"),
+    created_from: Optional[date] = Query(None, description="Created on or after"),
+    created_to: Optional[date] = Query(None, description="Created on or before"),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """
+    Stream every booking matching the filters as CSV or NDJSON.
+
+    Rows are read through a server-side cursor and sent in batches, so the
+    export runs in constant memory however many bookings match.
+    """
+    return StreamingResponse(
+        stream_export(
+            ADMIN_COLUMNS, export_format,
+            vendor_id=vendor_id, status=status, date_from=date_from, date_to=date_to,
+            created_from=created_from, created_to=created_to,
+        ),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("bookings", export_format)}"'},
+    )
+
+
 @router.get("/reviews")
 def list_all_reviews(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(False, description="Return an estimated total instead of an exact count"),
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """List all reviews for moderation."""
-    query = db.query(Review).order_by(desc(Review.created_at))
-
-    total = query.count()
-    offset = (page - 1) * per_page
-    reviews = query.offset(offset).limit(per_page).all()
+    listing = paginate(
+        db, db.query(Review),
+        [("created_at", Review.created_at, True), ("id", Review.id, True)],
+        page=page, per_page=per_page, cursor=cursor, estimate_total=estimate_total
+    )
+    reviews = listing.items
+    names = user_names(db, [review.user_id for review in reviews])
+    titles = activity_titles(db, [review.activity_id for review in reviews])
 
     result = []
     for review in reviews:
-        user = db.query(User).filter(User.id == review.user_id).first()
-        activity = db.query(Activity).filter(Activity.id == review.activity_id).first()
-
         result.append({
             "id": review.id,
-            "user_name": user.full_name if user else None,
-            "activity_title": activity.title if activity else None,
+            "user_name": names.get(review.user_id),
+            "activity_title": titles.get(review.activity_id),
             "rating": review.rating,
             "title": review.title,
             "comment": review.comment,
@@ -462,11 +669,9 @@ def list_all_reviews(
             "created_at": review.created_at
         })
 
-    return PaginatedResponse.create(
+    return PaginatedResponse.from_page(
         data=result,
-        page=page,
-        per_page=per_page,
-        total=total,
+        page=listing,
         message="Reviews retrieved"
     )
 
@@ -475,7 +680,7 @@ def list_all_reviews(
 def admin_delete_review(
     review_id: int,
     db: Session = Depends(get_db),
-    current_admin: User = Depends(get_current_admin)
+    current_admin: Principal = Depends(get_current_admin)
 ):
     """Admin delete review."""
     review = db.query(Review).filter(Review.id == review_id).first()
@@ -488,15 +693,17 @@ def admin_delete_review(
 
     # Update activity stats
     activity = db.query(Activity).filter(Activity.id == review.activity_id).first()
+    review_count, rating_sum = remove_review_rating(db, review)
     db.delete(review)
+    record_review_deleted(db, review)
 
     if activity:
-        result = db.query(
-            func.coalesce(func.avg(Review.rating), 0),
-            func.count(Review.id)
-        ).filter(Review.activity_id == activity.id).first()
-        activity.average_rating = round(float(result[0]), 1)
-        activity.total_reviews = result[1]
+        activity.average_rating = average_rating(review_count, rating_sum)
+        activity.total_reviews = review_count
+        refresh_activity_facets(db, [activity.id])
+        refresh_search_documents(db, [activity.id])
     db.commit()
+    if activity:
+        activity_cache.bump(activity.id)
 
     return MessageResponse(message="Review deleted successfully")
@@ -3,12 +3,14 @@
 import logging
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
 
 logger = logging.getLogger(__name__)
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.models.user import User, UserRole, Vendor
 from app.models import Booking, Review, Wishlist
 from app.schemas.user import (
@@ -20,22 +22,48 @@ from app.schemas.user import (
     VendorRegister
 )
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token
 )
+from app.core.password_pool import PasswordPoolBusy, check_password, hash_password
 from app.config import settings
 from app.api.deps import get_current_user, get_current_active_user
+from app.services.principal_cache import Principal
 from app.services.email import EmailService
+from app.services.stats import record_user_created
 
 router = APIRouter()
 
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Server is busy, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _email_taken(db: Session, email: str) -> bool:
+    return db.query(User.id).filter(User.email == email).first() is not None
+
+
+def _credentials(db: Session, email: str):
+    """(id, password_hash, is_active) of the user with ``email``, or None."""
+    return db.query(User.id, User.password_hash, User.is_active).filter(User.email == email).first()
+
+
+def _store_password_hash(db: Session, user_id: int, password_hash: str) -> None:
+    db.query(User).filter(User.id == user_id).update(
+        {User.password_hash: password_hash}, synchronize_session=False
+    )
+    db.commit()
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(
+async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new user.
@@ -51,17 +79,42 @@ def register(
         HTTPException: If email already exists
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    email_taken = await db.run_sync(_email_taken, user_data.email)
+    # Give the connection back before waiting on the hashing pool, which may
+    # queue more requests than the async engine has connections.
+    await db.close()
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
+    try:
+        password_hash = await hash_password(user_data.password)
+    except PasswordPoolBusy:
+        raise _hashing_busy()
+
+    user = await db.run_sync(_create_customer, user_data, password_hash)
+
+    # Send welcome email
+    try:
+        await run_in_threadpool(
+            EmailService.send_welcome_email,
+            user_email=user.email,
+            user_name=user.full_name
+        )
+    except Exception as e:
+        # Log email error but don't fail registration
+        logger.error(f"Failed to send welcome email to {user.email}: {e}")
+
+    return user
+
+
+def _create_customer(db: Session, user_data: UserCreate, password_hash: str) -> UserResponse:
     # Create new user
     db_user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=password_hash,
         full_name=user_data.full_name,
         phone=user_data.phone,
         role=UserRole.CUSTOMER
@@ -69,19 +122,9 @@ def register(
 
     try:
         db.add(db_user)
+        record_user_created(db, db_user.role)
         db.commit()
         db.refresh(db_user)
-        
-        # Send welcome email
-        try:
-            EmailService.send_welcome_email(
-                user_email=db_user.email,
-                user_name=db_user.full_name
-            )
-        except Exception as e:
-            # Log email error but don't fail registration
-            logger.error(f"Failed to send welcome email to {db_user.email}: {e}")
-            
     except IntegrityError as e:
         db.rollback()
         logger.error(f"IntegrityError during user creation: {e}")
@@ -97,13 +140,14 @@ def register(
             detail="Could not create user"
         )
 
-    return db_user
+    # Serialized here, where relationships can still lazy-load.
+    return UserResponse.model_validate(db_user)
 
 
 @router.post("/register-vendor", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_vendor(
+async def register_vendor(
     data: VendorRegister,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new vendor.
@@ -119,17 +163,43 @@ def register_vendor(
         HTTPException: If email already exists
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == data.email).first()
-    if existing_user:
+    email_taken = await db.run_sync(_email_taken, data.email)
+    # Give the connection back before waiting on the hashing pool, which may
+    # queue more requests than the async engine has connections.
+    await db.close()
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
+    try:
+        password_hash = await hash_password(data.password)
+    except PasswordPoolBusy:
+        raise _hashing_busy()
+
+    user = await db.run_sync(_create_vendor, data, password_hash)
+
+    # Send vendor welcome email
+    try:
+        await run_in_threadpool(
+            EmailService.send_vendor_welcome_email,
+            user_email=user.email,
+            user_name=user.full_name,
+            company_name=data.company_name
+        )
+    except Exception as e:
+        # Log email error but don't fail registration
+        logger.error(f"Failed to send vendor welcome email to {user.email}: {e}")
+
+    return user
+
+
+def _create_vendor(db: Session, data: VendorRegister, password_hash: str) -> UserResponse:
     # Create user with vendor role
     db_user = User(
         email=data.email,
-        password_hash=get_password_hash(data.password),
+        password_hash=password_hash,
         full_name=data.full_name,
         phone=data.phone,
         role=UserRole.VENDOR
@@ -148,21 +218,10 @@ def register_vendor(
             commission_rate=settings.DEFAULT_COMMISSION_RATE
         )
         db.add(db_vendor)
+        record_user_created(db, db_user.role)
 
         db.commit()
         db.refresh(db_user)
-        
-        # Send vendor welcome email
-        try:
-            EmailService.send_vendor_welcome_email(
-                user_email=db_user.email,
-                user_name=db_user.full_name,
-                company_name=data.company_name
-            )
-        except Exception as e:
-            # Log email error but don't fail registration
-            logger.error(f"Failed to send vendor welcome email to {db_user.email}: {e}")
-            
     except IntegrityError:
         db.rollback()
         raise HTTPException(
@@ -170,13 +229,13 @@ def register_vendor(
             detail="Could not create vendor"
         )
 
-    return db_user
+    return UserResponse.model_validate(db_user)
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Login user and return access token.
@@ -192,8 +251,15 @@ def login(
         HTTPException: If credentials are invalid
     """
     # Authenticate user
-    user = db.query(User).filter(User.email == form_data.email).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    user = await db.run_sync(_credentials, form_data.email)
+    # Give the connection back before waiting on the hashing pool, which may
+    # queue more requests than the async engine has connections.
+    await db.close()
+    try:
+        authenticated = user is not None and await check_password(form_data.password, user.password_hash)
+    except PasswordPoolBusy:
+        raise _hashing_busy()
+    if not authenticated:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -206,6 +272,15 @@ def login(
             detail="Inactive user"
         )
 
+    # BCRYPT_ROUNDS changed since this password was hashed: upgrade it while
+    # we have the plain text. Skipped (until the next login) when busy.
+    if password_needs_rehash(user.password_hash):
+        try:
+            password_hash = await hash_password(form_data.password)
+            await db.run_sync(_store_password_hash, user.id, password_hash)
+        except PasswordPoolBusy:
+            pass
+
     # Create tokens
     access_token = create_access_token(subject=str(user.id))
     refresh_token = create_refresh_token(subject=str(user.id))
@@ -218,18 +293,21 @@ def login(
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_profile(
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
 ):
     """
     Get current user profile.
 
     Args:
         current_user: Current authenticated user
+        db: Database session
 
     Returns:
         UserResponse: Current user profile
     """
-    return current_user
+    # The full profile (vendor details included) is not part of the cached principal.
+    return db.query(User).filter(User.id == current_user.id).first()
 
 
 @router.post("/refresh", response_model=Token)
@@ -287,7 +365,7 @@ def refresh_token(
 
 @router.get("/me/statistics")
 def get_user_statistics(
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -3,6 +3,7 @@
 import logging
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Body
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, func
 from datetime import datetime, date, timedelta
@@ -12,7 +13,7 @@ logger = logging.getLogger(__name__)
 
 from app.database import get_db
 from app.models import (
-    Booking, Activity, User, Vendor, Availability,
+    Booking, Activity, Vendor, Availability,
     BookingStatus, ActivityImage, UserRole
 )
 from app.schemas.booking import (
@@ -21,16 +22,30 @@ from app.schemas.booking import (
 )
 from app.schemas.common import PaginatedResponse, MessageResponse
 from app.api.deps import get_current_user, get_current_vendor, get_optional_current_user
+from app.services.cache import activity_cache
+from app.services.booking_export import EXPORT_FORMATS, VENDOR_COLUMNS, export_filename, stream_export
+from app.services.principal_cache import Principal
 from app.services.email import EmailService
+from app.services.inventory import DEFAULT_CAPACITY, SoldOutError, release_booking, reserve
+from app.services.search_documents import refresh_search_documents
+from app.services.stats import record_booking_created
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
+# Newest booking date first; created_at and id break ties for keyset cursors.
+_BOOKING_SORT_KEYS = [
+    ("booking_date", Booking.booking_date, True),
+    ("created_at", Booking.created_at, True),
+    ("id", Booking.id, True),
+]
+
 
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 def create_booking(
     booking_data: BookingCreate,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user)
+    current_user: Optional[Principal] = Depends(get_optional_current_user)
 ):
     """
     Create a new booking.
@@ -48,15 +63,25 @@ def create_booking(
             detail="Activity not found"
         )
 
-    # Check availability (simplified - in production, check actual availability)
     if booking_data.booking_date < date.today():
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot book for past dates"
         )
 
-    # Calculate total price
+    # Take the spots first; concurrent buyers of the last spots get a 409
+    # instead of overselling the slot.
     total_participants = booking_data.adults + booking_data.children
+    try:
+        reserve(db, activity, booking_data.booking_date, booking_data.booking_time, total_participants)
+    except SoldOutError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Not enough availability for this date and time ({e.spots_available} spots left)"
+        )
+
+    # Calculate total price
     total_price = (
         activity.price_adult * booking_data.adults +
         (activity.price_child or 0) * booking_data.children
@@ -95,12 +120,18 @@ def create_booking(
 
     db.add(db_booking)
 
-    # Update activity booking count
+    # Update activity booking count; it is on the detail page, so stamp the
+    # activity for its ETag as well.
     activity.total_bookings += 1
+    activity.updated_at = func.now()
+    record_booking_created(db, total_price)
 
     try:
+        # total_bookings is a search sort key.
+        refresh_search_documents(db, [activity.id])
         db.commit()
         db.refresh(db_booking)
+        activity_cache.bump(activity.id)
         
         # Send booking confirmation email if instant confirmation
         if activity.instant_confirmation and db_booking.customer_email:
@@ -139,8 +170,10 @@ def get_my_bookings(
     past_only: bool = Query(False, description="Show only past bookings"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(False, description="Return an estimated total instead of an exact count"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get current user's bookings."""
     query = db.query(Booking).filter(Booking.user_id == current_user.id)
@@ -157,14 +190,11 @@ def get_my_bookings(
         query = query.filter(Booking.booking_date < today)
 
     # Order by booking date
-    query = query.order_by(Booking.booking_date.desc(), Booking.created_at.desc())
-
-    # Get total count
-    total = query.count()
-
-    # Pagination
-    offset = (page - 1) * per_page
-    bookings = query.offset(offset).limit(per_page).all()
+    result = paginate(
+        db, query, _BOOKING_SORT_KEYS,
+        page=page, per_page=per_page, cursor=cursor, estimate_total=estimate_total
+    )
+    bookings = result.items
 
     # Prepare response
     response_bookings = []
@@ -174,11 +204,9 @@ def get_my_bookings(
             continue
         response_bookings.append(_prepare_booking_response(booking, activity, db))
 
-    return PaginatedResponse.create(
+    return PaginatedResponse.from_page(
         data=response_bookings,
-        page=page,
-        per_page=per_page,
-        total=total,
+        page=result,
         message="Bookings retrieved"
     )
 
@@ -187,7 +215,7 @@ def get_my_bookings(
 def get_booking(
     booking_ref: str,
     db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_optional_current_user)
+    current_user: Optional[Principal] = Depends(get_optional_current_user)
 ):
     """Get booking details by reference."""
     booking = db.query(Booking).filter(Booking.booking_ref == booking_ref).first()
@@ -219,7 +247,7 @@ def get_booking(
 def cancel_booking(
     booking_ref: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Cancel a booking."""
     booking = db.query(Booking).filter(
@@ -262,6 +290,7 @@ def cancel_booking(
         )
 
     # Cancel booking
+    release_booking(db, booking)
     booking.status = BookingStatus.CANCELLED
     booking.cancelled_at = datetime.utcnow()
 
@@ -299,45 +328,49 @@ def get_activity_availability(
             detail="Activity not found"
         )
 
-    # Get availability records
-    availability = db.query(Availability).filter(
+    # Get availability records (rows are created by vendors or on first booking)
+    records = db.query(Availability).filter(
         Availability.activity_id == activity_id,
         Availability.date >= start_date,
-        Availability.date <= end_date,
-        Availability.is_available == True
+        Availability.date <= end_date
     ).order_by(Availability.date, Availability.start_time).all()
-
-    # If no specific availability, create default availability
-    if not availability:
-        availability = []
-        current_date = start_date
-        while current_date <= end_date:
-            # Skip past dates
-            if current_date >= date.today():
-                avail = Availability(
-                    activity_id=activity_id,
-                    date=current_date,
-                    spots_available=activity.max_group_size or 20,
-                    spots_total=activity.max_group_size or 20,
-                    price_adult=activity.price_adult,
-                    price_child=activity.price_child,
-                    is_available=True
-                )
-                availability.append(AvailabilityResponse(
-                    id=0,
-                    date=current_date,
-                    start_time=None,
-                    end_time=None,
-                    spots_available=avail.spots_available,
-                    spots_total=avail.spots_total,
-                    price_adult=avail.price_adult,
-                    price_child=avail.price_child,
-                    is_available=True
-                ))
-            current_date += timedelta(days=1)
-
-        return availability
-
+    dates_with_records = {record.date for record in records}
+
+    # Dates without a record have the default capacity
+    availability = []
+    current_date = start_date
+    while current_date <= end_date:
+        # Skip past dates
+        if current_date not in dates_with_records and current_date >= date.today():
+            availability.append(AvailabilityResponse(
+                id=0,
+                date=current_date,
+                start_time=None,
+                end_time=None,
+                spots_available=activity.max_group_size or DEFAULT_CAPACITY,
+                spots_total=activity.max_group_size or DEFAULT_CAPACITY,
+                price_adult=activity.price_adult,
+                price_child=activity.price_child,
+                is_available=True
+            ))
+        current_date += timedelta(days=1)
+
+    availability.extend(
+        AvailabilityResponse(
+            id=record.id,
+            date=record.date,
+            start_time=record.start_time,
+            end_time=record.end_time,
+            spots_available=max(record.spots_available or 0, 0),
+            spots_total=record.spots_total or 0,
+            price_adult=record.price_adult,
+            price_child=record.price_child,
+            is_available=record.is_available
+        )
+        for record in records
+        if record.is_available
+    )
+    availability.sort(key=lambda a: (a.date, a.start_time is not None, a.start_time or datetime.min.time()))
     return availability
 
 
@@ -348,12 +381,14 @@ def get_vendor_bookings(
     booking_date: Optional[date] = Query(None, description="Filter by booking date"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(False, description="Return an estimated total instead of an exact count"),
     db: Session = Depends(get_db),
-    current_vendor: User = Depends(get_current_vendor)
+    current_vendor: Principal = Depends(get_current_vendor)
 ):
     """Get bookings for vendor's activities."""
     query = db.query(Booking).filter(
-        Booking.vendor_id == current_vendor.vendor_profile.id
+        Booking.vendor_id == current_vendor.vendor_id
     )
 
     # Filters
@@ -364,14 +399,11 @@ def get_vendor_bookings(
         query = query.filter(Booking.booking_date == booking_date)
 
     # Order by booking date
-    query = query.order_by(Booking.booking_date.desc(), Booking.created_at.desc())
-
-    # Get total count
-    total = query.count()
-
-    # Pagination
-    offset = (page - 1) * per_page
-    bookings = query.offset(offset).limit(per_page).all()
+    result = paginate(
+        db, query, _BOOKING_SORT_KEYS,
+        page=page, per_page=per_page, cursor=cursor, estimate_total=estimate_total
+    )
+    bookings = result.items
 
     # Prepare response
     response_bookings = []
@@ -381,25 +413,45 @@ def get_vendor_bookings(
             continue
         response_bookings.append(_prepare_booking_response(booking, activity, db))
 
-    return PaginatedResponse.create(
+    return PaginatedResponse.from_page(
         data=response_bookings,
-        page=page,
-        per_page=per_page,
-        total=total,
+        page=result,
         message="Vendor bookings retrieved"
     )
 
 
+@router.get("/vendor/bookings/export")
+def export_vendor_bookings(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    status: Optional[BookingStatus] = Query(None, description="Filter by status"),
+    date_from: Optional[date] = Query(None, description="Booking date from (inclusive)"),
+    date_to: Optional[date] = Query(None, description="Booking date to (inclusive)"),
+    created_from: Optional[date] = Query(None, description="Created on or after"),
+    created_to: Optional[date] = Query(None, description="Created on or before"),
+    current_vendor: Principal = Depends(get_current_vendor)
+):
+    """Stream the vendor's bookings matching the filters as CSV or NDJSON."""
+    return StreamingResponse(
+        stream_export(
+            VENDOR_COLUMNS, export_format,
+            vendor_id=current_vendor.vendor_id, status=status, date_from=date_from, date_to=date_to,
+            created_from=created_from, created_to=created_to,
+        ),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename("bookings", export_format)}"'},
+    )
+
+
 @router.patch("/vendor/{booking_id}/approve", response_model=BookingResponse)
 def approve_booking(
     booking_id: int,
     db: Session = Depends(get_db),
-    current_vendor: User = Depends(get_current_vendor)
+    current_vendor: Principal = Depends(get_current_vendor)
 ):
     """Approve a pending booking."""
     booking = db.query(Booking).filter(
         Booking.id == booking_id,
-        Booking.vendor_id == current_vendor.vendor_profile.id
+        Booking.vendor_id == current_vendor.vendor_id
     ).first()
 
     if not booking:
@@ -450,12 +502,12 @@ def reject_booking(
     booking_id: int,
     rejection_reason: str,
     db: Session = Depends(get_db),
-    current_vendor: User = Depends(get_current_vendor)
+    current_vendor: Principal = Depends(get_current_vendor)
 ):
     """Reject a pending booking."""
     booking = db.query(Booking).filter(
         Booking.id == booking_id,
-        Booking.vendor_id == current_vendor.vendor_profile.id
+        Booking.vendor_id == current_vendor.vendor_id
     ).first()
 
     if not booking:
@@ -477,6 +529,7 @@ def reject_booking(
         )
 
     # Reject booking
+    release_booking(db, booking)
     booking.status = BookingStatus.REJECTED
     booking.rejection_reason = rejection_reason
     booking.vendor_rejected_at = datetime.utcnow()
@@ -522,12 +575,12 @@ def reject_booking(
 def checkin_booking(
     booking_id: int,
     db: Session = Depends(get_db),
-    current_vendor: User = Depends(get_current_vendor)
+    current_vendor: Principal = Depends(get_current_vendor)
 ):
     """Mark a booking as checked in (completed)."""
     booking = db.query(Booking).filter(
         Booking.id == booking_id,
-        Booking.vendor_id == current_vendor.vendor_profile.id
+        Booking.vendor_id == current_vendor.vendor_id
     ).first()
 
     if not booking:
@@ -586,12 +639,12 @@ def vendor_cancel_booking(
     booking_id: int,
     reason: str = Body(..., embed=True),
     db: Session = Depends(get_db),
-    current_vendor: User = Depends(get_current_vendor)
+    current_vendor: Principal = Depends(get_current_vendor)
 ):
     """Vendor cancels a confirmed booking."""
     booking = db.query(Booking).filter(
         Booking.id == booking_id,
-        Booking.vendor_id == current_vendor.vendor_profile.id
+        Booking.vendor_id == current_vendor.vendor_id
     ).first()
 
     if not booking:
@@ -619,6 +672,7 @@ def vendor_cancel_booking(
         )
 
     # Cancel booking
+    release_booking(db, booking)
     booking.status = BookingStatus.CANCELLED
     booking.rejection_reason = reason  # Reuse this field for cancellation reason
     booking.cancelled_at = datetime.utcnow()
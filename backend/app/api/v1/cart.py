@@ -12,6 +12,8 @@ from app.database import get_db
 from app.models import CartItem, Activity, ActivityImage, ActivityTimeSlot, ActivityPricingTier, ActivityAddOn
 from app.schemas.booking import CartItemCreate, CartItemResponse
 from app.schemas.common import MessageResponse
+from app.services.cart_holds import drop_hold, place_hold, touch_cart
+from app.services.inventory import SoldOutError
 
 router = APIRouter()
 
@@ -75,12 +77,24 @@ def calculate_cart_price(
     return total
 
 
+def _sold_out(db: Session, error: SoldOutError) -> HTTPException:
+    db.rollback()
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Not enough availability for this date and time ({error.spots_available} spots left)"
+    )
+
+
 @router.get("/", response_model=List[CartItemResponse])
 def get_cart_items(
     db: Session = Depends(get_db),
     session_id: str = Depends(get_session_id)
 ):
     """Get cart items for current session."""
+    # Viewing the cart keeps its holds alive.
+    touch_cart(db, session_id)
+    db.commit()
+
     cart_items = db.query(CartItem).filter(
         CartItem.session_id == session_id
     ).order_by(CartItem.created_at.desc()).all()
@@ -112,6 +126,7 @@ def get_cart_items(
                 adults=item.adults,
                 children=item.children,
                 price=item.price,
+                hold_expires_at=item.hold_expires_at,
                 created_at=item.created_at
             ))
 
@@ -165,7 +180,8 @@ def add_to_cart(
     )
 
     if existing_item:
-        # Update quantities and enhanced booking fields
+        # Update quantities and enhanced booking fields; the hold is re-taken for the new party size
+        drop_hold(db, existing_item)
         existing_item.adults = cart_item.adults
         existing_item.children = cart_item.children
         existing_item.price = total_price
@@ -173,6 +189,10 @@ def add_to_cart(
         existing_item.pricing_tier_id = cart_item.pricing_tier_id
         existing_item.add_on_ids = json.dumps(cart_item.add_on_ids) if cart_item.add_on_ids else None
         existing_item.add_on_quantities = json.dumps(cart_item.add_on_quantities) if cart_item.add_on_quantities else None
+        try:
+            place_hold(db, existing_item, activity)
+        except SoldOutError as e:
+            raise _sold_out(db, e)
         db.commit()
         db.refresh(existing_item)
         db_cart_item = existing_item
@@ -192,6 +212,10 @@ def add_to_cart(
             add_on_quantities=json.dumps(cart_item.add_on_quantities) if cart_item.add_on_quantities else None
         )
 
+        try:
+            place_hold(db, db_cart_item, activity)
+        except SoldOutError as e:
+            raise _sold_out(db, e)
         db.add(db_cart_item)
         db.commit()
         db.refresh(db_cart_item)
@@ -220,6 +244,7 @@ def add_to_cart(
         adults=db_cart_item.adults,
         children=db_cart_item.children,
         price=db_cart_item.price,
+        hold_expires_at=db_cart_item.hold_expires_at,
         created_at=db_cart_item.created_at
     )
 
@@ -257,7 +282,8 @@ def update_cart_item(
         add_on_quantities=cart_update.add_on_quantities
     )
 
-    # Update quantities and enhanced booking fields
+    # Update quantities and enhanced booking fields; the hold moves with the item
+    drop_hold(db, cart_item)
     cart_item.adults = cart_update.adults
     cart_item.children = cart_update.children
     cart_item.booking_date = cart_update.booking_date
@@ -268,6 +294,10 @@ def update_cart_item(
     cart_item.add_on_ids = json.dumps(cart_update.add_on_ids) if cart_update.add_on_ids else None
     cart_item.add_on_quantities = json.dumps(cart_update.add_on_quantities) if cart_update.add_on_quantities else None
 
+    try:
+        place_hold(db, cart_item, activity)
+    except SoldOutError as e:
+        raise _sold_out(db, e)
     db.commit()
     db.refresh(cart_item)
 
@@ -295,6 +325,7 @@ def update_cart_item(
         adults=cart_item.adults,
         children=cart_item.children,
         price=cart_item.price,
+        hold_expires_at=cart_item.hold_expires_at,
         created_at=cart_item.created_at
     )
 
@@ -317,6 +348,7 @@ def remove_from_cart(
             detail="Cart item not found"
         )
 
+    drop_hold(db, cart_item)
     db.delete(cart_item)
     db.commit()
 
@@ -329,6 +361,9 @@ def clear_cart(
     session_id: str = Depends(get_session_id)
 ):
     """Clear all items from cart."""
+    held_items = db.query(CartItem).filter(CartItem.session_id == session_id, CartItem.held_spots > 0).all()
+    for item in held_items:
+        drop_hold(db, item)
     db.query(CartItem).filter(CartItem.session_id == session_id).delete()
     db.commit()
 
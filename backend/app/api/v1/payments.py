@@ -12,6 +12,7 @@ from decimal import Decimal
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Header, Body, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -19,6 +20,10 @@ from app.config import settings
 from app.models import Booking, BookingStatus, CartItem, Activity
 from app.api.deps import get_optional_current_user
 from app.services.email import EmailService
+from app.services.cache import activity_cache
+from app.services.cart_holds import book_item, refresh_hold
+from app.services.search_documents import refresh_search_documents
+from app.services.stats import record_booking_created
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -88,10 +93,16 @@ def create_checkout_session(
     currency = "eur"
     line_items = []
     subtotal = Decimal("0")
+    sold_out = []
     for it in items:
         activity = db.query(Activity).filter(Activity.id == it.activity_id).first()
         if not activity:
             continue
+        # Hold the spots for the whole payment window; never charge for a slot
+        # that sold out while the cart was idle.
+        if not refresh_hold(db, it, activity, settings.CART_CHECKOUT_HOLD_MINUTES):
+            sold_out.append(activity.title or "Activity")
+            continue
         price = Decimal(str(it.price or 0))
         subtotal += price
         line_items.append({
@@ -103,6 +114,12 @@ def create_checkout_session(
             "quantity": 1,
         })
 
+    db.commit()
+    if sold_out:
+        raise HTTPException(
+            status_code=409,
+            detail=f"No longer available for the selected date and time: {', '.join(sold_out)}"
+        )
     if not line_items:
         raise HTTPException(status_code=400, detail="Cart has no valid items")
 
@@ -193,9 +210,12 @@ def confirm_checkout(
         if not activity:
             continue
         participants = (it.adults or 0) + (it.children or 0)
-        # Payment is captured now; activities without instant confirmation still
-        # go through the vendor-approval queue (just already paid).
-        instant = bool(activity.instant_confirmation)
+        # Payment is captured now, so the spots are taken even if the cart hold
+        # expired and the slot sold out meanwhile; an overbooked item goes to
+        # the vendor to approve or reject (which refunds). Activities without
+        # instant confirmation always go through the vendor-approval queue.
+        had_room = book_item(db, it, activity)
+        instant = bool(activity.instant_confirmation) and had_room
         booking = Booking(
             user_id=current_user.id if current_user else None,
             activity_id=activity.id,
@@ -220,9 +240,15 @@ def confirm_checkout(
         )
         db.add(booking)
         activity.total_bookings = (activity.total_bookings or 0) + 1
+        # Shown on the detail page: move its ETag.
+        activity.updated_at = func.now()
+        record_booking_created(db, booking.total_price)
         created.append((booking, activity))
 
+    # total_bookings is a search sort key.
+    refresh_search_documents(db, {activity.id for _, activity in created})
     db.commit()
+    activity_cache.bump(*{activity.id for _, activity in created})
 
     refs = []
     for booking, activity in created:
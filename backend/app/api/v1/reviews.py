@@ -1,30 +1,65 @@
 """Review endpoints."""
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
 from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from datetime import datetime
 
-from app.database import get_db
-from app.models import Review, ReviewImage, ReviewCategory, Activity, Booking, User, BookingStatus
-from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse
+from app.database import get_async_db, get_db
+from app.models import Review, ReviewImage, Activity, Booking, BookingStatus
+from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse, RatingSummaryResponse
 from app.schemas.common import PaginatedResponse, MessageResponse
 from app.api.deps import get_current_user
+from app.services.principal_cache import Principal
+from app.services.cache import activity_cache
+from app.services.facets import refresh_activity_facets
+from app.services.ratings import (
+    ACTIVITY, VENDOR, add_review_rating, average_rating, change_review_rating,
+    get_rating_summary, remove_review_rating
+)
+from app.services.review_loader import hydrate_reviews, review_sort_keys
+from app.services.search_documents import refresh_search_documents
+from app.services.stats import (
+    record_review_created, record_review_deleted, record_review_rating_changed
+)
+from app.utils.pagination import paginate
 
 router = APIRouter()
 
 
 @router.get("/activity/{activity_id}", response_model=PaginatedResponse[ReviewResponse])
-def get_activity_reviews(
+async def get_activity_reviews(
     activity_id: int,
     rating: Optional[int] = Query(None, ge=1, le=5, description="Filter by rating"),
     verified_only: bool = Query(False, description="Only verified bookings"),
+    sort_by: str = Query("helpful", description="Sort: helpful, recent, rating"),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(False, description="Return an estimated total instead of an exact count"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get reviews for an activity."""
+    return await db.run_sync(
+        _get_activity_reviews, activity_id,
+        rating=rating, verified_only=verified_only, sort_by=sort_by, page=page, per_page=per_page,
+        cursor=cursor, estimate_total=estimate_total,
+    )
+
+
+def _get_activity_reviews(
+    db: Session,
+    activity_id: int,
+    rating: Optional[int],
+    verified_only: bool,
+    sort_by: str,
+    page: int,
+    per_page: int,
+    cursor: Optional[str],
+    estimate_total: bool,
+) -> PaginatedResponse[ReviewResponse]:
     # Validate activity
     activity = db.query(Activity).filter(
         Activity.id == activity_id,
@@ -47,54 +82,46 @@ def get_activity_reviews(
     if verified_only:
         query = query.filter(Review.is_verified_booking == True)
 
-    # Order by most helpful and recent
-    query = query.order_by(Review.helpful_count.desc(), Review.created_at.desc())
-
-    # Get total count
-    total = query.count()
-
-    # Pagination
-    offset = (page - 1) * per_page
-    reviews = query.offset(offset).limit(per_page).all()
+    result = paginate(
+        db, query, review_sort_keys(sort_by),
+        page=page, per_page=per_page, cursor=cursor, estimate_total=estimate_total
+    )
 
-    # Prepare response
-    response_reviews = []
-    for review in reviews:
-        user = db.query(User).filter(User.id == review.user_id).first()
-        images = db.query(ReviewImage).filter(ReviewImage.review_id == review.id).all()
-        category_ratings = db.query(ReviewCategory).filter(ReviewCategory.review_id == review.id).all()
-
-        response_reviews.append(ReviewResponse(
-            id=review.id,
-            user={
-                "id": user.id,
-                "name": user.full_name,
-                "avatar": None  # Could add avatar URL if we had it
-            },
-            rating=review.rating,
-            title=review.title,
-            comment=review.comment,
-            is_verified_booking=review.is_verified_booking,
-            helpful_count=review.helpful_count,
-            created_at=review.created_at,
-            images=images,
-            category_ratings=category_ratings
-        ))
-
-    return PaginatedResponse.create(
-        data=response_reviews,
-        page=page,
-        per_page=per_page,
-        total=total,
+    return PaginatedResponse.from_page(
+        data=hydrate_reviews(db, result.items),
+        page=result,
         message="Reviews retrieved"
     )
 
 
+@router.get("/activity/{activity_id}/summary", response_model=RatingSummaryResponse)
+async def get_activity_rating_summary(
+    activity_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Average, star histogram and per-category averages of an activity's reviews."""
+    return await db.run_sync(_get_rating_summary, ACTIVITY, activity_id)
+
+
+@router.get("/vendor/{vendor_id}/summary", response_model=RatingSummaryResponse)
+async def get_vendor_rating_summary(
+    vendor_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Average, star histogram and per-category averages across a vendor's reviews."""
+    return await db.run_sync(_get_rating_summary, VENDOR, vendor_id)
+
+
+def _get_rating_summary(db: Session, scope: str, scope_id: int) -> RatingSummaryResponse:
+    # One primary-key read plus the category rows (app.services.ratings).
+    return RatingSummaryResponse(**get_rating_summary(db, scope, scope_id))
+
+
 @router.post("/", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
 def create_review(
     review_data: ReviewCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new review."""
     # Validate activity
@@ -149,9 +176,10 @@ def create_review(
     )
 
     db.add(db_review)
+    record_review_created(db, db_review.rating)
 
     # Update activity rating
-    _update_activity_rating(activity, db)
+    _update_activity_rating(activity, add_review_rating(db, db_review), db)
 
     try:
         db.commit()
@@ -162,6 +190,7 @@ def create_review(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Could not create review"
         )
+    activity_cache.bump(activity.id)
 
     # Prepare response
     return ReviewResponse(
@@ -186,7 +215,7 @@ def update_review(
     review_id: int,
     review_update: ReviewUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Update a review."""
     review = db.query(Review).filter(
@@ -201,8 +230,14 @@ def update_review(
         )
 
     # Update fields
-    if review_update.rating is not None:
+    if review_update.rating is not None and review_update.rating != review.rating:
+        old_rating = review.rating
         review.rating = review_update.rating
+        record_review_rating_changed(db, review, old_rating)
+
+        # Update activity rating
+        activity = db.query(Activity).filter(Activity.id == review.activity_id).first()
+        _update_activity_rating(activity, change_review_rating(db, review, old_rating), db)
     if review_update.title is not None:
         review.title = review_update.title
     if review_update.comment is not None:
@@ -210,11 +245,8 @@ def update_review(
 
     review.updated_at = datetime.utcnow()
 
-    # Update activity rating
-    activity = db.query(Activity).filter(Activity.id == review.activity_id).first()
-    _update_activity_rating(activity, db)
-
     db.commit()
+    activity_cache.bump(review.activity_id)
     db.refresh(review)
 
     # Prepare response
@@ -241,7 +273,7 @@ def update_review(
 def delete_review(
     review_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a review."""
     review = db.query(Review).filter(
@@ -257,13 +289,16 @@ def delete_review(
 
     activity_id = review.activity_id
 
+    totals = remove_review_rating(db, review)
     db.delete(review)
+    record_review_deleted(db, review)
 
     # Update activity rating
     activity = db.query(Activity).filter(Activity.id == activity_id).first()
-    _update_activity_rating(activity, db)
+    _update_activity_rating(activity, totals, db)
 
     db.commit()
+    activity_cache.bump(activity_id)
 
     return MessageResponse(message="Review deleted successfully")
 
@@ -272,7 +307,7 @@ def delete_review(
 def mark_review_helpful(
     review_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Mark a review as helpful."""
     review = db.query(Review).filter(Review.id == review_id).first()
@@ -300,56 +335,32 @@ def mark_review_helpful(
 def get_my_reviews(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from pagination.next_cursor"),
+    estimate_total: bool = Query(False, description="Return an estimated total instead of an exact count"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get current user's reviews."""
     query = db.query(Review).filter(Review.user_id == current_user.id)
-    query = query.order_by(Review.created_at.desc())
-
-    # Get total count
-    total = query.count()
-
-    # Pagination
-    offset = (page - 1) * per_page
-    reviews = query.offset(offset).limit(per_page).all()
+    result = paginate(
+        db, query,
+        [("created_at", Review.created_at, True), ("id", Review.id, True)],
+        page=page, per_page=per_page, cursor=cursor, estimate_total=estimate_total
+    )
 
-    # Prepare response
-    response_reviews = []
-    for review in reviews:
-        activity = db.query(Activity).filter(Activity.id == review.activity_id).first()
-        images = db.query(ReviewImage).filter(ReviewImage.review_id == review.id).all()
-
-        response_reviews.append(ReviewResponse(
-            id=review.id,
-            user={
-                "id": current_user.id,
-                "name": current_user.full_name,
-                "avatar": None
-            },
-            rating=review.rating,
-            title=review.title,
-            comment=review.comment,
-            is_verified_booking=review.is_verified_booking,
-            helpful_count=review.helpful_count,
-            created_at=review.created_at,
-            images=images
-        ))
-
-    return PaginatedResponse.create(
-        data=response_reviews,
-        page=page,
-        per_page=per_page,
-        total=total,
+    return PaginatedResponse.from_page(
+        data=hydrate_reviews(db, result.items, names={current_user.id: current_user.full_name}),
+        page=result,
         message="Your reviews"
     )
 
 
-def _update_activity_rating(activity: Activity, db: Session):
-    """Helper function to update activity average rating."""
-    result = db.query(
-        func.coalesce(func.avg(Review.rating), 0),
-        func.count(Review.id)
-    ).filter(Review.activity_id == activity.id).first()
-    activity.average_rating = round(float(result[0]), 1)
-    activity.total_reviews = result[1]
\ No newline at end of file
+def _update_activity_rating(activity: Activity, totals: Tuple[int, int], db: Session):
+    """Store the activity's rating from its (review_count, rating_sum) summary totals."""
+    review_count, rating_sum = totals
+    activity.average_rating = average_rating(review_count, rating_sum)
+    activity.total_reviews = review_count
+    # The rating summary can change with neither total; keep ETags moving.
+    activity.updated_at = func.now()
+    refresh_activity_facets(db, [activity.id])
+    refresh_search_documents(db, [activity.id])
@@ -5,17 +5,17 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session, joinedload
 
 from app.database import get_db
-from app.models.user import User
 from app.models.wishlist import Wishlist
 from app.models.activity import Activity
 from app.api.deps import get_current_user
+from app.services.principal_cache import Principal
 
 router = APIRouter()
 
 
 @router.get("/wishlist")
 def get_wishlist(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get current user's wishlist."""
@@ -61,7 +61,7 @@ def get_wishlist(
 @router.post("/wishlist/{activity_id}")
 def add_to_wishlist(
     activity_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Add activity to wishlist."""
@@ -98,7 +98,7 @@ def add_to_wishlist(
 @router.delete("/wishlist/{activity_id}")
 def remove_from_wishlist(
     activity_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Remove activity from wishlist."""
@@ -123,7 +123,7 @@ def remove_from_wishlist(
 @router.get("/wishlist/check/{activity_id}")
 def check_in_wishlist(
     activity_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Check if activity is in user's wishlist."""
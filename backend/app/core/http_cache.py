@@ -0,0 +1,251 @@
+"""HTTP caching headers and conditional GETs for the public catalog endpoints.
+
+Categories, destinations, providers and activity detail pages return the
+same bytes for long stretches. ``HTTPCacheMiddleware`` gives those responses:
+
+* a strong ETag. Activity detail routes derive it from the activity's
+  ``updated_at``, read with one indexed lookup *before* the endpoint runs, so
+  a matching revalidation is answered without the detail queries or
+  serialization. That makes ``updated_at`` the page's version: every write
+  that changes a detail page must move it and bump ``activity_cache``
+  (activity edits, toggles and imports, reviews, bookings and checkouts for
+  total_bookings, vendor verification), or 304s keep serving the old page
+  until the next write that does. The catalog listings have no such version
+  and hash the response body instead;
+* ``Last-Modified``: the activity's ``updated_at`` on detail routes, otherwise
+  when this worker first served that ETag for the URL;
+* ``Cache-Control: public, max-age=..., stale-while-revalidate=...``.
+
+A request whose ``If-None-Match`` (or, without one, ``If-Modified-Since``)
+still matches gets an empty 304. nginx caches on these headers
+(nginx/nginx.conf), so most hits never reach uvicorn and the ones that do to
+revalidate cost a 304 rather than a full payload.
+
+Only 200 responses to GET are touched; errors and other routes pass through
+unbuffered.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Awaitable, Callable, List, Match, Optional, Pattern, Tuple
+
+from sqlalchemy import select
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.database import async_engine
+from app.models import Activity
+
+# (content version, last modified as a POSIX timestamp), or None when the
+# endpoint should answer by itself (e.g. its 404).
+Validator = Callable[[Match[str]], Awaitable[Optional[Tuple[str, float]]]]
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """Cache policy for the paths matching ``pattern``."""
+
+    pattern: Pattern[str]
+    max_age: int
+    stale_while_revalidate: int
+    validator: Optional[Validator] = None
+
+    @property
+    def cache_control(self) -> str:
+        return f"public, max-age={self.max_age}, stale-while-revalidate={self.stale_while_revalidate}"
+
+
+def catalog_rules() -> List[CacheRule]:
+    """Rules for the catalog endpoints, from settings."""
+    catalog = (settings.HTTP_CACHE_CATALOG_MAX_AGE, settings.HTTP_CACHE_STALE_WHILE_REVALIDATE)
+    detail = (settings.HTTP_CACHE_DETAIL_MAX_AGE, settings.HTTP_CACHE_STALE_WHILE_REVALIDATE)
+    return [
+        CacheRule(re.compile(r"^/api/v1/activities/(categories|destinations|providers)$"), *catalog),
+        CacheRule(re.compile(r"^/api/v1/activities/destinations/[^/]+$"), *catalog),
+        CacheRule(re.compile(r"^/api/v1/activities/slug/(?P<slug>[^/]+)$"), *detail, activity_version),
+        CacheRule(re.compile(r"^/api/v1/activities/(?P<id>\d+)$"), *detail, activity_version),
+    ]
+
+
+async def activity_version(match: Match[str]) -> Optional[Tuple[str, float]]:
+    """``updated_at`` (or ``created_at``) of the active activity a detail URL names."""
+    if match.groupdict().get("id") is not None:
+        condition = Activity.id == int(match["id"])
+    else:
+        condition = Activity.slug == match["slug"]
+    async with async_engine.connect() as conn:
+        row = (await conn.execute(
+            select(Activity.updated_at, Activity.created_at).where(condition, Activity.is_active == True)
+        )).first()
+    changed_at = row and (row.updated_at or row.created_at)
+    if changed_at is None:
+        return None
+    return changed_at.isoformat(), float(int(changed_at.timestamp()))
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _url(scope: Scope) -> str:
+    query = scope.get("query_string", b"").decode("latin-1")
+    return scope["path"] + ("?" + query if query else "")
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires."""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+class _FirstSeen:
+    """When each (url, etag) was first served, bounded LRU."""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, etag: str) -> float:
+        key = (url, etag)
+        with self._lock:
+            seen = self._entries.get(key)
+            if seen is None:
+                # Whole seconds: HTTP dates carry no fractions.
+                seen = self._entries[key] = float(int(time.time()))
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            return seen
+
+
+class HTTPCacheMiddleware:
+    """ASGI middleware adding ETag/Last-Modified/Cache-Control and answering 304s."""
+
+    def __init__(self, app: ASGIApp, rules: List[CacheRule]):
+        self.app = app
+        self.rules = rules
+        self._first_seen = _FirstSeen()
+
+    def _rule(self, path: str) -> Tuple[Optional[CacheRule], Optional[Match[str]]]:
+        for rule in self.rules:
+            match = rule.pattern.match(path)
+            if match:
+                return rule, match
+        return None, None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        rule, match = self._rule(scope["path"]) if scope["type"] == "http" and scope["method"] == "GET" else (None, None)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        if rule.validator is not None:
+            validated = await rule.validator(match)
+            if validated is not None:
+                await self._respond_validated(scope, receive, send, rule, *validated)
+                return
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                if start["status"] != 200:
+                    await send(start)
+                return
+            if start["status"] != 200:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                await self._respond(scope, rule, start, b"".join(chunks), send)
+
+        await self.app(scope, receive, capture)
+
+    async def _respond_validated(
+        self, scope: Scope, receive: Receive, send: Send, rule: CacheRule, version: str, last_modified: float
+    ) -> None:
+        """Answer a 304 from the validator alone, otherwise stream the endpoint's response with its headers."""
+        etag = _etag(f"{settings.APP_VERSION}|{_url(scope)}|{version}".encode())
+        cache_headers = MutableHeaders()
+        cache_headers["ETag"] = etag
+        cache_headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+        cache_headers["Cache-Control"] = rule.cache_control
+        cache_headers["Vary"] = "Accept-Encoding"
+
+        if self._not_modified(Headers(scope=scope), etag, last_modified):
+            await send({"type": "http.response.start", "status": 304, "headers": cache_headers.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        # The endpoint keys its detail cache on the same version (request.state).
+        scope.setdefault("state", {})["content_version"] = version
+
+        # A write landing while the endpoint runs leaves this ETag older than
+        # the body; the next revalidation then simply gets a 200.
+        async def with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                if "cache-control" not in headers and "set-cookie" not in headers:
+                    for name in ("ETag", "Last-Modified", "Cache-Control"):
+                        headers[name] = cache_headers[name]
+                    headers.add_vary_header("Accept-Encoding")
+            await send(message)
+
+        await self.app(scope, receive, with_headers)
+
+    async def _respond(self, scope: Scope, rule: CacheRule, start: Message, body: bytes, send: Send) -> None:
+        headers = MutableHeaders(scope=start)
+        if "cache-control" in headers or "set-cookie" in headers:
+            # The endpoint chose its own policy (or is personalised).
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        etag = _etag(body)
+        last_modified = self._first_seen.get(_url(scope), etag)
+
+        headers["ETag"] = etag
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+        headers["Cache-Control"] = rule.cache_control
+        headers.add_vary_header("Accept-Encoding")
+
+        if self._not_modified(Headers(scope=scope), etag, last_modified):
+            not_modified = MutableHeaders()
+            for name in ("etag", "last-modified", "cache-control", "vary"):
+                not_modified[name] = headers[name]
+            await send({"type": "http.response.start", "status": 304, "headers": not_modified.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send(start)
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _not_modified(request_headers: Headers, etag: str, last_modified: float) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            return _etag_matches(if_none_match, etag)
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= last_modified
+            except (TypeError, ValueError):
+                return False
+        return False
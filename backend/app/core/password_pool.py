@@ -0,0 +1,97 @@
+"""Bounded process pool for bcrypt.
+
+bcrypt is deliberately CPU-heavy. Run on the request threads, a login storm
+or a registration spike saturates the worker's cores and starves every other
+endpoint sharing it. Here the hashing runs in PASSWORD_HASH_WORKERS child
+processes per uvicorn worker, so it never holds the GIL of the API process
+and never uses more than that many cores.
+
+At most PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE hashes may be in
+flight or waiting; beyond that ``hash_password``/``check_password`` raise
+``PasswordPoolBusy`` immediately, which the auth endpoints turn into a 429,
+instead of letting the backlog (and every client's latency) grow unbounded.
+
+Both are coroutines: the request awaits the child process's future, so the
+event loop keeps serving other requests meanwhile and no threadpool thread is
+parked on a hash.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from app.config import settings
+from app.core.security import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordPoolBusy(Exception):
+    """Every worker is busy and the queue is full; retry later."""
+
+
+class PasswordPool:
+    """Process pool with a fixed number of admission slots."""
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> ProcessPoolExecutor:
+        """Create the worker processes (otherwise done on first use)."""
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the API process has threads (and DB pools)
+                # that must not be copied into the children.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn, *args):
+        """Call ``fn(*args)`` in a worker process and await the result."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordPoolBusy()
+        try:
+            try:
+                return await asyncio.wrap_future(self.start().submit(fn, *args))
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM-killed); replace the pool once.
+                logger.warning("Password hashing pool broken, restarting it")
+                self.shutdown()
+                return await asyncio.wrap_future(self.start().submit(fn, *args))
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {"workers": self.workers, "queue_size": self.queue_size, "rejected": self.rejected}
+
+
+password_pool = PasswordPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE)
+
+
+async def hash_password(password: str) -> str:
+    """get_password_hash in the pool. Raises PasswordPoolBusy when saturated."""
+    return await password_pool.run(get_password_hash, password)
+
+
+async def check_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password in the pool. Raises PasswordPoolBusy when saturated."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
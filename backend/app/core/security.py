@@ -32,11 +32,27 @@ def get_password_hash(password: str) -> str:
     Returns:
         str: Hashed password
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a hash was made with a different cost than BCRYPT_ROUNDS.
+
+    Args:
+        hashed_password: Hashed password ("$2b$<cost>$...")
+
+    Returns:
+        bool: True if the password should be hashed again
+    """
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
 def create_access_token(subject: str | Any, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
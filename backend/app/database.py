@@ -1,9 +1,20 @@
-"""Database configuration and session management."""
+"""Database configuration and session management.
 
-from sqlalchemy import create_engine, MetaData
+Two engines share the database: the sync (psycopg2) engine behind
+``get_db`` for everything that writes, and an asyncio (asyncpg) engine
+behind ``get_async_db`` for the hot public read endpoints. Those are
+``async def`` handlers that run their ORM code through
+``AsyncSession.run_sync``, so waiting on the database no longer occupies
+one of the threadpool's threads.
+"""
+
+from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import AsyncGenerator, Generator
 
 from app.config import settings
 
@@ -19,6 +30,30 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def _async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the asyncio one."""
+    parsed = make_url(url)
+    return parsed.set(drivername=_ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+# Async engine for the read endpoints (see module docstring). Own pool per
+# worker, sized separately from the sync one.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL),
+    echo=settings.DATABASE_ECHO,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_pre_ping=True,
+    pool_size=settings.ASYNC_DATABASE_POOL_SIZE,
+    max_overflow=settings.ASYNC_DATABASE_MAX_OVERFLOW,
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -48,6 +83,21 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get an async database session.
+
+    Yields:
+        AsyncSession: Database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db() -> None:
     """Initialize database with tables."""
+    if engine.dialect.name == "postgresql":
+        # Trigram GIN indexes (activity_search_index) need the extension first.
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
@@ -1,23 +1,52 @@
 """Main FastAPI application."""
 
+import asyncio
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
-from app.database import init_db
+from app.core.compression import CompressionMiddleware
+from app.core.http_cache import HTTPCacheMiddleware, catalog_rules
+from app.database import init_db, SessionLocal
 from app.api.v1 import auth, activities, bookings, cart, reviews, admin, wishlist, payments
 
 
+def _warm_caches():
+    """Preload translations so the first zh/es/fr requests don't pay for it."""
+    from app.utils.translation import warm_translation_store
+
+    db = SessionLocal()
+    try:
+        warm_translation_store(db)
+    except Exception as e:
+        # Lazy loading on first request still works; don't block startup.
+        print(f"Translation warm-up skipped: {e}")
+    finally:
+        db.close()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     print("Starting up...")
     init_db()
+    _warm_caches()
+    from app.services.cart_holds import run_sweeper
+    sweeper = asyncio.create_task(run_sweeper(settings.CART_SWEEP_INTERVAL_SECONDS))
+    from app.services.email_outbox import run_outbox_worker
+    email_worker = asyncio.create_task(run_outbox_worker(settings.EMAIL_OUTBOX_POLL_SECONDS))
+    from app.core.password_pool import password_pool
+    password_pool.start()
     yield
     # Shutdown
     print("Shutting down...")
+    sweeper.cancel()
+    email_worker.cancel()
+    password_pool.shutdown()
 
 
 # Create FastAPI app
@@ -27,9 +56,15 @@ app = FastAPI(
     openapi_url="/api/v1/openapi.json",
     docs_url="/api/v1/docs",
     redoc_url="/api/v1/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# HTTP caching headers and 304s for the catalog endpoints. Added before CORS
+# so the CORS headers are applied to 304s as well.
+if settings.HTTP_CACHE_ENABLED:
+    app.add_middleware(HTTPCacheMiddleware, rules=catalog_rules())
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +74,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost: the HTTP cache and CORS layers inside it see uncompressed bodies.
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 
 # Root endpoint
 @app.get("/")
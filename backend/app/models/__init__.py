@@ -19,8 +19,11 @@ from app.models.activity import (
     MeetingPointPhoto
 )
 from app.models.booking import Booking, BookingStatus, Availability, CartItem
-from app.models.review import Review, ReviewImage, ReviewCategory
+from app.models.review import Review, ReviewImage, ReviewCategory, RatingSummary, RatingCategorySummary
 from app.models.wishlist import Wishlist
+from app.models.search import ActivitySearchIndex, ActivityFacet, ActivitySimilarity, ActivitySearchDocument
+from app.models.stats import PlatformCounter, DailyStat
+from app.models.email import EmailOutbox, EmailStatus
 from app.models.translation import (
     ActivityTranslation,
     ActivityHighlightTranslation,
@@ -60,7 +63,17 @@ __all__ = [
     "Review",
     "ReviewImage",
     "ReviewCategory",
+    "RatingSummary",
+    "RatingCategorySummary",
     "Wishlist",
+    "ActivitySearchIndex",
+    "ActivityFacet",
+    "ActivitySimilarity",
+    "ActivitySearchDocument",
+    "PlatformCounter",
+    "DailyStat",
+    "EmailOutbox",
+    "EmailStatus",
     "ActivityTranslation",
     "ActivityHighlightTranslation",
     "ActivityIncludeTranslation",
@@ -1,6 +1,6 @@
 """Activity related models."""
 
-from sqlalchemy import Column, Integer, String, Boolean, DECIMAL, ForeignKey, DateTime, Text, ARRAY, Float, text, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DECIMAL, ForeignKey, DateTime, Text, ARRAY, Float, text, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -139,6 +139,21 @@ class Activity(Base):
     # Translation relationships
     translations = relationship("ActivityTranslation", back_populates="activity", cascade="all, delete-orphan")
 
+    # Search listings filter and sort app.models.search.ActivitySearchDocument,
+    # which carries the per-sort indexes; these serve the queries still made
+    # against activities. migrate_indexes.py creates them on existing databases.
+    __table_args__ = (
+        # Vendor dashboards and the admin vendor list (counts per vendor).
+        Index("ix_activities_vendor_created", "vendor_id", created_at.desc()),
+        # Admin activity list: newest first, keyset on (created_at, id).
+        Index("ix_activities_created", created_at.desc(), id.desc()),
+        # Popularity order of active activities (similar-activities postings).
+        Index(
+            "ix_activities_active_popular", total_bookings.desc(), "id",
+            postgresql_where=is_active == True,
+        ),
+    )
+
 
 class ActivityImage(Base):
     """Activity image model."""
@@ -157,6 +172,16 @@ class ActivityImage(Base):
     # Relationships
     activity = relationship("Activity", back_populates="images")
 
+    __table_args__ = (
+        # Gallery order on the detail page.
+        Index("ix_activity_images_activity", "activity_id", "order_index", "id"),
+        # Primary image per activity (listing cards, search documents).
+        Index(
+            "ix_activity_images_primary", "activity_id", "order_index", "id",
+            postgresql_where=is_primary == True,
+        ),
+    )
+
 
 class ActivityCategory(Base):
     """Activity-Category many-to-many relationship."""
@@ -170,6 +195,12 @@ class ActivityCategory(Base):
     activity = relationship("Activity", back_populates="categories")
     category = relationship("Category", back_populates="activities")
 
+    # The primary key leads with activity_id; category pages and facet
+    # refreshes look links up by category.
+    __table_args__ = (
+        Index("ix_activity_categories_category", "category_id", "activity_id"),
+    )
+
 
 class ActivityDestination(Base):
     """Activity-Destination many-to-many relationship."""
@@ -183,6 +214,10 @@ class ActivityDestination(Base):
     activity = relationship("Activity", back_populates="destinations")
     destination = relationship("Destination", back_populates="activities")
 
+    __table_args__ = (
+        Index("ix_activity_destinations_destination", "destination_id", "activity_id"),
+    )
+
 
 class ActivityHighlight(Base):
     """Activity highlight model."""
@@ -2,7 +2,7 @@
 
 from sqlalchemy import Column, Integer, String, Boolean, DECIMAL, ForeignKey, DateTime, Date, Time, Text, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import enum
 import random
 import string
@@ -100,6 +100,7 @@ class Availability(Base):
     end_time = Column(Time)
     spots_available = Column(Integer)
     spots_total = Column(Integer)
+    spots_held = Column(Integer, nullable=False, default=0, server_default="0")  # in carts, not yet booked
     price_adult = Column(DECIMAL(10, 2))
     price_child = Column(DECIMAL(10, 2))
     is_available = Column(Boolean, default=True)
@@ -134,6 +135,12 @@ class CartItem(Base):
     add_on_ids = Column(Text)  # JSON array of add-on IDs
     add_on_quantities = Column(Text)  # JSON object {add_on_id: quantity}
 
+    # Capacity hold (see app.services.cart_holds): spots taken from the slot
+    # until hold_expires_at; 0 once the hold lapsed or was released.
+    held_spots = Column(Integer, nullable=False, default=0, server_default="0")
+    hold_expires_at = Column(DateTime(timezone=True))
+    last_active_at = Column(DateTime(timezone=True), server_default=func.now())
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -142,4 +149,6 @@ class CartItem(Base):
     # Indexes
     __table_args__ = (
         Index('idx_cart_session', 'session_id'),
+        Index('idx_cart_hold_expires', 'hold_expires_at', postgresql_where=text('held_spots > 0')),
+        Index('idx_cart_last_active', 'last_active_at'),
     )
\ No newline at end of file
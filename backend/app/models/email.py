@@ -0,0 +1,51 @@
+"""Outbound email models."""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func, text
+import enum
+
+from app.database import Base
+
+
+class EmailStatus(str, enum.Enum):
+    """Outbox message state."""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    DEAD = "dead"
+
+
+class EmailOutbox(Base):
+    """
+    Queued outbound email (see app.services.email_outbox).
+
+    Request handlers insert rows; the outbox workers render and send them,
+    retrying with backoff until EMAIL_MAX_ATTEMPTS, after which the row is
+    left ``dead`` for an admin to inspect or requeue.
+    """
+
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True)
+    to_email = Column(String(255), nullable=False)
+    to_name = Column(String(255))
+    subject = Column(String(500), nullable=False)
+    template_name = Column(String(100), nullable=False)
+    context = Column(Text, nullable=False, default="{}")  # JSON
+
+    status = Column(String(20), nullable=False, default=EmailStatus.PENDING.value, server_default="pending")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # A worker owns a ``sending`` row until then; afterwards it is reclaimed.
+    locked_until = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    provider = Column(String(50))
+    provider_message_id = Column(String(255))
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index('idx_email_outbox_due', 'next_attempt_at', postgresql_where=text("status IN ('pending', 'sending')")),
+        Index('idx_email_outbox_status', 'status'),
+    )
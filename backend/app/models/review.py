@@ -1,6 +1,6 @@
 """Review related models."""
 
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, CheckConstraint
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -32,9 +32,19 @@ class Review(Base):
     images = relationship("ReviewImage", back_populates="review", cascade="all, delete-orphan")
     category_ratings = relationship("ReviewCategory", back_populates="review", cascade="all, delete-orphan")
 
-    # Constraints
+    # Constraints. The list indexes carry the exact keys the review lists
+    # order by (app.services.review_loader), so a page of an activity's or a
+    # user's reviews is an index scan that stops after per_page rows.
     __table_args__ = (
         CheckConstraint('rating >= 1 AND rating <= 5', name='check_rating_range'),
+        Index(
+            "ix_reviews_activity_helpful",
+            "activity_id", func.coalesce(helpful_count, 0), "created_at", "id",
+        ),
+        Index("ix_reviews_activity_recent", "activity_id", "created_at", "id"),
+        Index("ix_reviews_activity_rating", "activity_id", "rating", "created_at", "id"),
+        Index("ix_reviews_user_recent", "user_id", "created_at", "id"),
+        Index("ix_reviews_created", created_at.desc(), id.desc()),
     )
 
 
@@ -68,4 +78,41 @@ class ReviewCategory(Base):
     # Constraints
     __table_args__ = (
         CheckConstraint('rating >= 1 AND rating <= 5', name='check_category_rating_range'),
-    )
\ No newline at end of file
+    )
+
+
+class RatingSummary(Base):
+    """
+    Running rating totals of one activity or vendor (``scope`` "activity" or "vendor").
+
+    Review writes add their deltas in the same transaction (see
+    app.services.ratings); rebuild_rating_summaries.py recomputes every row
+    from the reviews. The average is rating_sum / review_count.
+    """
+
+    __tablename__ = "rating_summaries"
+
+    scope = Column(String(10), primary_key=True)
+    scope_id = Column(Integer, primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    # Star histogram: reviews rated 1..5.
+    stars_1 = Column(Integer, nullable=False, default=0)
+    stars_2 = Column(Integer, nullable=False, default=0)
+    stars_3 = Column(Integer, nullable=False, default=0)
+    stars_4 = Column(Integer, nullable=False, default=0)
+    stars_5 = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class RatingCategorySummary(Base):
+    """Running totals of one ReviewCategory (e.g. "Guide quality") per activity or vendor."""
+
+    __tablename__ = "rating_category_summaries"
+
+    scope = Column(String(10), primary_key=True)
+    scope_id = Column(Integer, primary_key=True)
+    category_name = Column(String(100), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,173 @@
+"""Search projection models."""
+
+from sqlalchemy import (
+    Column, Integer, SmallInteger, String, Text, Boolean, DECIMAL, REAL, ForeignKey, DateTime, Index
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class ActivitySearchIndex(Base):
+    """
+    Full-text search row for one activity.
+
+    ``document`` concatenates every searchable string for the activity in all
+    languages (titles, descriptions, destination and category names plus their
+    translations) and backs the pg_trgm substring index used for CJK queries.
+    ``search_vector`` is the weighted tsvector of the same text used for word
+    matching and ranking. Rows are rebuilt by app.services.search_index.
+    """
+
+    __tablename__ = "activity_search_index"
+
+    activity_id = Column(Integer, ForeignKey("activities.id", ondelete="CASCADE"), primary_key=True)
+    document = Column(Text, nullable=False, default="")
+    search_vector = Column(TSVECTOR)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_activity_search_index_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_activity_search_index_document_trgm", "document",
+            postgresql_using="gin",
+            postgresql_ops={"document": "gin_trgm_ops"},
+        ),
+    )
+
+
+class ActivityFacet(Base):
+    """
+    Denormalized filter/facet row for one activity.
+
+    Holds every value the search sidebar filters or counts on (display brand,
+    category and destination ids, price and duration buckets, languages and
+    the boolean flags) so facet counts are GROUP BYs over this narrow table
+    instead of joins across activities, vendors and the link tables. Rows are
+    maintained by app.services.facets on every activity/review write.
+    """
+
+    __tablename__ = "activity_facets"
+
+    activity_id = Column(Integer, ForeignKey("activities.id", ondelete="CASCADE"), primary_key=True)
+    vendor_id = Column(Integer, nullable=False)
+    brand = Column(String(50), nullable=False)
+    is_active = Column(Boolean, nullable=False)
+    is_available = Column(Boolean, nullable=False)
+    category_ids = Column(ARRAY(Integer), nullable=False, default=[])
+    destination_ids = Column(ARRAY(Integer), nullable=False, default=[])
+    languages = Column(ARRAY(String), nullable=False, default=[])
+    price_adult = Column(DECIMAL(10, 2), nullable=False)
+    price_bucket = Column(SmallInteger, nullable=False)
+    duration_minutes = Column(Integer)
+    duration_bucket = Column(SmallInteger)
+    average_rating = Column(DECIMAL(2, 1), nullable=False, default=0)
+    free_cancellation = Column(Boolean, nullable=False)
+    instant_confirmation = Column(Boolean, nullable=False)
+    is_skip_the_line = Column(Boolean, nullable=False)
+    is_bestseller = Column(Boolean, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_activity_facets_active_brand", "is_active", "brand"),
+        Index("ix_activity_facets_category_ids", "category_ids", postgresql_using="gin"),
+        Index("ix_activity_facets_destination_ids", "destination_ids", postgresql_using="gin"),
+    )
+
+
+class ActivitySimilarity(Base):
+    """
+    Precomputed nearest neighbours of one activity ("similar activities").
+
+    ``neighbor_ids`` holds up to SIMILAR_ACTIVITIES_TOP_K activity ids, best
+    first, and ``scores`` their similarity scores in the same order, so the
+    endpoint reads one row by primary key. Rows are maintained by
+    app.services.similarity.
+    """
+
+    __tablename__ = "activity_similarities"
+
+    activity_id = Column(Integer, ForeignKey("activities.id", ondelete="CASCADE"), primary_key=True)
+    neighbor_ids = Column(ARRAY(Integer), nullable=False, default=[])
+    scores = Column(ARRAY(REAL), nullable=False, default=[])
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ActivitySearchDocument(Base):
+    """
+    Search listing card for one activity in one display language.
+
+    Holds everything a search result card shows (translated title and short
+    description, prices, flags, primary image, translated category and
+    destination names) plus the filter and sort keys, so a search page is a
+    single-table query with no joins or per-page hydration. Rows are
+    maintained by app.services.search_documents on every write that changes a
+    card or sort value.
+    """
+
+    __tablename__ = "activity_search_documents"
+
+    activity_id = Column(Integer, ForeignKey("activities.id", ondelete="CASCADE"), primary_key=True)
+    language = Column(String(2), primary_key=True)
+
+    # Card fields, translated to ``language``.
+    title = Column(String(500), nullable=False)
+    slug = Column(String(500), nullable=False)
+    short_description = Column(Text)
+    price_adult = Column(DECIMAL(10, 2), nullable=False)
+    price_child = Column(DECIMAL(10, 2))
+    duration_minutes = Column(Integer)
+    average_rating = Column(DECIMAL(2, 1), nullable=False, default=0)
+    total_reviews = Column(Integer, nullable=False, default=0)
+    is_bestseller = Column(Boolean, nullable=False, default=False)
+    is_skip_the_line = Column(Boolean, nullable=False, default=False)
+    is_active = Column(Boolean, nullable=False)
+    is_available = Column(Boolean, nullable=False)
+    free_cancellation_hours = Column(Integer, nullable=False, default=0)
+    languages = Column(ARRAY(String), nullable=False, default=[])
+    primary_image = Column(JSONB)
+    categories = Column(JSONB, nullable=False, default=[])
+    destinations = Column(JSONB, nullable=False, default=[])
+
+    # Filter and sort keys.
+    vendor_id = Column(Integer, nullable=False)
+    brand = Column(String(50), nullable=False)
+    category_ids = Column(ARRAY(Integer), nullable=False, default=[])
+    destination_ids = Column(ARRAY(Integer), nullable=False, default=[])
+    instant_confirmation = Column(Boolean, nullable=False)
+    total_bookings = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # One partial index per sort_by over the public (active) rows, with the
+    # exact key order and directions search_activities orders by, so a page is
+    # an index scan that stops after per_page rows. Vendor-only searches
+    # include inactive rows and go through the vendor index.
+    __table_args__ = (
+        Index(
+            "ix_activity_search_documents_recommended",
+            "language", is_bestseller.desc(), average_rating.desc(), total_bookings.desc(), "activity_id",
+            postgresql_where=is_active == True,
+        ),
+        Index(
+            "ix_activity_search_documents_price_asc", "language", "price_adult", "activity_id",
+            postgresql_where=is_active == True,
+        ),
+        Index(
+            "ix_activity_search_documents_price_desc", "language", price_adult.desc(), "activity_id",
+            postgresql_where=is_active == True,
+        ),
+        Index(
+            "ix_activity_search_documents_rating", "language", average_rating.desc(), "activity_id",
+            postgresql_where=is_active == True,
+        ),
+        Index(
+            "ix_activity_search_documents_duration",
+            "language", func.coalesce(duration_minutes, 2147483647), "activity_id",
+            postgresql_where=is_active == True,
+        ),
+        Index("ix_activity_search_documents_vendor", "vendor_id", "language"),
+        Index("ix_activity_search_documents_category_ids", "category_ids", postgresql_using="gin"),
+        Index("ix_activity_search_documents_destination_ids", "destination_ids", postgresql_using="gin"),
+        Index("ix_activity_search_documents_languages", "languages", postgresql_using="gin"),
+    )
@@ -0,0 +1,36 @@
+"""Platform statistics models."""
+
+from sqlalchemy import Column, Integer, String, DECIMAL, Date, DateTime
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class PlatformCounter(Base):
+    """
+    Running platform total (users, activities, bookings, revenue, reviews).
+
+    Incremented in the same transaction as the write it counts (see
+    app.services.stats) and recomputed from the source tables by
+    rollup_stats.py, which corrects any drift.
+    """
+
+    __tablename__ = "platform_counters"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(DECIMAL(14, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class DailyStat(Base):
+    """Per-day booking, revenue, review and sign-up totals (UTC days)."""
+
+    __tablename__ = "daily_stats"
+
+    day = Column(Date, primary_key=True)
+    bookings = Column(Integer, nullable=False, default=0)
+    revenue = Column(DECIMAL(14, 2), nullable=False, default=0)
+    reviews = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    new_users = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
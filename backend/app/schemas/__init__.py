@@ -17,6 +17,7 @@ from app.schemas.activity import (
     ActivityBase,
     ActivityCreate,
     ActivityUpdate,
+    ActivityImport,
     ActivityResponse,
     ActivityDetailResponse,
     CategoryResponse,
@@ -36,7 +37,8 @@ from app.schemas.booking import (
 from app.schemas.review import (
     ReviewCreate,
     ReviewUpdate,
-    ReviewResponse
+    ReviewResponse,
+    RatingSummaryResponse
 )
 
 from app.schemas.common import (
@@ -62,6 +64,7 @@ __all__ = [
     "ActivityBase",
     "ActivityCreate",
     "ActivityUpdate",
+    "ActivityImport",
     "ActivityResponse",
     "ActivityDetailResponse",
     "CategoryResponse",
@@ -80,6 +83,7 @@ __all__ = [
     "ReviewCreate",
     "ReviewUpdate",
     "ReviewResponse",
+    "RatingSummaryResponse",
 
     # Common schemas
     "PaginationParams",
@@ -1,10 +1,12 @@
 """Activity related schemas."""
 
-from typing import Optional, List, Any
-from pydantic import BaseModel, Field
+from typing import Optional, List, Any, Dict
+from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from decimal import Decimal
 
+from app.schemas.review import RatingSummaryResponse
+
 
 class CategoryResponse(BaseModel):
     """Category response schema."""
@@ -258,6 +260,117 @@ class ActivityUpdate(BaseModel):
     translations: Optional[dict] = None  # {"es": {"title": "...", "description": "..."}, ...}
 
 
+# Translations of one item: {"es": {"text": "..."}, "zh": {...}}. When given,
+# they replace the item's stored translations; when omitted, those are kept.
+ImportTranslations = Optional[Dict[str, Dict[str, Optional[str]]]]
+
+
+class ActivityImportImage(BaseModel):
+    """Image of an imported activity."""
+    url: str = Field(..., min_length=1, max_length=500)
+    alt_text: Optional[str] = Field(None, max_length=255)
+    caption: Optional[str] = None
+    is_primary: bool = False
+    is_hero: bool = False
+
+
+class ActivityImportHighlight(BaseModel):
+    """Highlight of an imported activity."""
+    text: str = Field(..., min_length=1, max_length=500)
+    translations: ImportTranslations = None
+
+
+class ActivityImportInclude(BaseModel):
+    """Included/excluded item of an imported activity."""
+    item: str = Field(..., min_length=1, max_length=500)
+    is_included: bool = True
+    translations: ImportTranslations = None
+
+
+class ActivityImportFAQ(BaseModel):
+    """FAQ of an imported activity."""
+    question: str = Field(..., min_length=1)
+    answer: str = Field(..., min_length=1)
+    translations: ImportTranslations = None
+
+
+class ActivityImportTimeline(BaseModel):
+    """Itinerary step of an imported activity (step_number defaults to its position)."""
+    step_number: Optional[int] = None
+    title: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    duration_minutes: Optional[int] = Field(None, ge=0)
+    image_url: Optional[str] = Field(None, max_length=500)
+    sections: Optional[Any] = None
+    translations: ImportTranslations = None
+
+
+class ActivityImportPricingTier(BaseModel):
+    """Pricing tier of an imported activity."""
+    tier_name: str = Field(..., min_length=1, max_length=100)
+    tier_description: Optional[str] = None
+    price_adult: Decimal = Field(..., ge=0)
+    price_child: Optional[Decimal] = Field(None, ge=0)
+    is_active: bool = True
+    translations: ImportTranslations = None
+
+
+class ActivityImportAddOn(BaseModel):
+    """Add-on of an imported activity."""
+    name: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    price: Decimal = Field(..., ge=0)
+    is_optional: bool = True
+    translations: ImportTranslations = None
+
+
+class ActivityImportMeetingPoint(BaseModel):
+    """Meeting point of an imported activity."""
+    address: str = Field(..., min_length=1)
+    instructions: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    parking_info: Optional[str] = None
+    public_transport_info: Optional[str] = None
+    nearby_landmarks: Optional[str] = None
+    translations: ImportTranslations = None
+
+
+class ActivityImport(ActivityBase):
+    """
+    One line of a bulk activity import: a full activity aggregate.
+
+    Activities are matched on ``slug`` (derived from the title if omitted).
+    Collections that are given replace the stored ones; omitted collections,
+    and omitted fields of an existing activity, are left as they are.
+    """
+    slug: Optional[str] = Field(None, min_length=1, max_length=500)
+    vendor_id: Optional[int] = None  # admin imports only
+    is_active: bool = True
+
+    category_ids: Optional[List[int]] = None
+    category_slugs: Optional[List[str]] = None
+    destination_ids: Optional[List[int]] = None
+    destination_slugs: Optional[List[str]] = None
+
+    images: Optional[List[ActivityImportImage]] = None
+    highlights: Optional[List[ActivityImportHighlight]] = None
+    includes: Optional[List[ActivityImportInclude]] = None
+    faqs: Optional[List[ActivityImportFAQ]] = None
+    timelines: Optional[List[ActivityImportTimeline]] = None
+    pricing_tiers: Optional[List[ActivityImportPricingTier]] = None
+    add_ons: Optional[List[ActivityImportAddOn]] = None
+    meeting_point: Optional[ActivityImportMeetingPoint] = None
+    translations: ImportTranslations = None
+
+    @validator('highlights', pre=True)
+    def highlights_as_objects(cls, v):
+        """Accept plain strings, as ActivityCreate does."""
+        if isinstance(v, list):
+            return [{"text": item} if isinstance(item, str) else item for item in v]
+        return v
+
+
 class ActivityResponse(BaseModel):
     """Activity response schema."""
     id: int
@@ -327,6 +440,7 @@ class ActivityDetailResponse(ActivityResponse):
     pricing_tiers: List[ActivityPricingTierResponse] = []
     add_ons: List[ActivityAddOnResponse] = []
     product_features: Optional[Any] = None
+    rating_summary: Optional[RatingSummaryResponse] = None
 
     class Config:
         from_attributes = True
@@ -112,6 +112,7 @@ class CartItemResponse(BaseModel):
     adults: int
     children: int
     price: Decimal
+    hold_expires_at: Optional[datetime] = None
     created_at: datetime
 
     class Config:
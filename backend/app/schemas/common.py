@@ -10,6 +10,8 @@ class PaginationParams(BaseModel):
     """Pagination parameters."""
     page: int = Field(default=1, ge=1, description="Page number")
     per_page: int = Field(default=20, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(default=None, description="Keyset cursor from a previous page's next_cursor")
+    estimate_total: bool = Field(default=False, description="Return a planner estimate instead of an exact total")
 
     @property
     def offset(self) -> int:
@@ -44,6 +46,23 @@ class PaginatedResponse(BaseModel, Generic[T]):
             }
         )
 
+    @staticmethod
+    def from_page(data: List[T], page, message: Optional[str] = None):
+        """
+        Create a paginated response from an app.utils.pagination.Page.
+
+        Adds ``next_cursor`` (pass back as ``cursor`` for the following page)
+        and ``total_estimated`` (total is a planner estimate, not a COUNT).
+        """
+        response = PaginatedResponse.create(data, page.page, page.per_page, page.total, message)
+        response.pagination.update({
+            "has_next": page.has_next,
+            "has_prev": page.page > 1 or page.cursor_mode,
+            "next_cursor": page.next_cursor,
+            "total_estimated": page.estimated,
+        })
+        return response
+
 
 class MessageResponse(BaseModel):
     """Simple message response."""
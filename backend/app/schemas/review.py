@@ -1,6 +1,6 @@
 """Review related schemas."""
 
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel, Field, validator
 from datetime import datetime
 
@@ -55,4 +55,19 @@ class ReviewResponse(BaseModel):
     category_ratings: List[ReviewCategoryResponse] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class RatingCategorySummaryResponse(BaseModel):
+    """Average of one review category (e.g. "Guide quality")."""
+    category_name: str
+    average_rating: float
+    total_reviews: int
+
+
+class RatingSummaryResponse(BaseModel):
+    """Rating summary of an activity or vendor."""
+    average_rating: float
+    total_reviews: int
+    histogram: Dict[int, int]  # stars (1-5) -> number of reviews
+    categories: List[RatingCategorySummaryResponse] = []
@@ -0,0 +1,435 @@
+"""Bulk activity import: NDJSON activity aggregates, diffed and upserted.
+
+Each line is one activity with its children (see app.schemas.ActivityImport).
+Lines are applied IMPORT_BATCH_SIZE at a time, one transaction per batch:
+
+1. Parse and validate every line; a bad line is reported and skipped.
+2. Load the batch's stored activities by slug, plus the categories,
+   destinations and vendors the lines refer to, in one query each.
+3. Upsert the activities whose columns differ (new ones included) with a
+   multi-row INSERT ... ON CONFLICT (slug) DO UPDATE.
+4. Sync link tables, child collections, meeting points and translations with
+   app.services.child_sync, which writes only the rows that differ. Activities
+   whose only changes were child rows get their updated_at stamped, as
+   update_activity does, so Last-Modified and ETags move.
+5. Refresh the search index, facets, search documents and similarities of
+   the activities that actually changed, then commit.
+
+Re-importing an unchanged file therefore costs only the reads. If a batch
+fails in the database it is rolled back and all of its lines are reported as
+failed; earlier batches stay committed.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import orjson
+from pydantic import ValidationError
+from slugify import slugify
+from sqlalchemy import func, or_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.models import (
+    Activity, ActivityCategory, ActivityDestination, ActivityTranslation,
+    Category, Destination, MeetingPointTranslation, Vendor
+)
+from app.schemas.activity import ActivityBase, ActivityImport
+from app.services.cache import activity_cache
+from app.services.child_sync import (
+    COLLECTIONS, MEETING_POINT_FIELDS, WriteCounts,
+    sync_children, sync_links, sync_meeting_points, sync_translations, translated_fields
+)
+from app.services.facets import refresh_activity_facets
+from app.services.search_documents import refresh_search_documents
+from app.services.search_index import refresh_search_index
+from app.services.similarity import refresh_similarities
+from app.services.stats import record_activity_created, record_activity_status
+from app.utils.translation import SUPPORTED_LANGUAGES
+
+# Activity columns an import line sets.
+ACTIVITY_FIELDS: Tuple[str, ...] = tuple(ActivityBase.model_fields) + ("is_active",)
+_UPSERT_CHUNK = 500
+# Errors kept in the report; later ones are only counted.
+_MAX_ERRORS = 100
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import, accumulated over its batches."""
+    received: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+    writes: WriteCounts = field(default_factory=WriteCounts)
+    elapsed_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda error: error["line"]),
+            "rows_written": self.writes.as_dict(),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "seconds_per_1k": round(self.elapsed_seconds * 1000 / self.received, 3) if self.received else None,
+            "activities_per_second": round(self.received / self.elapsed_seconds, 1) if self.elapsed_seconds else None,
+        }
+
+
+@dataclass
+class _Line:
+    number: int
+    item: ActivityImport
+    slug: str
+    vendor_id: Optional[int] = None
+    existing: Any = None
+    category_ids: Optional[Set[int]] = None
+    destination_ids: Optional[Set[int]] = None
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()
+        )
+    return str(error)
+
+
+def _check_translations(translations: Optional[Dict[str, Dict[str, Any]]], model, where: str) -> None:
+    if not translations:
+        return
+    allowed = translated_fields(model)
+    for language, values in translations.items():
+        if language not in SUPPORTED_LANGUAGES or language == 'en':
+            raise ValueError(f"{where}: unsupported translation language '{language}'")
+        unknown = sorted(set(values) - set(allowed))
+        if unknown:
+            raise ValueError(f"{where}: unknown translation fields {unknown} (expected {list(allowed)})")
+
+
+def parse_line(raw: Union[str, bytes]) -> ActivityImport:
+    """Validate one NDJSON line. Raises ValueError (including pydantic's ValidationError)."""
+    item = ActivityImport.model_validate(orjson.loads(raw))
+    _check_translations(item.translations, ActivityTranslation, "translations")
+    for collection in COLLECTIONS.values():
+        if collection.translation_model is None:
+            continue
+        for position, child in enumerate(getattr(item, collection.name) or []):
+            _check_translations(child.translations, collection.translation_model, f"{collection.name}.{position}")
+    if item.meeting_point is not None:
+        _check_translations(item.meeting_point.translations, MeetingPointTranslation, "meeting_point")
+    return item
+
+
+def _children(item: ActivityImport, name: str) -> List[Dict[str, Any]]:
+    """Child rows of one collection as sync_children expects them."""
+    children = [child.model_dump(exclude={"translations"}) for child in getattr(item, name)]
+    if name == "images" and children and not any(child["is_primary"] for child in children):
+        children[0]["is_primary"] = True  # as create_activity does
+    if name == "timelines":
+        for position, child in enumerate(children):
+            if child["step_number"] is None:
+                child["step_number"] = position + 1
+    return children
+
+
+class ActivityImporter:
+    """
+    Applies import lines batch by batch on one session.
+
+    ``vendor_id`` is the vendor new activities belong to. With
+    ``restrict_to_vendor`` (the vendor endpoint) every line must belong to
+    it; otherwise (admin, CLI) a line may name its own vendor_id. Existing
+    activities never change vendor. With ``dry_run`` every batch is rolled
+    back, so the report shows what an import would write.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        vendor_id: Optional[int] = None,
+        restrict_to_vendor: bool = False,
+        dry_run: bool = False,
+    ):
+        self.db = db
+        self.vendor_id = vendor_id
+        self.restrict_to_vendor = restrict_to_vendor
+        self.dry_run = dry_run
+        self.report = ImportReport()
+
+    def _fail(self, number: int, slug: Optional[str], error: Union[str, Exception]) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < _MAX_ERRORS:
+            message = error if isinstance(error, str) else _error_message(error)
+            self.report.errors.append({"line": number, "slug": slug, "error": message})
+
+    def apply_batch(self, batch: Sequence[Tuple[int, Union[str, bytes]]]) -> None:
+        """Parse, diff and write one batch of (line number, raw line) pairs."""
+        started = time.perf_counter()
+        lines: List[_Line] = []
+        seen: Set[str] = set()
+        for number, raw in batch:
+            if not raw.strip():
+                continue
+            self.report.received += 1
+            try:
+                item = parse_line(raw)
+            except ValueError as e:
+                self._fail(number, None, e)
+                continue
+            slug = item.slug or slugify(item.title)
+            if slug in seen:
+                self._fail(number, slug, "duplicate slug in the same batch")
+                continue
+            seen.add(slug)
+            lines.append(_Line(number, item, slug))
+
+        try:
+            lines = self._resolve(lines)
+            if lines:
+                self._write(lines)
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            for line in lines:
+                self._fail(line.number, line.slug, f"batch rolled back: {getattr(e, 'orig', None) or e}")
+        self.report.elapsed_seconds += time.perf_counter() - started
+
+    def _resolve(self, lines: List[_Line]) -> List[_Line]:
+        """Attach stored rows, vendor and link target ids; drop lines that cannot be applied."""
+        db = self.db
+        if not lines:
+            return []
+        columns = [Activity.id, Activity.slug, Activity.vendor_id] + [getattr(Activity, f) for f in ACTIVITY_FIELDS]
+        existing = {row.slug: row for row in db.query(*columns).filter(Activity.slug.in_([line.slug for line in lines]))}
+
+        def targets(model, ids_field: str, slugs_field: str) -> Dict[Any, int]:
+            ids = {i for line in lines for i in getattr(line.item, ids_field) or []}
+            slugs = {s for line in lines for s in getattr(line.item, slugs_field) or []}
+            if not ids and not slugs:
+                return {}
+            found = {}
+            for target_id, slug in db.query(model.id, model.slug).filter(or_(model.id.in_(ids), model.slug.in_(slugs))):
+                found[target_id] = target_id
+                found[slug] = target_id
+            return found
+
+        categories = targets(Category, "category_ids", "category_slugs")
+        destinations = targets(Destination, "destination_ids", "destination_slugs")
+        named_vendors = {line.item.vendor_id for line in lines if line.item.vendor_id is not None}
+        vendors = {vendor_id for (vendor_id,) in db.query(Vendor.id).filter(
+            Vendor.id.in_((named_vendors | {self.vendor_id}) - {None})
+        )}
+
+        resolved = []
+        for line in lines:
+            item = line.item
+            row = existing.get(line.slug)
+            vendor_id = item.vendor_id if item.vendor_id is not None else self.vendor_id
+            if self.restrict_to_vendor and vendor_id != self.vendor_id:
+                self._fail(line.number, line.slug, "vendor_id must be your own vendor")
+                continue
+            if row is not None and (item.vendor_id is not None or self.restrict_to_vendor) and row.vendor_id != vendor_id:
+                self._fail(line.number, line.slug, f"slug is taken by an activity of vendor {row.vendor_id}")
+                continue
+            if row is None and vendor_id not in vendors:
+                self._fail(line.number, line.slug, "vendor_id missing or unknown")
+                continue
+
+            missing = []
+            for name, wanted, found in (
+                ("category", (item.category_ids, item.category_slugs), categories),
+                ("destination", (item.destination_ids, item.destination_slugs), destinations),
+            ):
+                if wanted[0] is None and wanted[1] is None:
+                    continue
+                keys = list(wanted[0] or []) + list(wanted[1] or [])
+                missing.extend(f"{name} {key}" for key in keys if key not in found)
+                ids = {found[key] for key in keys if key in found}
+                if name == "category":
+                    line.category_ids = ids
+                else:
+                    line.destination_ids = ids
+            if missing:
+                self._fail(line.number, line.slug, "unknown " + ", ".join(missing))
+                continue
+
+            line.existing = row
+            line.vendor_id = row.vendor_id if row is not None else vendor_id
+            resolved.append(line)
+        return resolved
+
+    def _upsert_activities(self, lines: List[_Line], writes: WriteCounts) -> Dict[str, int]:
+        """Insert new and update changed activities; returns the id of every line's activity by slug."""
+        db = self.db
+        ids = {line.slug: line.existing.id for line in lines if line.existing is not None}
+        rows = []
+        for line in lines:
+            if line.existing is None:
+                rows.append({"slug": line.slug, "vendor_id": line.vendor_id,
+                             **line.item.model_dump(include=set(ACTIVITY_FIELDS))})
+                continue
+            given = line.item.model_dump(include=set(ACTIVITY_FIELDS), exclude_unset=True)
+            changed = {f: value for f, value in given.items() if getattr(line.existing, f) != value}
+            if changed:
+                stored = {f: getattr(line.existing, f) for f in ACTIVITY_FIELDS}
+                rows.append({"slug": line.slug, "vendor_id": line.vendor_id, **stored, **changed})
+                writes.activity_ids.add(line.existing.id)
+                writes.add(Activity.__tablename__, "updated", 1)
+                if "is_active" in changed:
+                    record_activity_status(db, changed["is_active"])
+
+        for start in range(0, len(rows), _UPSERT_CHUNK):
+            stmt = insert(Activity).values(rows[start:start + _UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Activity.slug],
+                set_={**{f: stmt.excluded[f] for f in ACTIVITY_FIELDS}, "updated_at": func.now()},
+            ).returning(Activity.id, Activity.slug)
+            ids.update({row.slug: row.id for row in db.execute(stmt)})
+
+        for line in lines:
+            if line.existing is None:
+                writes.activity_ids.add(ids[line.slug])
+                writes.add(Activity.__tablename__, "inserted", 1)
+                record_activity_created(db, line.item.is_active)
+        return ids
+
+    def _write(self, lines: List[_Line]) -> None:
+        db = self.db
+        writes = WriteCounts()
+        ids = self._upsert_activities(lines, writes)
+        # The upsert already set updated_at on these.
+        upserted = set(writes.activity_ids)
+
+        sync_links(db, ActivityCategory, "category_id", {
+            ids[line.slug]: line.category_ids for line in lines if line.category_ids is not None
+        }, writes)
+        sync_links(db, ActivityDestination, "destination_id", {
+            ids[line.slug]: line.destination_ids for line in lines if line.destination_ids is not None
+        }, writes)
+
+        for collection in COLLECTIONS.values():
+            given = [line for line in lines if getattr(line.item, collection.name) is not None]
+            child_ids = sync_children(db, collection, {
+                ids[line.slug]: _children(line.item, collection.name) for line in given
+            }, writes)
+            if collection.translation_model is None:
+                continue
+            translations, owners = {}, {}
+            for line in given:
+                activity_id = ids[line.slug]
+                for child, child_id in zip(getattr(line.item, collection.name), child_ids[activity_id]):
+                    if child.translations is not None:
+                        translations[child_id] = child.translations
+                        owners[child_id] = activity_id
+            changed = sync_translations(db, collection.translation_model, translations, writes)
+            writes.activity_ids.update(owners[child_id] for child_id in changed)
+
+        given = [line for line in lines if "meeting_point" in line.item.model_fields_set]
+        meeting_point_ids = sync_meeting_points(db, {
+            ids[line.slug]: (
+                line.item.meeting_point.model_dump(include=set(MEETING_POINT_FIELDS))
+                if line.item.meeting_point is not None else None
+            )
+            for line in given
+        }, writes)
+        translations, owners = {}, {}
+        for line in given:
+            activity_id = ids[line.slug]
+            if line.item.meeting_point is not None and line.item.meeting_point.translations is not None:
+                translations[meeting_point_ids[activity_id]] = line.item.meeting_point.translations
+                owners[meeting_point_ids[activity_id]] = activity_id
+        changed = sync_translations(db, MeetingPointTranslation, translations, writes)
+        writes.activity_ids.update(owners[meeting_point_id] for meeting_point_id in changed)
+
+        writes.activity_ids |= sync_translations(db, ActivityTranslation, {
+            ids[line.slug]: line.item.translations for line in lines if line.item.translations is not None
+        }, writes)
+
+        children_only = writes.activity_ids - upserted
+        if children_only:
+            db.execute(
+                update(Activity).where(Activity.id.in_(children_only)).values(updated_at=func.now())
+            )
+            writes.add(Activity.__tablename__, "updated", len(children_only))
+
+        touched = sorted(writes.activity_ids)
+        if self.dry_run:
+            db.rollback()
+        else:
+            if touched:
+                refresh_search_index(db, touched)
+                refresh_activity_facets(db, touched)
+                refresh_search_documents(db, touched)
+                refresh_similarities(db, touched)
+            db.commit()
+            for activity_id in touched:
+                activity_cache.bump(activity_id)
+
+        for line in lines:
+            if line.existing is None:
+                self.report.created += 1
+            elif line.existing.id in writes.activity_ids:
+                self.report.updated += 1
+            else:
+                self.report.unchanged += 1
+        self.report.writes.merge(writes)
+
+
+def _batches(lines: Iterable[Union[str, bytes]], batch_size: int) -> Iterator[List[Tuple[int, Union[str, bytes]]]]:
+    batch = []
+    for number, line in enumerate(lines, start=1):
+        batch.append((number, line))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_lines(
+    importer: ActivityImporter,
+    lines: Iterable[Union[str, bytes]],
+    batch_size: Optional[int] = None,
+    progress=None,
+) -> ImportReport:
+    """Import NDJSON lines (e.g. an open file); ``progress(report)`` is called after each batch."""
+    for batch in _batches(lines, batch_size or settings.IMPORT_BATCH_SIZE):
+        importer.apply_batch(batch)
+        if progress is not None:
+            progress(importer.report)
+    return importer.report
+
+
+async def import_stream(
+    importer: ActivityImporter,
+    chunks: AsyncIterable[bytes],
+    batch_size: Optional[int] = None,
+) -> ImportReport:
+    """Import an NDJSON request body as it arrives, one batch at a time in the threadpool."""
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    batch: List[Tuple[int, bytes]] = []
+    number = 0
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            number += 1
+            batch.append((number, line))
+            if len(batch) >= batch_size:
+                await run_in_threadpool(importer.apply_batch, batch)
+                batch = []
+    if buffer.strip():
+        batch.append((number + 1, buffer))
+    if batch:
+        await run_in_threadpool(importer.apply_batch, batch)
+    return importer.report
@@ -0,0 +1,172 @@
+"""Batch loaders that assemble activity API payloads in a fixed number of queries."""
+
+from typing import Any, Dict, List, Sequence
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models import (
+    Activity, ActivityImage, ActivityCategory, ActivityDestination,
+    Category, Destination, ActivityTranslation, MeetingPoint
+)
+from app.schemas.activity import ActivityResponse
+from app.services.ratings import ACTIVITY, get_rating_summary
+from app.utils.translation import (
+    get_translated_activity, get_translated_highlights, get_translated_includes,
+    get_translated_faqs, get_translated_timelines, get_translated_pricing_tiers,
+    get_translated_add_ons, get_translated_meeting_point, load_translations,
+    translation_store
+)
+
+# Loader options for the product page: many-to-one parents are joined into the
+# activity query, each child collection is fetched with one IN query.
+ACTIVITY_DETAIL_OPTIONS = (
+    joinedload(Activity.vendor),
+    joinedload(Activity.meeting_point).selectinload(MeetingPoint.photos),
+    selectinload(Activity.images),
+    selectinload(Activity.categories).joinedload(ActivityCategory.category),
+    selectinload(Activity.destinations).joinedload(ActivityDestination.destination),
+    selectinload(Activity.highlights),
+    selectinload(Activity.includes),
+    selectinload(Activity.faqs),
+    selectinload(Activity.timelines),
+    selectinload(Activity.time_slots),
+    selectinload(Activity.pricing_tiers),
+    selectinload(Activity.add_ons),
+)
+
+
+def _primary_images(db: Session, activity_ids: List[int]) -> Dict[int, ActivityImage]:
+    """Map activity id -> primary image (lowest order_index wins on duplicates)."""
+    images = db.query(ActivityImage).filter(
+        ActivityImage.activity_id.in_(activity_ids),
+        ActivityImage.is_primary == True
+    ).order_by(ActivityImage.order_index, ActivityImage.id).all()
+
+    primary = {}
+    for image in images:
+        primary.setdefault(image.activity_id, image)
+    return primary
+
+
+def _categories_by_activity(db: Session, activity_ids: List[int]) -> Dict[int, List[Category]]:
+    """Map activity id -> joined categories."""
+    rows = db.query(ActivityCategory.activity_id, Category).join(
+        Category, Category.id == ActivityCategory.category_id
+    ).filter(ActivityCategory.activity_id.in_(activity_ids)).all()
+
+    result: Dict[int, List[Category]] = {}
+    for activity_id, category in rows:
+        result.setdefault(activity_id, []).append(category)
+    return result
+
+
+def _destinations_by_activity(db: Session, activity_ids: List[int]) -> Dict[int, List[Destination]]:
+    """Map activity id -> joined destinations."""
+    rows = db.query(ActivityDestination.activity_id, Destination).join(
+        Destination, Destination.id == ActivityDestination.destination_id
+    ).filter(ActivityDestination.activity_id.in_(activity_ids)).all()
+
+    result: Dict[int, List[Destination]] = {}
+    for activity_id, destination in rows:
+        result.setdefault(activity_id, []).append(destination)
+    return result
+
+
+def hydrate_activity_cards(
+    db: Session,
+    activities: Sequence[Activity],
+    language: str = 'en'
+) -> List[ActivityResponse]:
+    """
+    Build listing-card responses for a page of activities.
+
+    Images, categories, destinations and (for non-English) translations are
+    loaded for the whole page with one IN-list query each, so the cost is
+    constant regardless of page size. Input order is preserved.
+    """
+    if not activities:
+        return []
+
+    activity_ids = [activity.id for activity in activities]
+    primary_images = _primary_images(db, activity_ids)
+    categories = _categories_by_activity(db, activity_ids)
+    destinations = _destinations_by_activity(db, activity_ids)
+    translations = (
+        load_translations(db, ActivityTranslation, language, activity_ids)
+        if language != 'en' and not translation_store.enabled else None
+    )
+
+    response_activities = []
+    for activity in activities:
+        # Apply translations if needed
+        if language != 'en':
+            translated_data = get_translated_activity(activity, language, db, translations=translations)
+            title = translated_data.get('title', activity.title)
+            short_description = translated_data.get('short_description', activity.short_description)
+        else:
+            title = activity.title
+            short_description = activity.short_description
+
+        response_activities.append(ActivityResponse(
+            id=activity.id,
+            title=title,
+            slug=activity.slug,
+            short_description=short_description,
+            price_adult=activity.price_adult,
+            price_child=activity.price_child,
+            duration_minutes=activity.duration_minutes,
+            average_rating=float(activity.average_rating) if activity.average_rating else 0,
+            total_reviews=activity.total_reviews,
+            is_bestseller=activity.is_bestseller,
+            is_skip_the_line=activity.is_skip_the_line,
+            is_active=activity.is_active,
+            is_available=activity.is_available,
+            free_cancellation_hours=activity.free_cancellation_hours,
+            languages=activity.languages,
+            primary_image=primary_images.get(activity.id),
+            categories=categories.get(activity.id, []),
+            destinations=destinations.get(activity.id, [])
+        ))
+
+    return response_activities
+
+
+def _by_order_index(items) -> list:
+    """Sort children like ORDER BY order_index (NULLs last), id as tiebreaker."""
+    return sorted(items, key=lambda item: (item.order_index is None, item.order_index or 0, item.id))
+
+
+def load_activity_detail(db: Session, activity: Activity, language: str = 'en') -> Dict[str, Any]:
+    """
+    Collect everything the activity detail page shows, translated to ``language``.
+
+    Expects ``activity`` to be loaded with ACTIVITY_DETAIL_OPTIONS; without
+    them each relationship is lazy-loaded, which is still correct. Translations
+    are fetched with one query per translation table rather than one per child
+    row. Returns a dict of the translated parts; the caller builds the response.
+    """
+    images = _by_order_index(activity.images)
+    meeting_point = activity.meeting_point
+    pricing_tiers = [tier for tier in activity.pricing_tiers if tier.is_active]
+
+    translated_meeting_point = get_translated_meeting_point(meeting_point, language, db)
+    if translated_meeting_point is not None:
+        translated_meeting_point['photos'] = _by_order_index(meeting_point.photos)
+
+    return {
+        'translated_activity': get_translated_activity(activity, language, db),
+        'images': images,
+        'primary_image': next((img for img in images if img.is_primary), None),
+        'categories': [link.category for link in activity.categories],
+        'destinations': [link.destination for link in activity.destinations],
+        'highlights': get_translated_highlights(_by_order_index(activity.highlights), language, db),
+        'includes': get_translated_includes(_by_order_index(activity.includes), language, db),
+        'faqs': get_translated_faqs(_by_order_index(activity.faqs), language, db),
+        'meeting_point': translated_meeting_point,
+        'timelines': get_translated_timelines(_by_order_index(activity.timelines), language, db),
+        'time_slots': sorted(activity.time_slots, key=lambda slot: slot.slot_time),
+        'pricing_tiers': get_translated_pricing_tiers(_by_order_index(pricing_tiers), language, db),
+        'add_ons': get_translated_add_ons(_by_order_index(activity.add_ons), language, db),
+        'vendor': activity.vendor,
+        'rating_summary': get_rating_summary(db, ACTIVITY, activity.id),
+    }
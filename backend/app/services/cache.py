@@ -0,0 +1,272 @@
+"""Read-through caches and the backends they share.
+
+Two backends share one interface, used by the activity detail cache below and
+by the principal cache (``app.services.principal_cache``):
+
+* ``MemoryCacheBackend`` - per-process LRU with a TTL. Each uvicorn worker has
+  its own copy and only sees its own bumps and deletes, so the TTL bounds how
+  stale other workers can be.
+* ``RedisCacheBackend`` - any Redis-compatible client (redis-py, or a fake in
+  tests). Versions live in one hash per cache shared by all workers, so a bump
+  is seen everywhere immediately; memory is bounded by the server's maxmemory
+  policy.
+
+Activity detail entries are keyed by (activity_id, version, language). Every
+write that changes what the detail page shows calls
+``activity_cache.bump(activity_id)`` after committing, which moves the activity
+to a new version; older entries become unreachable and age out through LRU
+eviction / TTL instead of being deleted one by one.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+from app.schemas.activity import ActivityDetailResponse
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "activity_detail"
+
+
+class MemoryCacheBackend:
+    """Thread-safe in-process LRU cache of strings with per-entry expiry."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 2000, ttl_seconds: int = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get_version(self, item_id: int) -> int:
+        with self._lock:
+            return self._versions.get(item_id, 0)
+
+    def bump_version(self, item_id: int) -> int:
+        with self._lock:
+            version = self._versions.get(item_id, 0) + 1
+            self._versions[item_id] = version
+            return version
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+        }
+
+
+class RedisCacheBackend:
+    """
+    Backend on a Redis-compatible client.
+
+    Only get/set(ex=)/delete/hget/hincrby are required of ``client``, so tests
+    can pass a small fake instead of a live server. ``versions_key`` names the
+    hash holding this cache's versions.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, ttl_seconds: int = 300, versions_key: str = f"{KEY_PREFIX}:versions"):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.versions_key = versions_key
+
+    @classmethod
+    def from_url(cls, url: str, ttl_seconds: int = 300, **kwargs) -> "RedisCacheBackend":
+        import redis  # optional dependency, only needed for this backend
+
+        return cls(redis.Redis.from_url(url, decode_responses=True), ttl_seconds, **kwargs)
+
+    def get_version(self, item_id: int) -> int:
+        return int(self.client.hget(self.versions_key, str(item_id)) or 0)
+
+    def bump_version(self, item_id: int) -> int:
+        return int(self.client.hincrby(self.versions_key, str(item_id), 1))
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self.client.set(key, value, ex=self.ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def clear(self) -> None:
+        # Entries are unreachable once versions move on and expire by TTL;
+        # never FLUSHDB a server other services may share.
+        pass
+
+    def info(self) -> Dict[str, Any]:
+        info = {"ttl_seconds": self.ttl_seconds, "evictions": None}
+        try:
+            info["evictions"] = self.client.info("stats").get("evicted_keys")
+        except Exception:
+            pass
+        return info
+
+
+def backend_from_settings(backend: str, max_entries: int, ttl_seconds: int, prefix: str):
+    """Redis when configured (and installed), otherwise the in-process LRU."""
+    if backend in ("redis", "auto") and settings.REDIS_URL:
+        try:
+            return RedisCacheBackend.from_url(
+                settings.REDIS_URL, ttl_seconds, versions_key=f"{prefix}:versions"
+            )
+        except ImportError:
+            logger.warning("redis package not installed; using in-process %s cache", prefix)
+    return MemoryCacheBackend(max_entries, ttl_seconds)
+
+
+class ReadThroughCache:
+    """Hit/miss/error counters and stats shared by the caches on these backends."""
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def reset(self, backend, enabled: bool = True) -> None:
+        """Swap the backend and zero the counters."""
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = self.misses = self.errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            **self.backend.info(),
+        }
+
+
+class ActivityDetailCache(ReadThroughCache):
+    """Read-through cache of ActivityDetailResponse with per-activity versions."""
+
+    def version(self, activity_id: int) -> int:
+        """Current version of an activity (0 if never bumped or cache is down)."""
+        try:
+            return self.backend.get_version(activity_id)
+        except Exception:
+            logger.warning("Activity cache unavailable reading version", exc_info=True)
+            self._count("errors")
+            return 0
+
+    def get_or_load(
+        self,
+        activity_id: int,
+        language: str,
+        loader: Callable[[], ActivityDetailResponse],
+        content_version: str = ""
+    ) -> ActivityDetailResponse:
+        """
+        Return the cached payload or build it with ``loader`` and store it.
+
+        The version is read once before loading and the result is stored
+        under that version, so a bump that lands while the loader runs
+        leaves the (possibly stale) result unreachable. ``content_version``
+        (the activity's updated_at, when the caller knows it) is part of the
+        key too. Backend failures fall back to ``loader``; the page never
+        breaks because the cache is down.
+        """
+        if not self.enabled:
+            return loader()
+
+        try:
+            version = self.backend.get_version(activity_id)
+            key = f"{KEY_PREFIX}:{activity_id}:{version}:{content_version}:{language}"
+            cached = self.backend.get(key)
+        except Exception:
+            logger.warning("Activity cache unavailable, loading from database", exc_info=True)
+            self._count("errors")
+            return loader()
+
+        if cached is not None:
+            self._count("hits")
+            return ActivityDetailResponse.model_validate_json(cached)
+
+        self._count("misses")
+        response = loader()
+        try:
+            self.backend.set(key, response.model_dump_json())
+        except Exception:
+            logger.warning("Activity cache unavailable storing %s", key, exc_info=True)
+            self._count("errors")
+        return response
+
+    def bump(self, *activity_ids: int) -> None:
+        """Invalidate every cached language of the given activities. Call after commit."""
+        for activity_id in activity_ids:
+            try:
+                self.backend.bump_version(activity_id)
+            except Exception:
+                logger.warning("Activity cache unavailable bumping %s", activity_id, exc_info=True)
+                self._count("errors")
+
+
+activity_cache = ActivityDetailCache(
+    backend_from_settings(
+        settings.ACTIVITY_CACHE_BACKEND,
+        settings.ACTIVITY_CACHE_MAX_ENTRIES,
+        settings.ACTIVITY_CACHE_TTL_SECONDS,
+        KEY_PREFIX,
+    ),
+    enabled=settings.ACTIVITY_CACHE_ENABLED,
+)
+
+
+def configure_activity_cache(backend, enabled: bool = True) -> ActivityDetailCache:
+    """Swap the backend of the shared cache (e.g. a fake Redis client in tests)."""
+    activity_cache.reset(backend, enabled)
+    return activity_cache
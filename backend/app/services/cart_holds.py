@@ -0,0 +1,268 @@
+"""Time-boxed capacity holds for cart items.
+
+Adding an item to the cart takes its spots from the slot (inventory.hold)
+for CART_HOLD_MINUTES. Every cart request pushes the expiry out again, and
+starting checkout extends it to CART_CHECKOUT_HOLD_MINUTES, re-taking
+lapsed holds, so payment is only taken for spots that exist. At
+confirmation the hold is consumed by the booking.
+
+A sweeper runs in every worker. It releases expired holds and deletes carts
+untouched for CART_ABANDONED_DAYS, in batches. Rows are claimed with
+``FOR UPDATE SKIP LOCKED`` and every hold is handed over with a conditional
+UPDATE on ``held_spots``, so the sweepers, cart requests and checkout never
+release the same spots twice.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Activity, Availability, CartItem
+from app.services import inventory
+
+logger = logging.getLogger(__name__)
+
+_sweeper_stats: Dict[str, Any] = {
+    "runs": 0, "holds_expired": 0, "carts_purged": 0, "last_run_at": None, "last_error": None,
+}
+_stats_lock = threading.Lock()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _participants(item: CartItem) -> int:
+    return ((item.adults or 0) + (item.children or 0)) or 1
+
+
+def claim_hold(db: Session, item: CartItem) -> int:
+    """
+    Take over the spots held by ``item`` and clear its hold.
+
+    Returns the number of spots claimed, 0 if it held none or another
+    transaction (the sweeper, a concurrent request) claimed them first.
+    """
+    held = db.query(CartItem.held_spots).filter(CartItem.id == item.id).scalar() if item.id else 0
+    claimed = 0
+    if held:
+        claimed = db.execute(
+            update(CartItem)
+            .where(CartItem.id == item.id, CartItem.held_spots == held)
+            .values(held_spots=0, hold_expires_at=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    item.held_spots = 0
+    item.hold_expires_at = None
+    return held if claimed else 0
+
+
+def drop_hold(db: Session, item: CartItem) -> None:
+    """Release the item's hold. Call before changing its slot or quantities, or deleting it."""
+    held = claim_hold(db, item)
+    if held:
+        inventory.release_hold(db, item.activity_id, item.booking_date, item.booking_time, held)
+
+
+def place_hold(db: Session, item: CartItem, activity: Activity, minutes: Optional[int] = None) -> None:
+    """Hold the item's spots; the item must not hold any. Raises inventory.SoldOutError."""
+    item.last_active_at = _now()
+    if not settings.CART_HOLDS_ENABLED:
+        return
+    spots = _participants(item)
+    inventory.hold(db, activity, item.booking_date, item.booking_time, spots)
+    item.held_spots = spots
+    item.hold_expires_at = _now() + timedelta(minutes=minutes or settings.CART_HOLD_MINUTES)
+
+
+def refresh_hold(db: Session, item: CartItem, activity: Activity, minutes: int) -> bool:
+    """
+    Extend the item's hold to ``minutes`` from now, re-taking it if it lapsed.
+
+    Returns False if the hold lapsed and the slot no longer has room.
+    """
+    if not settings.CART_HOLDS_ENABLED:
+        return True
+    expires_at = _now() + timedelta(minutes=minutes)
+    extended = db.execute(
+        update(CartItem)
+        .where(CartItem.id == item.id, CartItem.held_spots > 0)
+        .values(hold_expires_at=expires_at, last_active_at=_now())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if extended:
+        item.hold_expires_at = expires_at
+        return True
+    try:
+        with db.begin_nested():
+            place_hold(db, item, activity, minutes)
+    except inventory.SoldOutError:
+        item.held_spots = 0
+        item.hold_expires_at = None
+        return False
+    return True
+
+
+def book_item(db: Session, item: CartItem, activity: Activity) -> bool:
+    """
+    Take the item's spots for a paid booking: consume its hold, or reserve
+    them outright (``allow_overbook``) if the hold was lost. Returns whether
+    the slot had room, like ``inventory.reserve``.
+    """
+    spots = _participants(item)
+    held = claim_hold(db, item)
+    if held == spots:
+        inventory.consume_hold(db, item.activity_id, item.booking_date, item.booking_time, held)
+        return True
+    if held:
+        inventory.release_hold(db, item.activity_id, item.booking_date, item.booking_time, held)
+    return inventory.reserve(db, activity, item.booking_date, item.booking_time, spots, allow_overbook=True)
+
+
+def touch_cart(db: Session, session_id: str) -> None:
+    """Record cart activity: push out the session's live holds and its abandonment clock."""
+    now = _now()
+    db.query(CartItem).filter(CartItem.session_id == session_id).update(
+        {CartItem.last_active_at: now}, synchronize_session=False
+    )
+    if settings.CART_HOLDS_ENABLED:
+        db.query(CartItem).filter(CartItem.session_id == session_id, CartItem.held_spots > 0).update(
+            {CartItem.hold_expires_at: now + timedelta(minutes=settings.CART_HOLD_MINUTES)},
+            synchronize_session=False
+        )
+
+
+def expire_holds(db: Session, batch_size: int) -> int:
+    """Release one batch of expired holds. The caller commits. Returns holds released."""
+    rows = db.execute(
+        select(CartItem.id, CartItem.activity_id, CartItem.booking_date, CartItem.booking_time, CartItem.held_spots)
+        .where(CartItem.held_spots > 0, CartItem.hold_expires_at < _now())
+        .order_by(CartItem.hold_expires_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return 0
+    db.execute(
+        update(CartItem)
+        .where(CartItem.id.in_([row.id for row in rows]))
+        .values(held_spots=0, hold_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+
+    per_slot: Dict[tuple, int] = defaultdict(int)
+    for _, activity_id, booking_date, booking_time, held in rows:
+        per_slot[(activity_id, booking_date, booking_time)] += held
+    for (activity_id, booking_date, booking_time), held in sorted(per_slot.items(), key=str):
+        inventory.release_hold(db, activity_id, booking_date, booking_time, held)
+    return len(rows)
+
+
+def purge_abandoned_carts(db: Session, batch_size: int, older_than: timedelta) -> int:
+    """Delete one batch of unheld cart items idle for ``older_than``. The caller commits."""
+    abandoned = (
+        select(CartItem.id)
+        .where(CartItem.held_spots == 0, CartItem.last_active_at < _now() - older_than)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    return db.execute(
+        delete(CartItem).where(CartItem.id.in_(abandoned)).execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def sweep_once(batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Expire every stale hold, then purge abandoned carts, one committed batch at a time."""
+    batch_size = batch_size or settings.CART_SWEEP_BATCH_SIZE
+    older_than = timedelta(days=settings.CART_ABANDONED_DAYS)
+    expired = purged = 0
+    db = SessionLocal()
+    try:
+        while True:
+            released = expire_holds(db, batch_size)
+            db.commit()
+            expired += released
+            if released < batch_size:
+                break
+        while True:
+            deleted = purge_abandoned_carts(db, batch_size, older_than)
+            db.commit()
+            purged += deleted
+            if deleted < batch_size:
+                break
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        with _stats_lock:
+            _sweeper_stats["runs"] += 1
+            _sweeper_stats["holds_expired"] += expired
+            _sweeper_stats["carts_purged"] += purged
+            _sweeper_stats["last_run_at"] = _now().isoformat()
+    return {"holds_expired": expired, "carts_purged": purged}
+
+
+async def run_sweeper(interval_seconds: int) -> None:
+    """Run ``sweep_once`` every ``interval_seconds`` until cancelled (lifespan task)."""
+    while True:
+        try:
+            await asyncio.to_thread(sweep_once)
+            _sweeper_stats["last_error"] = None
+        except Exception as e:
+            logger.exception("Cart hold sweep failed")
+            _sweeper_stats["last_error"] = repr(e)
+        await asyncio.sleep(interval_seconds)
+
+
+def hold_metrics(
+    db: Session,
+    activity_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = 200,
+) -> Dict[str, Any]:
+    """Held, free and booked spots per slot, plus cart-wide hold totals and sweeper counters."""
+    query = db.query(Availability).filter(Availability.date >= (start_date or date.today()))
+    if end_date:
+        query = query.filter(Availability.date <= end_date)
+    if activity_id:
+        query = query.filter(Availability.activity_id == activity_id)
+    else:
+        query = query.filter(Availability.spots_held > 0)
+    slots = query.order_by(Availability.date, Availability.activity_id, Availability.start_time).limit(limit).all()
+
+    active, expired, held = db.query(
+        func.count(CartItem.id),
+        func.count(CartItem.id).filter(CartItem.hold_expires_at < _now()),
+        func.coalesce(func.sum(CartItem.held_spots), 0),
+    ).filter(CartItem.held_spots > 0).one()
+
+    with _stats_lock:
+        sweeper = dict(_sweeper_stats)
+
+    return {
+        "holds": {"active": active, "awaiting_sweep": expired, "spots_held": int(held)},
+        "sweeper": sweeper,
+        "slots": [
+            {
+                "activity_id": slot.activity_id,
+                "date": slot.date.isoformat(),
+                "start_time": slot.start_time.isoformat() if slot.start_time else None,
+                "spots_total": slot.spots_total,
+                "spots_free": slot.spots_available,
+                "spots_held": slot.spots_held,
+                "spots_booked": (slot.spots_total or 0) - (slot.spots_available or 0) - (slot.spots_held or 0),
+            }
+            for slot in slots
+        ],
+    }
@@ -0,0 +1,381 @@
+"""Differential sync of an activity's child rows.
+
+Writes that replace an activity's content (the bulk import, the vendor edit
+form) receive whole collections — all highlights, all FAQs — rather than
+individual edits. Deleting and re-inserting them churns ids, bloats the
+tables and orphans the translation rows keyed on those ids, so these helpers
+diff the incoming collection against the stored rows and write only what
+differs:
+
+* Ordered collections (images, highlights, ...) first match incoming items
+  to stored rows with identical content, wherever they sit, then pair the
+  remaining items with the remaining rows in order, so an edited item keeps
+  its row (and its translations). Rows left over are deleted, items left
+  over inserted; changed rows are written back with one multi-row
+  INSERT ... ON CONFLICT (id) DO UPDATE.
+* Link tables (categories, destinations) are set-diffed.
+* Translations are upserted on their (parent, language) unique constraint.
+
+All helpers flush first, write with core statements inside the caller's
+transaction and record what they wrote in a WriteCounts; the caller commits.
+Core statements bypass the ORM, so objects already loaded in the session
+are not updated.
+"""
+
+import json
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import (
+    ActivityAddOn, ActivityAddOnTranslation,
+    ActivityFAQ, ActivityFAQTranslation,
+    ActivityHighlight, ActivityHighlightTranslation,
+    ActivityImage,
+    ActivityInclude, ActivityIncludeTranslation,
+    ActivityPricingTier, ActivityPricingTierTranslation,
+    ActivityTimeline, ActivityTimelineTranslation,
+    MeetingPoint,
+)
+from app.utils.translation import TRANSLATION_KEYS
+
+_UPSERT_CHUNK = 500
+# Columns of a translation table that are not translated text.
+_TRANSLATION_META = {"id", "language", "created_at", "updated_at"}
+
+
+@dataclass(frozen=True)
+class ChildCollection:
+    """An ordered child collection of an activity and its translation table."""
+    name: str
+    model: Any
+    fields: Tuple[str, ...]
+    translation_model: Any = None
+
+
+COLLECTIONS: Dict[str, ChildCollection] = {collection.name: collection for collection in (
+    ChildCollection("images", ActivityImage, ("url", "alt_text", "caption", "is_primary", "is_hero")),
+    ChildCollection("highlights", ActivityHighlight, ("text",), ActivityHighlightTranslation),
+    ChildCollection("includes", ActivityInclude, ("item", "is_included"), ActivityIncludeTranslation),
+    ChildCollection("faqs", ActivityFAQ, ("question", "answer"), ActivityFAQTranslation),
+    ChildCollection(
+        "timelines", ActivityTimeline,
+        ("step_number", "title", "description", "duration_minutes", "image_url", "sections"),
+        ActivityTimelineTranslation,
+    ),
+    ChildCollection(
+        "pricing_tiers", ActivityPricingTier,
+        ("tier_name", "tier_description", "price_adult", "price_child", "is_active"),
+        ActivityPricingTierTranslation,
+    ),
+    ChildCollection("add_ons", ActivityAddOn, ("name", "description", "price", "is_optional"), ActivityAddOnTranslation),
+)}
+
+MEETING_POINT_FIELDS = (
+    "address", "instructions", "latitude", "longitude",
+    "parking_info", "public_transport_info", "nearby_landmarks",
+)
+
+
+class WriteCounts:
+    """Rows inserted, updated and deleted per table, and the activities they belong to."""
+
+    def __init__(self):
+        self._tables: Dict[str, Dict[str, int]] = defaultdict(lambda: {"inserted": 0, "updated": 0, "deleted": 0})
+        self.activity_ids: Set[int] = set()
+
+    def add(self, table: str, action: str, rows: int) -> None:
+        if rows:
+            self._tables[table][action] += rows
+
+    def merge(self, other: "WriteCounts") -> None:
+        for table, counts in other._tables.items():
+            for action, rows in counts.items():
+                self.add(table, action, rows)
+        self.activity_ids |= other.activity_ids
+
+    @property
+    def total(self) -> int:
+        return sum(sum(counts.values()) for counts in self._tables.values())
+
+    def as_dict(self) -> Dict[str, Dict[str, int]]:
+        return {table: dict(counts) for table, counts in sorted(self._tables.items())}
+
+
+def translated_fields(model) -> Tuple[str, ...]:
+    """Translated text columns of a translation model."""
+    key = TRANSLATION_KEYS[model].key
+    return tuple(
+        column.key for column in model.__table__.columns
+        if column.key not in _TRANSLATION_META and column.key != key
+    )
+
+
+def _comparable(value: Any) -> Any:
+    # JSON columns (timeline sections) hold dicts and lists.
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+def _content(source: Any, fields: Sequence[str]) -> tuple:
+    if isinstance(source, Mapping):
+        return tuple(_comparable(source.get(field)) for field in fields)
+    return tuple(_comparable(getattr(source, field)) for field in fields)
+
+
+def _match(existing: List[Any], incoming: List[Mapping[str, Any]], fields: Sequence[str]):
+    """Pair incoming items with stored rows: identical content first, then in order."""
+    by_content: Dict[tuple, deque] = defaultdict(deque)
+    for row in existing:
+        by_content[_content(row, fields)].append(row)
+
+    matched: List[Optional[Any]] = [None] * len(incoming)
+    used = set()
+    for position, item in enumerate(incoming):
+        candidates = by_content.get(_content(item, fields))
+        if candidates:
+            matched[position] = candidates.popleft()
+            used.add(matched[position].id)
+
+    spare = deque(row for row in existing if row.id not in used)
+    for position in range(len(incoming)):
+        if matched[position] is None and spare:
+            matched[position] = spare.popleft()
+    return matched, list(spare)
+
+
+def _chunks(rows: List[Dict[str, Any]]):
+    for start in range(0, len(rows), _UPSERT_CHUNK):
+        yield rows[start:start + _UPSERT_CHUNK]
+
+
+def sync_children(
+    db: Session,
+    collection: ChildCollection,
+    items: Mapping[int, List[Mapping[str, Any]]],
+    writes: WriteCounts,
+) -> Dict[int, List[int]]:
+    """
+    Make each activity's ``collection`` rows equal ``items[activity_id]``, in order.
+
+    Items are dicts of the collection's fields; order_index is the position.
+    Activities absent from ``items`` are left alone. Returns the row id of
+    every item, per activity, in item order.
+    """
+    db.flush()
+    if not items:
+        return {}
+    model = collection.model
+    table = model.__tablename__
+    columns = [model.id, model.activity_id, model.order_index] + [getattr(model, field) for field in collection.fields]
+
+    existing: Dict[int, List[Any]] = defaultdict(list)
+    for row in db.query(*columns).filter(model.activity_id.in_(list(items))).order_by(
+        model.activity_id, model.order_index, model.id
+    ):
+        existing[row.activity_id].append(row)
+
+    ids: Dict[int, List[Optional[int]]] = {}
+    updates: List[Dict[str, Any]] = []
+    inserts: List[Dict[str, Any]] = []
+    deletes: List[int] = []
+    for activity_id, incoming in items.items():
+        before = len(deletes) + len(updates) + len(inserts)
+        matched, spare = _match(existing.get(activity_id, []), incoming, collection.fields)
+        deletes.extend(row.id for row in spare)
+        ids[activity_id] = []
+        for position, (item, row) in enumerate(zip(incoming, matched)):
+            values = {field: item.get(field) for field in collection.fields}
+            values.update(activity_id=activity_id, order_index=position)
+            if row is None:
+                inserts.append(values)
+                ids[activity_id].append(None)
+                continue
+            ids[activity_id].append(row.id)
+            if row.order_index != position or _content(row, collection.fields) != _content(item, collection.fields):
+                updates.append({"id": row.id, **values})
+        if len(deletes) + len(updates) + len(inserts) > before:
+            writes.activity_ids.add(activity_id)
+
+    if deletes:
+        db.query(model).filter(model.id.in_(deletes)).delete(synchronize_session=False)
+        writes.add(table, "deleted", len(deletes))
+
+    for chunk in _chunks(updates):
+        stmt = insert(model).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[model.id],
+            set_={key: stmt.excluded[key] for key in chunk[0] if key != "id"},
+        )
+        db.execute(stmt)
+    writes.add(table, "updated", len(updates))
+
+    # (activity_id, order_index) is unique within the incoming collections.
+    inserted: Dict[Tuple[int, int], int] = {}
+    for chunk in _chunks(inserts):
+        result = db.execute(insert(model).values(chunk).returning(model.id, model.activity_id, model.order_index))
+        inserted.update({(row.activity_id, row.order_index): row.id for row in result})
+    writes.add(table, "inserted", len(inserts))
+
+    return {
+        activity_id: [
+            child_id if child_id is not None else inserted[(activity_id, position)]
+            for position, child_id in enumerate(child_ids)
+        ]
+        for activity_id, child_ids in ids.items()
+    }
+
+
+def sync_links(
+    db: Session,
+    model,
+    target_column: str,
+    targets: Mapping[int, Iterable[int]],
+    writes: WriteCounts,
+) -> None:
+    """Make each activity's link rows (ActivityCategory, ActivityDestination) equal ``targets[activity_id]``."""
+    db.flush()
+    if not targets:
+        return
+    target = getattr(model, target_column)
+    existing: Dict[int, Set[int]] = defaultdict(set)
+    for activity_id, target_id in db.query(model.activity_id, target).filter(model.activity_id.in_(list(targets))):
+        existing[activity_id].add(target_id)
+
+    added: List[Dict[str, int]] = []
+    removed: List[Tuple[int, int]] = []
+    for activity_id, wanted in targets.items():
+        wanted = set(wanted)
+        current = existing.get(activity_id, set())
+        added.extend({"activity_id": activity_id, target_column: target_id} for target_id in sorted(wanted - current))
+        removed.extend((activity_id, target_id) for target_id in sorted(current - wanted))
+        if wanted != current:
+            writes.activity_ids.add(activity_id)
+
+    if removed:
+        db.query(model).filter(tuple_(model.activity_id, target).in_(removed)).delete(synchronize_session=False)
+        writes.add(model.__tablename__, "deleted", len(removed))
+    for chunk in _chunks(added):
+        db.execute(insert(model).values(chunk).on_conflict_do_nothing())
+    writes.add(model.__tablename__, "inserted", len(added))
+
+
+def sync_meeting_points(
+    db: Session,
+    meeting_points: Mapping[int, Optional[Mapping[str, Any]]],
+    writes: WriteCounts,
+) -> Dict[int, int]:
+    """
+    Make each activity's meeting point equal ``meeting_points[activity_id]`` (None removes it).
+
+    The row is updated in place, so its translations and photos survive.
+    Returns the meeting point id per activity that has one.
+    """
+    db.flush()
+    if not meeting_points:
+        return {}
+    columns = [MeetingPoint.id, MeetingPoint.activity_id] + [getattr(MeetingPoint, f) for f in MEETING_POINT_FIELDS]
+    existing = {
+        row.activity_id: row
+        for row in db.query(*columns).filter(MeetingPoint.activity_id.in_(list(meeting_points)))
+    }
+
+    ids: Dict[int, int] = {}
+    upserts: List[Dict[str, Any]] = []
+    deletes: List[int] = []
+    for activity_id, meeting_point in meeting_points.items():
+        row = existing.get(activity_id)
+        if meeting_point is None:
+            if row is not None:
+                deletes.append(row.id)
+                writes.activity_ids.add(activity_id)
+            continue
+        if row is not None:
+            ids[activity_id] = row.id
+            if _content(row, MEETING_POINT_FIELDS) == _content(meeting_point, MEETING_POINT_FIELDS):
+                continue
+        upserts.append({"activity_id": activity_id, **{f: meeting_point.get(f) for f in MEETING_POINT_FIELDS}})
+        writes.activity_ids.add(activity_id)
+
+    if deletes:
+        db.query(MeetingPoint).filter(MeetingPoint.id.in_(deletes)).delete(synchronize_session=False)
+        writes.add(MeetingPoint.__tablename__, "deleted", len(deletes))
+    for chunk in _chunks(upserts):
+        stmt = insert(MeetingPoint).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MeetingPoint.activity_id],
+            set_={field: stmt.excluded[field] for field in MEETING_POINT_FIELDS},
+        ).returning(MeetingPoint.id, MeetingPoint.activity_id)
+        ids.update({row.activity_id: row.id for row in db.execute(stmt)})
+    for values in upserts:
+        writes.add(MeetingPoint.__tablename__, "updated" if values["activity_id"] in existing else "inserted", 1)
+    return ids
+
+
+def sync_translations(
+    db: Session,
+    model,
+    translations: Mapping[int, Mapping[str, Mapping[str, Any]]],
+    writes: WriteCounts,
+) -> Set[int]:
+    """
+    Make the ``model`` translations of each parent equal ``translations[parent_id]``.
+
+    ``translations`` maps parent id (activity, highlight, ... id) to
+    {language: {field: text}}; languages missing from a parent's map are
+    deleted, parents missing from ``translations`` are left alone. Written
+    languages are dropped from the translation store when the caller commits.
+    Returns the ids of the parents whose translations changed (parents are
+    not necessarily activities, so writes.activity_ids is left to the caller).
+    """
+    db.flush()
+    if not translations:
+        return set()
+    key = TRANSLATION_KEYS[model]
+    fields = translated_fields(model)
+    table = model.__tablename__
+
+    existing: Dict[Tuple[int, str], Any] = {
+        (getattr(row, key.key), row.language): row
+        for row in db.query(model.id, key, model.language, *[getattr(model, f) for f in fields]).filter(
+            key.in_(list(translations))
+        )
+    }
+
+    upserts: List[Dict[str, Any]] = []
+    wanted: Set[Tuple[int, str]] = set()
+    for parent_id, languages in translations.items():
+        for language, values in languages.items():
+            wanted.add((parent_id, language))
+            row = existing.get((parent_id, language))
+            if row is not None and _content(row, fields) == _content(values, fields):
+                continue
+            upserts.append({key.key: parent_id, "language": language, **{f: values.get(f) for f in fields}})
+    deletes = {row.id: row.language for parent_language, row in existing.items() if parent_language not in wanted}
+
+    if deletes:
+        db.query(model).filter(model.id.in_(list(deletes))).delete(synchronize_session=False)
+        writes.add(table, "deleted", len(deletes))
+    set_extra = {"updated_at": func.now()} if "updated_at" in model.__table__.columns else {}
+    for chunk in _chunks(upserts):
+        stmt = insert(model).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key, model.language],
+            set_={**{field: stmt.excluded[field] for field in fields}, **set_extra},
+        )
+        db.execute(stmt)
+    for values in upserts:
+        writes.add(table, "updated" if (values[key.key], values["language"]) in existing else "inserted", 1)
+
+    # Core writes skip the ORM flush hook that normally records this.
+    languages = {values["language"] for values in upserts} | set(deletes.values())
+    if languages:
+        db.info.setdefault("translation_languages", set()).update(languages)
+    return {values[key.key] for values in upserts} | {
+        parent_id for (parent_id, language), row in existing.items() if row.id in deletes
+    }
@@ -1,30 +1,62 @@
-"""Email service using Resend."""
+"""Email service using Resend.
+
+With EMAIL_OUTBOX_ENABLED (the default) ``send_email`` only queues the
+message (app.services.email_outbox) and returns; rendering and the provider
+call happen in the outbox workers. Otherwise it sends inline as before.
+
+Templates are compiled once per process (bytecode is also cached on disk, so
+restarts and the other workers skip compilation) and looked up once per
+name. ``render_many``/``send_many`` render a list of contexts against one
+template and send them through the provider's batch call.
+"""
 
 import logging
-from typing import Dict, Any, Optional
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
-import resend
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, TemplateNotFound, select_autoescape
 import traceback
 
 from app.config import settings
+from app.services.email_transport import BATCH_LIMIT, PermanentEmailError, send_batch, send_message
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize Resend client
-resend.api_key = settings.RESEND_API_KEY
-
 # Template directory
 TEMPLATE_DIR = Path(__file__).parent.parent / "templates" / "emails"
 
-# Initialize Jinja2 environment
+# Initialize Jinja2 environment. Templates only change with a deploy, so
+# modification checks are off outside DEBUG.
 jinja_env = Environment(
     loader=FileSystemLoader(TEMPLATE_DIR),
-    autoescape=select_autoescape(['html', 'xml'])
+    autoescape=select_autoescape(['html', 'xml']),
+    bytecode_cache=FileSystemBytecodeCache(settings.EMAIL_TEMPLATE_CACHE_DIR or None),
+    auto_reload=settings.DEBUG
 )
 
+_HTML_TAG = re.compile('<[^<]+?>')
+_WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=None)
+def _load_templates(template_name: str) -> Tuple[Template, Optional[Template]]:
+    html_template = jinja_env.get_template(f"{template_name}.html")
+    try:
+        text_template = jinja_env.get_template(f"{template_name}.txt")
+    except TemplateNotFound:
+        text_template = None
+    return html_template, text_template
+
+
+def _templates(template_name: str) -> Tuple[Template, Optional[Template]]:
+    """HTML and (optional) text template for ``template_name``; re-read on every call in DEBUG."""
+    if settings.DEBUG:
+        return _load_templates.__wrapped__(template_name)
+    return _load_templates(template_name)
+
 
 class EmailService:
     """Email service for sending various types of emails."""
@@ -32,22 +64,23 @@ class EmailService:
     @staticmethod
     def _render_template(template_name: str, context: Dict[str, Any]) -> tuple[str, str]:
         """Render both HTML and text versions of an email template."""
+        return EmailService.render_many(template_name, [context])[0]
+
+    @staticmethod
+    def render_many(template_name: str, contexts: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Render the HTML and text versions of one template for each context."""
         try:
-            # Render HTML template
-            html_template = jinja_env.get_template(f"{template_name}.html")
-            html_content = html_template.render(**context)
-            
-            # Try to render text template, fallback to HTML if not available
-            try:
-                text_template = jinja_env.get_template(f"{template_name}.txt")
-                text_content = text_template.render(**context)
-            except:
-                # Simple HTML to text conversion
-                import re
-                text_content = re.sub('<[^<]+?>', '', html_content)
-                text_content = re.sub(r'\s+', ' ', text_content).strip()
-            
-            return html_content, text_content
+            html_template, text_template = _templates(template_name)
+            rendered = []
+            for context in contexts:
+                html_content = html_template.render(**context)
+                if text_template is not None:
+                    text_content = text_template.render(**context)
+                else:
+                    # Simple HTML to text conversion
+                    text_content = _WHITESPACE.sub(' ', _HTML_TAG.sub('', html_content)).strip()
+                rendered.append((html_content, text_content))
+            return rendered
         except Exception as e:
             logger.error(f"Error rendering template {template_name}: {e}")
             logger.error(f"Template rendering traceback: {traceback.format_exc()}")
@@ -61,48 +94,126 @@ class EmailService:
         context: Dict[str, Any],
         to_name: Optional[str] = None
     ) -> bool:
-        """Send an email using Resend."""
+        """Queue an email in the outbox, or send it right away if the outbox is disabled."""
         if not settings.EMAIL_ENABLED:
             logger.info(f"Email disabled, skipping email to {to_email}")
             return True
-        
-        # Handle testing mode - redirect all emails to verified address
-        original_email = to_email
-        original_name = to_name
-        
-        if settings.EMAIL_TESTING_MODE:
-            to_email = settings.EMAIL_TEST_RECIPIENT
-            to_name = "Test Recipient"
-            logger.info(f"Testing mode: redirecting email from {original_email} to {to_email}")
-            
-            # Add original recipient info to email context for transparency
-            context = context.copy()
-            context["original_recipient"] = original_email
-            context["original_recipient_name"] = original_name
-            subject = f"[TEST] {subject} (intended for: {original_email})"
-        
+
+        if settings.EMAIL_OUTBOX_ENABLED:
+            from app.services.email_outbox import enqueue_email
+            return enqueue_email(to_email, subject, template_name, context, to_name)
+
         try:
-            # Render templates
-            html_content, text_content = EmailService._render_template(template_name, context)
-            
-            # Prepare email data
-            email_data = {
+            EmailService.deliver(to_email, subject, template_name, context, to_name)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to send email to {to_email}: {e}")
+            logger.error(f"Email sending traceback: {traceback.format_exc()}")
+            return False
+
+    @staticmethod
+    def send_many(template_name: str, messages: List[Dict[str, Any]]) -> int:
+        """
+        Send one template to many recipients (campaigns such as review requests).
+
+        Each message is a dict with ``to_email``, ``subject``, ``context`` and
+        optionally ``to_name``. Queued in one insert when the outbox is enabled,
+        otherwise rendered together and sent in provider batches. Returns the
+        number of messages queued or sent.
+        """
+        if not settings.EMAIL_ENABLED or not messages:
+            return 0
+
+        if settings.EMAIL_OUTBOX_ENABLED:
+            from app.services.email_outbox import enqueue_many
+            return enqueue_many(template_name, messages)
+
+        try:
+            emails = EmailService.compose_many(template_name, messages)
+        except PermanentEmailError as e:
+            logger.error(f"Failed to render {template_name} for {len(messages)} recipients: {e}")
+            return 0
+        sent = 0
+        for start in range(0, len(emails), BATCH_LIMIT):
+            chunk = emails[start:start + BATCH_LIMIT]
+            try:
+                send_batch(chunk)
+                sent += len(chunk)
+            except Exception as e:
+                logger.error(f"Failed to send {template_name} batch of {len(chunk)}: {e}")
+        return sent
+
+    @staticmethod
+    def compose(
+        to_email: str,
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+        to_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Provider message for one email. Raises PermanentEmailError if the template cannot be rendered."""
+        return EmailService.compose_many(template_name, [{
+            "to_email": to_email, "to_name": to_name, "subject": subject, "context": context,
+        }])[0]
+
+    @staticmethod
+    def compose_many(template_name: str, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Provider messages for ``send_many``-style message dicts, rendered in one pass."""
+        prepared = [EmailService._apply_testing_mode(**message) for message in messages]
+        try:
+            rendered = EmailService.render_many(template_name, [context for _, _, context in prepared])
+        except Exception as e:
+            raise PermanentEmailError(f"Cannot render template {template_name}: {e}") from e
+
+        return [
+            {
                 "from": f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM}>",
                 "to": [to_email],  # Simplified - just use the email address
                 "subject": subject,
                 "html": html_content,
                 "text": text_content,
             }
-            
-            # Send email
-            response = resend.Emails.send(email_data)
-            logger.info(f"Email sent successfully to {to_email} (original: {original_email}): {response}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to send email to {to_email} (original: {original_email}): {e}")
-            logger.error(f"Email sending traceback: {traceback.format_exc()}")
-            return False
+            for (to_email, subject, _), (html_content, text_content) in zip(prepared, rendered)
+        ]
+
+    @staticmethod
+    def _apply_testing_mode(
+        to_email: str,
+        subject: str,
+        context: Dict[str, Any],
+        to_name: Optional[str] = None
+    ) -> Tuple[str, str, Dict[str, Any]]:
+        """Redirect to the verified test address in testing mode. Returns (to_email, subject, context)."""
+        if not settings.EMAIL_TESTING_MODE:
+            return to_email, subject, context
+
+        original_email = to_email
+        logger.info(f"Testing mode: redirecting email from {original_email} to {settings.EMAIL_TEST_RECIPIENT}")
+
+        # Add original recipient info to email context for transparency
+        context = context.copy()
+        context["original_recipient"] = original_email
+        context["original_recipient_name"] = to_name
+        subject = f"[TEST] {subject} (intended for: {original_email})"
+        return settings.EMAIL_TEST_RECIPIENT, subject, context
+
+    @staticmethod
+    def deliver(
+        to_email: str,
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+        to_name: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        Render and send an email now. Returns (provider, provider message id).
+
+        Raises PermanentEmailError if the template cannot be rendered; any other
+        exception is a provider failure worth retrying.
+        """
+        provider, message_id = send_message(EmailService.compose(to_email, subject, template_name, context, to_name))
+        logger.info(f"Email sent successfully to {to_email}: {message_id}")
+        return provider, message_id
     
     @staticmethod
     def send_welcome_email(user_email: str, user_name: str) -> bool:
@@ -0,0 +1,329 @@
+"""Durable outbound email queue.
+
+``EmailService.send_email`` inserts a row into ``email_outbox`` and returns;
+the request never waits on the template renderer or the provider. A worker
+loop in every API process (started from the lifespan) claims due rows with
+``FOR UPDATE SKIP LOCKED``, renders them, sends them in provider batches on
+a small thread pool through the rate-limited transport and records the
+outcome:
+
+- sent: status ``sent`` with the provider's message id;
+- failed: back to ``pending`` with exponential backoff (with jitter), until
+  EMAIL_MAX_ATTEMPTS is reached;
+- permanent failure or attempts exhausted: ``dead`` (dead letter), kept for
+  inspection and requeue from the admin API.
+
+A claimed row is leased for EMAIL_OUTBOX_LEASE_SECONDS; if its worker dies
+mid-send the row becomes claimable again, so delivery is at-least-once.
+Sent rows are deleted after EMAIL_OUTBOX_RETENTION_DAYS.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import EmailOutbox, EmailStatus
+from app.services.email import EmailService
+from app.services.email_transport import BATCH_LIMIT, PermanentEmailError, send_batch, send_message
+
+logger = logging.getLogger(__name__)
+
+_wakeup = threading.Event()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_worker_stats: Dict[str, Any] = {"sent": 0, "retried": 0, "dead": 0, "last_run_at": None, "last_error": None}
+_stats_lock = threading.Lock()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.EMAIL_OUTBOX_THREADS, thread_name_prefix="email")
+        return _executor
+
+
+def enqueue_email(
+    to_email: str,
+    subject: str,
+    template_name: str,
+    context: Dict[str, Any],
+    to_name: Optional[str] = None
+) -> bool:
+    """Queue an email for the outbox workers. Returns False if it could not be stored."""
+    db = SessionLocal()
+    try:
+        db.add(EmailOutbox(
+            to_email=to_email,
+            to_name=to_name,
+            subject=subject,
+            template_name=template_name,
+            context=json.dumps(context, default=str),
+        ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to queue email to {to_email}: {e}")
+        return False
+    finally:
+        db.close()
+    _wakeup.set()
+    return True
+
+
+def enqueue_many(template_name: str, messages: List[Dict[str, Any]]) -> int:
+    """Queue ``EmailService.send_many`` messages in one insert. Returns the number queued."""
+    db = SessionLocal()
+    try:
+        db.add_all([
+            EmailOutbox(
+                to_email=message["to_email"],
+                to_name=message.get("to_name"),
+                subject=message["subject"],
+                template_name=template_name,
+                context=json.dumps(message["context"], default=str),
+            )
+            for message in messages
+        ])
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to queue {len(messages)} {template_name} emails: {e}")
+        return 0
+    finally:
+        db.close()
+    _wakeup.set()
+    return len(messages)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before attempt ``attempts + 1``: base * 2^(attempts - 1), capped, ±20% jitter."""
+    delay = min(settings.EMAIL_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), settings.EMAIL_RETRY_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_batch(db: Session, batch_size: int) -> List[Dict[str, Any]]:
+    """Lease up to ``batch_size`` due messages to this worker and commit. Returns their fields."""
+    now = _now()
+    rows = (
+        db.query(EmailOutbox)
+        .filter(or_(
+            and_(EmailOutbox.status == EmailStatus.PENDING.value, EmailOutbox.next_attempt_at <= now),
+            and_(EmailOutbox.status == EmailStatus.SENDING.value, EmailOutbox.locked_until < now),
+        ))
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    jobs = []
+    for row in rows:
+        row.status = EmailStatus.SENDING.value
+        row.attempts += 1
+        row.locked_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+        jobs.append({
+            "id": row.id,
+            "attempts": row.attempts,
+            "to_email": row.to_email,
+            "to_name": row.to_name,
+            "subject": row.subject,
+            "template_name": row.template_name,
+            "context": json.loads(row.context or "{}"),
+        })
+    db.commit()
+    return jobs
+
+
+def _failed(job: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    logger.warning(f"Email {job['id']} attempt {job['attempts']} failed: {error}")
+    if job["attempts"] >= settings.EMAIL_MAX_ATTEMPTS:
+        return {"status": EmailStatus.DEAD, "error": repr(error)}
+    return {"status": EmailStatus.PENDING, "error": repr(error)}
+
+
+def _send_chunk(chunk: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Send (job, message) pairs in one provider call; one outcome per pair."""
+    try:
+        if len(chunk) == 1:
+            provider, message_id = send_message(chunk[0][1])
+            message_ids = [message_id]
+        else:
+            provider, message_ids = send_batch([message for _, message in chunk])
+        return [{"status": EmailStatus.SENT, "provider": provider, "provider_message_id": message_id}
+                for message_id in message_ids]
+    except PermanentEmailError as e:
+        if len(chunk) > 1:
+            # One invalid message rejects the whole batch; send one by one to isolate it.
+            return [outcome for pair in chunk for outcome in _send_chunk([pair])]
+        return [{"status": EmailStatus.DEAD, "error": str(e)}]
+    except Exception as e:
+        return [_failed(job, e) for job, _ in chunk]
+
+
+def send_jobs(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Render claimed jobs and send them in provider batches. Returns one outcome per job."""
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    pending: List[Tuple[int, Dict[str, Any], Dict[str, Any]]] = []
+    for index, job in enumerate(jobs):
+        try:
+            message = EmailService.compose(
+                job["to_email"], job["subject"], job["template_name"], job["context"], job["to_name"]
+            )
+        except PermanentEmailError as e:
+            outcomes[index] = {"status": EmailStatus.DEAD, "error": str(e)}
+            continue
+        pending.append((index, job, message))
+
+    chunks = [pending[start:start + BATCH_LIMIT] for start in range(0, len(pending), BATCH_LIMIT)]
+    results = _pool().map(_send_chunk, [[(job, message) for _, job, message in chunk] for chunk in chunks])
+    for chunk, chunk_outcomes in zip(chunks, results):
+        for (index, _, _), outcome in zip(chunk, chunk_outcomes):
+            outcomes[index] = outcome
+    return outcomes
+
+
+def _record(db: Session, job: Dict[str, Any], outcome: Dict[str, Any]) -> None:
+    values: Dict[str, Any] = {"status": outcome["status"].value, "locked_until": None}
+    if outcome["status"] == EmailStatus.SENT:
+        values.update(sent_at=_now(), last_error=None, provider=outcome["provider"],
+                      provider_message_id=outcome["provider_message_id"])
+    else:
+        values["last_error"] = outcome["error"][:2000]
+        if outcome["status"] == EmailStatus.PENDING:
+            values["next_attempt_at"] = _now() + retry_delay(job["attempts"])
+        else:
+            logger.error(f"Email {job['id']} to {job['to_email']} dead-lettered: {outcome['error']}")
+    # Only while our lease holds: a reclaimed row belongs to the other worker.
+    db.execute(
+        update(EmailOutbox)
+        .where(
+            EmailOutbox.id == job["id"],
+            EmailOutbox.status == EmailStatus.SENDING.value,
+            EmailOutbox.attempts == job["attempts"],
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def purge_sent(db: Session, batch_size: int) -> int:
+    """Delete one batch of sent messages older than the retention period. The caller commits."""
+    expired = (
+        select(EmailOutbox.id)
+        .where(
+            EmailOutbox.status == EmailStatus.SENT.value,
+            EmailOutbox.sent_at < _now() - timedelta(days=settings.EMAIL_OUTBOX_RETENTION_DAYS),
+        )
+        .limit(batch_size)
+        .scalar_subquery()
+    )
+    return db.execute(
+        delete(EmailOutbox).where(EmailOutbox.id.in_(expired)).execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def dispatch_once(batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Send every due message, one leased batch at a time. Returns outcome counts."""
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    counts = {"sent": 0, "retried": 0, "dead": 0}
+    labels = {EmailStatus.SENT: "sent", EmailStatus.PENDING: "retried", EmailStatus.DEAD: "dead"}
+    db = SessionLocal()
+    try:
+        while True:
+            jobs = claim_batch(db, batch_size)
+            if not jobs:
+                break
+            outcomes = send_jobs(jobs)
+            for job, outcome in zip(jobs, outcomes):
+                _record(db, job, outcome)
+                counts[labels[outcome["status"]]] += 1
+            db.commit()
+            if len(jobs) < batch_size:
+                break
+        purge_sent(db, batch_size)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        with _stats_lock:
+            for key, value in counts.items():
+                _worker_stats[key] += value
+            _worker_stats["last_run_at"] = _now().isoformat()
+    return counts
+
+
+async def run_outbox_worker(poll_seconds: int) -> None:
+    """Dispatch due messages whenever one is queued in this process, or every ``poll_seconds``."""
+    while True:
+        _wakeup.clear()
+        try:
+            await asyncio.to_thread(dispatch_once)
+            _worker_stats["last_error"] = None
+        except Exception as e:
+            logger.exception("Email outbox dispatch failed")
+            _worker_stats["last_error"] = repr(e)
+        await asyncio.to_thread(_wakeup.wait, poll_seconds)
+
+
+def requeue(db: Session, email_id: Optional[int] = None) -> int:
+    """Move dead messages (one, or all) back to pending with a fresh attempt budget. The caller commits."""
+    query = db.query(EmailOutbox).filter(EmailOutbox.status == EmailStatus.DEAD.value)
+    if email_id is not None:
+        query = query.filter(EmailOutbox.id == email_id)
+    count = query.update({
+        EmailOutbox.status: EmailStatus.PENDING.value,
+        EmailOutbox.attempts: 0,
+        EmailOutbox.next_attempt_at: _now(),
+        EmailOutbox.locked_until: None,
+    }, synchronize_session=False)
+    _wakeup.set()
+    return count
+
+
+def outbox_stats(db: Session, dead_limit: int = 20) -> Dict[str, Any]:
+    """Messages per status, the oldest due message, recent dead letters and this worker's counters."""
+    by_status = dict(db.query(EmailOutbox.status, func.count(EmailOutbox.id)).group_by(EmailOutbox.status).all())
+    oldest_due = db.query(func.min(EmailOutbox.next_attempt_at)).filter(
+        EmailOutbox.status == EmailStatus.PENDING.value
+    ).scalar()
+    dead = (
+        db.query(EmailOutbox)
+        .filter(EmailOutbox.status == EmailStatus.DEAD.value)
+        .order_by(EmailOutbox.id.desc())
+        .limit(dead_limit)
+        .all()
+    )
+    with _stats_lock:
+        worker = dict(_worker_stats)
+    return {
+        "counts": {status.value: by_status.get(status.value, 0) for status in EmailStatus},
+        "oldest_pending_at": oldest_due.isoformat() if oldest_due else None,
+        "dead_letters": [
+            {
+                "id": row.id,
+                "to_email": row.to_email,
+                "template_name": row.template_name,
+                "attempts": row.attempts,
+                "last_error": row.last_error,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+            }
+            for row in dead
+        ],
+        "worker": worker,
+    }
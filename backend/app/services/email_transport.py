@@ -0,0 +1,132 @@
+"""Email transports: the provider call behind EmailService, rate limited per provider.
+
+``EMAIL_TRANSPORT`` selects the provider. ``stub`` sends nothing and keeps
+the messages in memory, so the outbox and its retries can be exercised
+offline (set ``fail_next`` to simulate provider outages).
+
+``send_batch`` delivers up to BATCH_LIMIT messages in one provider call and
+costs one rate-limit token, which is what makes bulk sends fast.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import resend
+import resend.exceptions
+
+from app.config import settings
+
+resend.api_key = settings.RESEND_API_KEY
+
+# Resend accepts at most 100 messages per batch call.
+BATCH_LIMIT = 100
+
+
+class PermanentEmailError(Exception):
+    """Delivery can never succeed (bad template, rejected message); not retried."""
+
+
+class TokenBucket:
+    """Blocking token bucket: at most ``rate`` acquisitions per second, bursts of ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class ResendTransport:
+    """Resend API."""
+
+    name = "resend"
+    _permanent = (resend.exceptions.ValidationError, resend.exceptions.MissingRequiredFieldsError)
+
+    def send(self, message: Dict[str, Any]) -> str:
+        try:
+            response = resend.Emails.send(message)
+        except self._permanent as e:
+            raise PermanentEmailError(str(e)) from e
+        return response.get("id", "") if isinstance(response, dict) else str(response)
+
+    def send_batch(self, messages: List[Dict[str, Any]]) -> List[str]:
+        try:
+            response = resend.Batch.send(messages)
+        except self._permanent as e:
+            raise PermanentEmailError(str(e)) from e
+        data = response.get("data", []) if isinstance(response, dict) else response
+        return [item.get("id", "") for item in data]
+
+
+class StubTransport:
+    """Offline transport: records messages instead of sending them."""
+
+    name = "stub"
+
+    def __init__(self):
+        self.sent: List[Dict[str, Any]] = []
+        self.fail_next = 0
+
+    def send(self, message: Dict[str, Any]) -> str:
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            raise ConnectionError("stub transport: simulated provider failure")
+        self.sent.append(message)
+        return f"stub-{len(self.sent)}"
+
+    def send_batch(self, messages: List[Dict[str, Any]]) -> List[str]:
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            raise ConnectionError("stub transport: simulated provider failure")
+        self.sent.extend(messages)
+        return [f"stub-{len(self.sent) - len(messages) + i + 1}" for i in range(len(messages))]
+
+
+_TRANSPORTS = {ResendTransport.name: ResendTransport, StubTransport.name: StubTransport}
+_transports: Dict[str, Any] = {}
+_limiters: Dict[str, TokenBucket] = {}
+_registry_lock = threading.Lock()
+
+
+def get_transport():
+    """The configured transport (one instance per process)."""
+    name = settings.EMAIL_TRANSPORT
+    with _registry_lock:
+        if name not in _transports:
+            if name not in _TRANSPORTS:
+                raise ValueError(f"Unknown EMAIL_TRANSPORT {name!r}")
+            _transports[name] = _TRANSPORTS[name]()
+            _limiters[name] = TokenBucket(settings.EMAIL_RATE_LIMIT_PER_SECOND)
+        return _transports[name]
+
+
+def send_message(message: Dict[str, Any]) -> Tuple[str, str]:
+    """Send through the configured transport, waiting for its rate limit. Returns (provider, message id)."""
+    transport = get_transport()
+    _limiters[transport.name].acquire()
+    return transport.name, transport.send(message)
+
+
+def send_batch(messages: List[Dict[str, Any]]) -> Tuple[str, List[str]]:
+    """Send up to BATCH_LIMIT messages in one provider call. Returns (provider, message ids in order)."""
+    if len(messages) > BATCH_LIMIT:
+        raise ValueError(f"At most {BATCH_LIMIT} messages per batch")
+    transport = get_transport()
+    _limiters[transport.name].acquire()
+    return transport.name, transport.send_batch(messages)
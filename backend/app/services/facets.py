@@ -0,0 +1,267 @@
+"""Facet counts for the activity search sidebar.
+
+Counts are computed from ``activity_facets`` (one denormalized row per
+activity, see app.models.search.ActivityFacet) so a facet request is a
+handful of GROUP BYs over a narrow table. Rows are refreshed inside the
+transaction of every write that changes a faceted value; rebuild_search_index.py
+rebuilds them all after seed/import scripts.
+
+Each facet is counted with every active filter applied except its own, so
+selecting one category still shows the counts of the other categories.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import false, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Activity, ActivityCategory, ActivityDestination, ActivityFacet,
+    Category, Destination, Vendor
+)
+from app.services.search_index import apply_text_search
+from app.utils.brands import BRAND_ORDER, BRAND_SENTINELS, brand_for_vendor
+from app.utils.translation import get_translated_category, get_translated_destination
+
+# Half-open [low, high) ranges; None means unbounded.
+PRICE_BUCKETS: List[Tuple[int, Optional[int]]] = [(0, 25), (25, 50), (50, 100), (100, 200), (200, None)]
+DURATION_BUCKETS: List[Tuple[int, Optional[int]]] = [(0, 60), (60, 240), (240, 1440), (1440, None)]  # minutes
+
+_UPSERT_CHUNK = 500
+
+
+def _bucket(value, buckets: Sequence[Tuple[int, Optional[int]]]) -> Optional[int]:
+    """Index of the bucket containing ``value`` (None for missing values)."""
+    if value is None:
+        return None
+    for index, (low, high) in enumerate(buckets):
+        if value >= low and (high is None or value < high):
+            return index
+    return None
+
+
+def _group(rows: Iterable[Tuple[int, int]]) -> Dict[int, List[int]]:
+    grouped: Dict[int, List[int]] = {}
+    for activity_id, value in rows:
+        grouped.setdefault(activity_id, []).append(value)
+    return grouped
+
+
+def refresh_activity_facets(db: Session, activity_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute facet rows for the given activities (or all activities if None).
+
+    Flushes pending changes first and upserts inside the caller's
+    transaction; the caller commits. Returns the number of rows written.
+    """
+    db.flush()
+
+    query = db.query(
+        Activity.id, Activity.vendor_id, Vendor.company_name, Activity.is_active,
+        Activity.is_available, Activity.languages, Activity.price_adult,
+        Activity.duration_minutes, Activity.average_rating, Activity.free_cancellation_hours,
+        Activity.instant_confirmation, Activity.is_skip_the_line, Activity.is_bestseller
+    ).join(Vendor, Vendor.id == Activity.vendor_id)
+    category_query = db.query(ActivityCategory.activity_id, ActivityCategory.category_id)
+    destination_query = db.query(ActivityDestination.activity_id, ActivityDestination.destination_id)
+
+    if activity_ids is not None:
+        ids = sorted(set(activity_ids))
+        if not ids:
+            return 0
+        query = query.filter(Activity.id.in_(ids))
+        category_query = category_query.filter(ActivityCategory.activity_id.in_(ids))
+        destination_query = destination_query.filter(ActivityDestination.activity_id.in_(ids))
+
+    categories = _group(category_query.all())
+    destinations = _group(destination_query.all())
+
+    rows = [
+        {
+            "activity_id": a.id,
+            "vendor_id": a.vendor_id,
+            "brand": brand_for_vendor(a.company_name),
+            "is_active": bool(a.is_active),
+            "is_available": bool(a.is_available),
+            "category_ids": sorted(set(categories.get(a.id, []))),
+            "destination_ids": sorted(set(destinations.get(a.id, []))),
+            "languages": list(a.languages or []),
+            "price_adult": a.price_adult,
+            "price_bucket": _bucket(a.price_adult, PRICE_BUCKETS),
+            "duration_minutes": a.duration_minutes,
+            "duration_bucket": _bucket(a.duration_minutes, DURATION_BUCKETS),
+            "average_rating": a.average_rating or 0,
+            "free_cancellation": (a.free_cancellation_hours or 0) > 0,
+            "instant_confirmation": bool(a.instant_confirmation),
+            "is_skip_the_line": bool(a.is_skip_the_line),
+            "is_bestseller": bool(a.is_bestseller),
+        }
+        for a in query.all()
+    ]
+
+    for start in range(0, len(rows), _UPSERT_CHUNK):
+        stmt = insert(ActivityFacet).values(rows[start:start + _UPSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ActivityFacet.activity_id],
+            set_={
+                **{key: stmt.excluded[key] for key in rows[0] if key != "activity_id"},
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+    return len(rows)
+
+
+def _facet_conditions(
+    db: Session,
+    q: Optional[str] = None,
+    category_id: Optional[int] = None,
+    category_slug: Optional[str] = None,
+    destination_id: Optional[int] = None,
+    destination_slug: Optional[str] = None,
+    vendor_id: Optional[int] = None,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None,
+    min_duration: Optional[int] = None,
+    max_duration: Optional[int] = None,
+    min_rating: Optional[float] = None,
+    languages: Optional[List[str]] = None,
+    free_cancellation: Optional[bool] = None,
+    instant_confirmation: Optional[bool] = None,
+    skip_the_line: Optional[bool] = None,
+    bestseller: Optional[bool] = None,
+    is_available: Optional[bool] = None,
+) -> Dict[str, list]:
+    """Translate search_activities filters into facet-table conditions, grouped by facet."""
+    conditions: Dict[str, list] = {
+        "base": [ActivityFacet.is_active == True],
+        "category": [], "destination": [], "provider": [],
+        "price": [], "duration": [], "language": [],
+    }
+
+    if category_slug:
+        slug_id = db.query(Category.id).filter(Category.slug == category_slug).scalar()
+        conditions["category"].append(
+            ActivityFacet.category_ids.any(slug_id) if slug_id is not None else false()
+        )
+    if category_id:
+        conditions["category"].append(ActivityFacet.category_ids.any(category_id))
+
+    if destination_slug:
+        slug_id = db.query(Destination.id).filter(Destination.slug == destination_slug).scalar()
+        conditions["destination"].append(
+            ActivityFacet.destination_ids.any(slug_id) if slug_id is not None else false()
+        )
+    if destination_id:
+        conditions["destination"].append(ActivityFacet.destination_ids.any(destination_id))
+
+    # Same brand-sentinel semantics as search_activities.
+    if vendor_id is not None and vendor_id < 0:
+        brand = BRAND_SENTINELS.get(vendor_id)
+        conditions["provider"].append(ActivityFacet.brand == brand if brand else false())
+    elif vendor_id:
+        conditions["provider"].append(ActivityFacet.vendor_id == vendor_id)
+
+    if min_price is not None:
+        conditions["price"].append(ActivityFacet.price_adult >= min_price)
+    if max_price is not None:
+        conditions["price"].append(ActivityFacet.price_adult <= max_price)
+
+    if min_duration is not None:
+        conditions["duration"].append(ActivityFacet.duration_minutes >= min_duration)
+    if max_duration is not None:
+        conditions["duration"].append(ActivityFacet.duration_minutes <= max_duration)
+
+    for spoken_language in languages or []:
+        conditions["language"].append(ActivityFacet.languages.contains([spoken_language]))
+
+    base = conditions["base"]
+    if q and q.strip():
+        matching, _ = apply_text_search(db.query(Activity.id), q)
+        base.append(ActivityFacet.activity_id.in_(matching.scalar_subquery()))
+    if min_rating is not None:
+        base.append(ActivityFacet.average_rating >= min_rating)
+    if free_cancellation is not None:
+        base.append(ActivityFacet.free_cancellation == free_cancellation)
+    if instant_confirmation is not None:
+        base.append(ActivityFacet.instant_confirmation == instant_confirmation)
+    if skip_the_line is not None:
+        base.append(ActivityFacet.is_skip_the_line == skip_the_line)
+    if bestseller is not None:
+        base.append(ActivityFacet.is_bestseller == bestseller)
+    if is_available is not None:
+        base.append(ActivityFacet.is_available == is_available)
+
+    return conditions
+
+
+def _where(conditions: Dict[str, list], exclude: Optional[str] = None) -> list:
+    return [c for facet, conds in conditions.items() if facet != exclude for c in conds]
+
+
+def _count_values(db: Session, column, conditions: Dict[str, list], facet: str) -> Dict[Any, int]:
+    """value -> count for a scalar facet column."""
+    rows = db.query(column, func.count()).filter(*_where(conditions, facet)).group_by(column).all()
+    return {value: count for value, count in rows if value is not None}
+
+
+def _count_array_values(db: Session, column, conditions: Dict[str, list], facet: str) -> Dict[Any, int]:
+    """value -> count for an array facet column (each element counted once per activity)."""
+    values = db.query(func.unnest(column).label("value")).filter(*_where(conditions, facet)).subquery()
+    rows = db.query(values.c.value, func.count()).group_by(values.c.value).all()
+    return {value: count for value, count in rows}
+
+
+def _ranges(buckets, counts: Dict[int, int], low_key: str, high_key: str) -> List[Dict[str, Any]]:
+    return [
+        {low_key: low, high_key: high, "count": counts.get(index, 0)}
+        for index, (low, high) in enumerate(buckets)
+    ]
+
+
+def get_facet_counts(db: Session, language: str = 'en', **filters) -> Dict[str, Any]:
+    """
+    Counts for every sidebar facet under the given search_activities filters.
+
+    ``filters`` takes the search_activities filter parameters (q,
+    category_id/slug, destination_id/slug, vendor_id, price, duration,
+    rating, languages and the boolean flags).
+    """
+    conditions = _facet_conditions(db, **filters)
+
+    total = db.query(func.count(ActivityFacet.activity_id)).filter(*_where(conditions)).scalar()
+    category_counts = _count_array_values(db, ActivityFacet.category_ids, conditions, "category")
+    destination_counts = _count_array_values(db, ActivityFacet.destination_ids, conditions, "destination")
+    language_counts = _count_array_values(db, ActivityFacet.languages, conditions, "language")
+    brand_counts = _count_values(db, ActivityFacet.brand, conditions, "provider")
+    price_counts = _count_values(db, ActivityFacet.price_bucket, conditions, "price")
+    duration_counts = _count_values(db, ActivityFacet.duration_bucket, conditions, "duration")
+
+    categories = db.query(Category).filter(Category.id.in_(category_counts)).all() if category_counts else []
+    destinations = db.query(Destination).filter(Destination.id.in_(destination_counts)).all() if destination_counts else []
+
+    def named(items, counts, translate):
+        result = []
+        for item in items:
+            data = translate(item, language, db)
+            result.append({"id": item.id, "name": data["name"], "slug": item.slug, "count": counts[item.id]})
+        return sorted(result, key=lambda entry: (-entry["count"], entry["name"]))
+
+    return {
+        "total": total,
+        "categories": named(categories, category_counts, get_translated_category),
+        "destinations": named(destinations, destination_counts, get_translated_destination),
+        "providers": [
+            {"id": sentinel, "company_name": brand, "count": brand_counts[brand]}
+            for sentinel, brand in BRAND_ORDER
+            if brand_counts.get(brand)
+        ],
+        "price_ranges": _ranges(PRICE_BUCKETS, price_counts, "min_price", "max_price"),
+        "durations": _ranges(DURATION_BUCKETS, duration_counts, "min_minutes", "max_minutes"),
+        "languages": [
+            {"code": code, "count": count}
+            for code, count in sorted(language_counts.items(), key=lambda item: (-item[1], item[0]))
+        ],
+    }
@@ -0,0 +1,205 @@
+"""Capacity of bookable slots.
+
+A slot is one ``availability`` row per (activity, date, start_time); a
+booking without a time uses the row with ``start_time`` NULL. Rows are
+created on first use with the capacity of the matching time slot (or the
+activity's max_group_size, default 20 as on the availability endpoint).
+
+``reserve`` takes spots with a single conditional UPDATE
+(``spots_available >= n``). Concurrent reservations of the same slot
+serialize on the row lock, and PostgreSQL re-checks the condition once the
+competing transaction commits, so a slot can never be oversold. ``release``
+gives spots back when a booking is cancelled or rejected.
+
+Cart holds (app.services.cart_holds) take spots the same way but also count
+them in ``spots_held``; ``release_hold`` gives them back and
+``consume_hold`` turns them into booked spots at checkout.
+"""
+
+from datetime import date, time
+from typing import Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from app.models import Activity, ActivityTimeSlot, Availability, BookingStatus
+
+DEFAULT_CAPACITY = 20
+
+# Bookings in these states hold their spots.
+HOLDING_STATUSES = (
+    BookingStatus.PENDING,
+    BookingStatus.PENDING_VENDOR_APPROVAL,
+    BookingStatus.CONFIRMED,
+)
+
+
+class SoldOutError(Exception):
+    """Not enough spots left in the requested slot."""
+
+    def __init__(self, spots_available: int):
+        self.spots_available = max(spots_available, 0)
+        super().__init__(f"Only {self.spots_available} spots left")
+
+
+def _slot_filter(activity_id: int, slot_date: date, start_time: Optional[time]):
+    return (
+        Availability.activity_id == activity_id,
+        Availability.date == slot_date,
+        Availability.start_time == start_time if start_time is not None else Availability.start_time.is_(None),
+    )
+
+
+def _capacity(db: Session, activity: Activity, start_time: Optional[time]) -> int:
+    if start_time is not None:
+        slot_capacity = db.query(ActivityTimeSlot.max_capacity).filter(
+            ActivityTimeSlot.activity_id == activity.id,
+            ActivityTimeSlot.slot_time == start_time.strftime("%H:%M"),
+        ).scalar()
+        if slot_capacity:
+            return slot_capacity
+    return activity.max_group_size or DEFAULT_CAPACITY
+
+
+def ensure_slot(db: Session, activity: Activity, slot_date: date, start_time: Optional[time]) -> int:
+    """
+    Id of the availability row for the slot, creating it if missing.
+
+    Creation locks the activity row first so two first bookings of a slot
+    cannot both insert it (the unique index does not cover NULL start times).
+    """
+    slot_filter = _slot_filter(activity.id, slot_date, start_time)
+    slot_id = db.query(Availability.id).filter(*slot_filter).scalar()
+    if slot_id is not None:
+        return slot_id
+
+    db.query(Activity.id).filter(Activity.id == activity.id).with_for_update().scalar()
+    slot_id = db.query(Availability.id).filter(*slot_filter).scalar()
+    if slot_id is not None:
+        return slot_id
+
+    capacity = _capacity(db, activity, start_time)
+    slot = Availability(
+        activity_id=activity.id,
+        date=slot_date,
+        start_time=start_time,
+        spots_available=capacity,
+        spots_total=capacity,
+        price_adult=activity.price_adult,
+        price_child=activity.price_child,
+        is_available=True,
+    )
+    db.add(slot)
+    db.flush()
+    return slot.id
+
+
+def reserve(
+    db: Session,
+    activity: Activity,
+    slot_date: date,
+    start_time: Optional[time],
+    participants: int,
+    allow_overbook: bool = False,
+) -> bool:
+    """
+    Take ``participants`` spots in the slot inside the caller's transaction.
+
+    Raises SoldOutError when the slot cannot take them. With
+    ``allow_overbook`` (payment already captured) the spots are always
+    taken, possibly driving the count negative, and the return value tells
+    whether the slot had room. Returns True when it did.
+    """
+    slot_id = ensure_slot(db, activity, slot_date, start_time)
+    taken = db.execute(
+        update(Availability)
+        .where(
+            Availability.id == slot_id,
+            Availability.is_available == True,
+            Availability.spots_available >= participants,
+        )
+        .values(spots_available=Availability.spots_available - participants)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if taken:
+        return True
+
+    if not allow_overbook:
+        remaining = db.query(Availability.spots_available).filter(Availability.id == slot_id).scalar()
+        raise SoldOutError(remaining or 0)
+
+    db.execute(
+        update(Availability)
+        .where(Availability.id == slot_id)
+        .values(spots_available=Availability.spots_available - participants)
+        .execution_options(synchronize_session=False)
+    )
+    return False
+
+
+def hold(db: Session, activity: Activity, slot_date: date, start_time: Optional[time], participants: int) -> None:
+    """Take ``participants`` spots for a cart hold. Raises SoldOutError like ``reserve``."""
+    slot_id = ensure_slot(db, activity, slot_date, start_time)
+    taken = db.execute(
+        update(Availability)
+        .where(
+            Availability.id == slot_id,
+            Availability.is_available == True,
+            Availability.spots_available >= participants,
+        )
+        .values(
+            spots_available=Availability.spots_available - participants,
+            spots_held=Availability.spots_held + participants,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not taken:
+        remaining = db.query(Availability.spots_available).filter(Availability.id == slot_id).scalar()
+        raise SoldOutError(remaining or 0)
+
+
+def release_hold(db: Session, activity_id: int, slot_date: date, start_time: Optional[time], participants: int) -> None:
+    """Give the spots of an expired or abandoned cart hold back to the slot."""
+    db.execute(
+        update(Availability)
+        .where(*_slot_filter(activity_id, slot_date, start_time))
+        .values(
+            spots_available=Availability.spots_available + participants,
+            spots_held=func.greatest(Availability.spots_held - participants, 0),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def consume_hold(db: Session, activity_id: int, slot_date: date, start_time: Optional[time], participants: int) -> None:
+    """Turn held spots into booked spots (they stay out of spots_available)."""
+    db.execute(
+        update(Availability)
+        .where(*_slot_filter(activity_id, slot_date, start_time))
+        .values(spots_held=func.greatest(Availability.spots_held - participants, 0))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release(db: Session, activity_id: int, slot_date: date, start_time: Optional[time], participants: int) -> None:
+    """
+    Give ``participants`` spots back to the slot inside the caller's transaction.
+
+    Capped at the unheld capacity so bookings made before capacity was
+    tracked cannot inflate a slot.
+    """
+    db.execute(
+        update(Availability)
+        .where(*_slot_filter(activity_id, slot_date, start_time))
+        .values(spots_available=func.least(
+            Availability.spots_available + participants,
+            Availability.spots_total - Availability.spots_held
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_booking(db: Session, booking) -> None:
+    """Release the spots held by ``booking``. Call before moving it to cancelled/rejected."""
+    if booking.status in HOLDING_STATUSES:
+        release(db, booking.activity_id, booking.booking_date, booking.booking_time, booking.total_participants)
@@ -0,0 +1,150 @@
+"""Short-lived cache of authenticated principals, keyed by user id.
+
+Every authenticated request used to load the User row, and vendor endpoints
+the Vendor row on top of it. A ``Principal`` is the immutable snapshot the
+auth dependencies and handlers actually need (role, is_active, vendor id and
+the contact fields bookings/reviews copy), so a cache hit authorizes a
+request with no queries at all.
+
+Entries live on the same backends as the activity detail cache
+(``app.services.cache``). Any session that commits a change to a User or
+Vendor row invalidates that user's entry (see the session listeners at the
+bottom), so role, status and profile edits made through the ORM take effect
+on the next request. The in-process backend only drops the entry in the
+worker that made the change; the others keep theirs until
+PRINCIPAL_CACHE_TTL_SECONDS pass, which is why the TTL is short. With Redis
+the entry is shared and removed for every worker at once. Changes made
+outside the ORM (raw SQL, another service) also show up only after the TTL.
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.user import User, UserRole, Vendor
+from app.services.cache import ReadThroughCache, backend_from_settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "principal"
+
+
+class Principal(BaseModel):
+    """What the auth dependencies know about the caller. Not attached to a session."""
+
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    email: str
+    full_name: str
+    phone: Optional[str] = None
+    role: UserRole
+    is_active: bool
+    email_verified: bool = False
+    created_at: Optional[datetime] = None
+    vendor_id: Optional[int] = None
+    vendor_verified: Optional[bool] = None
+
+
+def load_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """Principal for ``user_id`` straight from the database (one query), or None."""
+    row = (
+        db.query(User, Vendor.id, Vendor.is_verified)
+        .outerjoin(Vendor, Vendor.user_id == User.id)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+    user, vendor_id, vendor_verified = row
+    return Principal(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        phone=user.phone,
+        role=user.role,
+        is_active=bool(user.is_active),
+        email_verified=bool(user.email_verified),
+        created_at=user.created_at,
+        vendor_id=vendor_id,
+        vendor_verified=vendor_verified,
+    )
+
+
+class PrincipalCache(ReadThroughCache):
+    """Read-through principal cache. Backend failures fall back to the database."""
+
+    def get(self, db: Session, user_id: int) -> Optional[Principal]:
+        """The caller's principal, from the cache when fresh. None if the user does not exist."""
+        if not self.enabled:
+            return load_principal(db, user_id)
+
+        key = f"{KEY_PREFIX}:{user_id}"
+        try:
+            cached = self.backend.get(key)
+        except Exception:
+            logger.warning("Principal cache unavailable, loading from database", exc_info=True)
+            self._count("errors")
+            return load_principal(db, user_id)
+
+        if cached is not None:
+            self._count("hits")
+            return Principal.model_validate_json(cached)
+
+        self._count("misses")
+        principal = load_principal(db, user_id)
+        if principal is not None:
+            try:
+                self.backend.set(key, principal.model_dump_json())
+            except Exception:
+                logger.warning("Principal cache unavailable storing user %s", user_id, exc_info=True)
+                self._count("errors")
+        return principal
+
+    def invalidate(self, *user_ids: int) -> None:
+        """Forget the given users so their next request reloads them. Call after commit."""
+        for user_id in user_ids:
+            try:
+                self.backend.delete(f"{KEY_PREFIX}:{user_id}")
+            except Exception:
+                logger.warning("Principal cache unavailable invalidating user %s", user_id, exc_info=True)
+                self._count("errors")
+
+
+principal_cache = PrincipalCache(
+    backend_from_settings(
+        settings.PRINCIPAL_CACHE_BACKEND,
+        settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+        settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        KEY_PREFIX,
+    ),
+    enabled=settings.PRINCIPAL_CACHE_ENABLED,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_principal_writes(session, flush_context):
+    """Remember which users' principals this transaction changed."""
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(instance, User):
+            user_id = instance.id
+        elif isinstance(instance, Vendor):
+            user_id = instance.user_id
+        else:
+            continue
+        session.info.setdefault("principal_user_ids", set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_principal_writes(session):
+    principal_cache.invalidate(*session.info.pop("principal_user_ids", ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_writes(session):
+    session.info.pop("principal_user_ids", None)
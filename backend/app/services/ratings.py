@@ -0,0 +1,226 @@
+"""Incrementally maintained rating summaries per activity and vendor.
+
+``rating_summaries`` holds the review count, rating sum and 1-5 star
+histogram of every activity and vendor; ``rating_category_summaries`` the
+count and sum per ReviewCategory name ("Value for money", ...). Review write
+paths call the helpers below before committing. Each one is a single
+``INSERT ... ON CONFLICT DO UPDATE SET column = column + delta`` per table
+covering the activity and its vendor, so a review write costs the same
+however many reviews the activity has, and concurrent writers never lose
+updates.
+
+The activity helpers return the activity's new (review_count, rating_sum),
+from which the caller sets Activity.average_rating / total_reviews.
+
+``rebuild_rating_summaries`` recomputes everything from the reviews. It runs
+on container start (rebuild_rating_summaries.py) to pick up reviews written
+outside the API (seed scripts, restores) and to correct any drift.
+"""
+
+from collections import Counter
+from typing import Any, Dict, List, Set, Tuple
+
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Activity, Review, ReviewCategory
+from app.models.review import RatingCategorySummary, RatingSummary
+
+ACTIVITY = "activity"
+VENDOR = "vendor"
+STARS = (1, 2, 3, 4, 5)
+_COUNTERS = ("review_count", "rating_sum") + tuple(f"stars_{star}" for star in STARS)
+
+
+def average_rating(review_count: int, rating_sum: int) -> float:
+    """Average rounded as Activity.average_rating stores it."""
+    return round(rating_sum / review_count, 1) if review_count else 0
+
+
+def _increment(
+    db: Session,
+    scopes: List[Tuple[str, int]],
+    stars: Dict[int, int],
+    categories: Dict[str, Tuple[int, int]],
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Add star-count deltas (rating -> reviews) and per-category (count, sum)
+    deltas to every scope; returns each scope's new (review_count, rating_sum).
+    """
+    deltas = {
+        "review_count": sum(stars.values()),
+        "rating_sum": sum(star * delta for star, delta in stars.items()),
+        **{f"stars_{star}": stars.get(star, 0) for star in STARS},
+    }
+    totals = {}
+    if any(deltas.values()):
+        stmt = insert(RatingSummary).values([
+            {"scope": scope, "scope_id": scope_id, **deltas} for scope, scope_id in scopes
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RatingSummary.scope, RatingSummary.scope_id],
+            set_={
+                **{column: getattr(RatingSummary, column) + stmt.excluded[column] for column in _COUNTERS},
+                "updated_at": func.now(),
+            },
+        ).returning(RatingSummary.scope, RatingSummary.review_count, RatingSummary.rating_sum)
+        totals = {row.scope: (row.review_count, row.rating_sum) for row in db.execute(stmt)}
+
+    rows = [
+        {"scope": scope, "scope_id": scope_id, "category_name": name, "review_count": count, "rating_sum": total}
+        for scope, scope_id in scopes
+        for name, (count, total) in sorted(categories.items())
+        if count or total
+    ]
+    if rows:
+        stmt = insert(RatingCategorySummary).values(rows)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[
+                RatingCategorySummary.scope, RatingCategorySummary.scope_id, RatingCategorySummary.category_name
+            ],
+            set_={
+                "review_count": RatingCategorySummary.review_count + stmt.excluded.review_count,
+                "rating_sum": RatingCategorySummary.rating_sum + stmt.excluded.rating_sum,
+                "updated_at": func.now(),
+            },
+        ))
+    return totals
+
+
+def _review_categories(review: Review, sign: int) -> Dict[str, Tuple[int, int]]:
+    categories: Dict[str, Tuple[int, int]] = {}
+    for category in review.category_ratings:
+        count, total = categories.get(category.category_name, (0, 0))
+        categories[category.category_name] = (count + sign, total + sign * category.rating)
+    return categories
+
+
+def _activity_totals(db: Session, review: Review, totals: Dict[str, Tuple[int, int]]) -> Tuple[int, int]:
+    if ACTIVITY in totals:
+        return totals[ACTIVITY]
+    summary = db.get(RatingSummary, (ACTIVITY, review.activity_id))
+    return (summary.review_count, summary.rating_sum) if summary is not None else (0, 0)
+
+
+def add_review_rating(db: Session, review: Review) -> Tuple[int, int]:
+    """Count a new review (and its category ratings); returns the activity's (review_count, rating_sum)."""
+    totals = _increment(
+        db, [(ACTIVITY, review.activity_id), (VENDOR, review.vendor_id)],
+        {review.rating: 1}, _review_categories(review, 1),
+    )
+    return _activity_totals(db, review, totals)
+
+
+def change_review_rating(db: Session, review: Review, old_rating: int) -> Tuple[int, int]:
+    """Move a review from ``old_rating`` to its current rating; returns the activity's (review_count, rating_sum)."""
+    stars = Counter({review.rating: 1})
+    stars[old_rating] -= 1
+    totals = _increment(db, [(ACTIVITY, review.activity_id), (VENDOR, review.vendor_id)], dict(stars), {})
+    return _activity_totals(db, review, totals)
+
+
+def remove_review_rating(db: Session, review: Review) -> Tuple[int, int]:
+    """
+    Uncount a review that is being deleted; returns the activity's (review_count, rating_sum).
+
+    Call before the delete is flushed, while its category ratings are readable.
+    """
+    totals = _increment(
+        db, [(ACTIVITY, review.activity_id), (VENDOR, review.vendor_id)],
+        {review.rating: -1}, _review_categories(review, -1),
+    )
+    return _activity_totals(db, review, totals)
+
+
+def remove_activity_ratings(db: Session, activity: Activity) -> None:
+    """Drop a hard-deleted activity's summaries and take its reviews out of its vendor's."""
+    summary = db.get(RatingSummary, (ACTIVITY, activity.id))
+    categories = db.query(RatingCategorySummary).filter(
+        RatingCategorySummary.scope == ACTIVITY,
+        RatingCategorySummary.scope_id == activity.id,
+    ).all()
+    if summary is not None:
+        _increment(
+            db, [(VENDOR, activity.vendor_id)],
+            {star: -getattr(summary, f"stars_{star}") for star in STARS},
+            {category.category_name: (-category.review_count, -category.rating_sum) for category in categories},
+        )
+    db.query(RatingSummary).filter(
+        RatingSummary.scope == ACTIVITY, RatingSummary.scope_id == activity.id
+    ).delete(synchronize_session=False)
+    db.query(RatingCategorySummary).filter(
+        RatingCategorySummary.scope == ACTIVITY, RatingCategorySummary.scope_id == activity.id
+    ).delete(synchronize_session=False)
+
+
+def get_rating_summary(db: Session, scope: str, scope_id: int) -> Dict[str, Any]:
+    """Average, count, star histogram and per-category averages of one activity or vendor."""
+    summary = db.get(RatingSummary, (scope, scope_id))
+    categories = db.query(RatingCategorySummary).filter(
+        RatingCategorySummary.scope == scope,
+        RatingCategorySummary.scope_id == scope_id,
+        RatingCategorySummary.review_count > 0,
+    ).order_by(RatingCategorySummary.category_name).all()
+    review_count = summary.review_count if summary is not None else 0
+    rating_sum = summary.rating_sum if summary is not None else 0
+    return {
+        "average_rating": average_rating(review_count, rating_sum),
+        "total_reviews": review_count,
+        "histogram": {star: getattr(summary, f"stars_{star}") if summary is not None else 0 for star in STARS},
+        "categories": [
+            {
+                "category_name": category.category_name,
+                "average_rating": average_rating(category.review_count, category.rating_sum),
+                "total_reviews": category.review_count,
+            }
+            for category in categories
+        ],
+    }
+
+
+def rebuild_rating_summaries(db: Session) -> Set[int]:
+    """
+    Recompute every summary row from the reviews and correct the activities'
+    average_rating / total_reviews.
+
+    Runs inside the caller's transaction (readers keep seeing the old rows
+    until it commits). Returns the ids of activities whose average_rating or
+    total_reviews changed, so the caller can refresh their facets and search
+    documents.
+    """
+    db.query(RatingCategorySummary).delete(synchronize_session=False)
+    db.query(RatingSummary).delete(synchronize_session=False)
+
+    stars = [func.sum(case((Review.rating == star, 1), else_=0)) for star in STARS]
+    for scope, key in ((ACTIVITY, Review.activity_id), (VENDOR, Review.vendor_id)):
+        db.execute(insert(RatingSummary).from_select(
+            ["scope", "scope_id", *_COUNTERS],
+            select(literal(scope), key, func.count(Review.id), func.sum(Review.rating), *stars).group_by(key),
+        ))
+        db.execute(insert(RatingCategorySummary).from_select(
+            ["scope", "scope_id", "category_name", "review_count", "rating_sum"],
+            select(
+                literal(scope), key, ReviewCategory.category_name,
+                func.count(ReviewCategory.id), func.sum(ReviewCategory.rating),
+            ).join(Review, Review.id == ReviewCategory.review_id).group_by(key, ReviewCategory.category_name),
+        ))
+
+    totals = {
+        scope_id: (review_count, rating_sum)
+        for scope_id, review_count, rating_sum in db.query(
+            RatingSummary.scope_id, RatingSummary.review_count, RatingSummary.rating_sum
+        ).filter(RatingSummary.scope == ACTIVITY)
+    }
+    changed: List[Dict[str, Any]] = []
+    for activity_id, stored_average, stored_count in db.query(
+        Activity.id, Activity.average_rating, Activity.total_reviews
+    ):
+        review_count, rating_sum = totals.get(activity_id, (0, 0))
+        average = average_rating(review_count, rating_sum)
+        if (stored_count or 0) != review_count or float(stored_average or 0) != average:
+            changed.append({"id": activity_id, "average_rating": average, "total_reviews": review_count})
+    if changed:
+        db.bulk_update_mappings(Activity, changed)
+    return {row["id"] for row in changed}
+
@@ -0,0 +1,92 @@
+"""Batch loaders that assemble review listings in a fixed number of queries."""
+
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+
+from app.models import Activity, Review, ReviewCategory, ReviewImage, User
+from app.schemas.review import ReviewResponse
+from app.utils.pagination import SortKey
+
+REVIEW_SORTS = ("helpful", "recent", "rating")
+
+# Every sort ends in created_at and id, newest first, so keys are unique for
+# keyset cursors. Each has a matching (activity_id, ...) index on reviews.
+# Inline literal (not a bind parameter) so the expression index matches.
+_HELPFUL = ("helpful_count", func.coalesce(Review.helpful_count, literal_column("0")), True)
+_RECENT = [("created_at", Review.created_at, True), ("id", Review.id, True)]
+
+
+def review_sort_keys(sort_by: str) -> List[SortKey]:
+    """Sort keys of an activity's review list: helpful (default), recent or rating."""
+    if sort_by == "recent":
+        return list(_RECENT)
+    if sort_by == "rating":
+        return [("rating", Review.rating, True)] + _RECENT
+    return [_HELPFUL] + _RECENT
+
+
+def _by_review(db: Session, model, review_ids: List[int]) -> Dict[int, list]:
+    """Map review id -> its ``model`` rows (images or category ratings) in id order."""
+    result: Dict[int, list] = {}
+    if review_ids:
+        rows = db.query(model).filter(model.review_id.in_(review_ids)).order_by(model.id).all()
+        for row in rows:
+            result.setdefault(row.review_id, []).append(row)
+    return result
+
+
+def user_names(db: Session, user_ids) -> Dict[int, str]:
+    """Map user id -> full name."""
+    ids = list(set(user_ids))
+    if not ids:
+        return {}
+    return dict(db.query(User.id, User.full_name).filter(User.id.in_(ids)).all())
+
+
+def activity_titles(db: Session, activity_ids) -> Dict[int, str]:
+    """Map activity id -> title."""
+    ids = list(set(activity_ids))
+    if not ids:
+        return {}
+    return dict(db.query(Activity.id, Activity.title).filter(Activity.id.in_(ids)).all())
+
+
+def hydrate_reviews(
+    db: Session,
+    reviews: Sequence[Review],
+    names: Optional[Dict[int, str]] = None,
+) -> List[ReviewResponse]:
+    """
+    Build ReviewResponses for a page of reviews.
+
+    Authors, images and category ratings are each fetched with one IN query
+    across the page; pass ``names`` (user id -> name) when the authors are
+    already known, e.g. the current user's own reviews.
+    """
+    review_ids = [review.id for review in reviews]
+    if names is None:
+        names = user_names(db, [review.user_id for review in reviews])
+    images = _by_review(db, ReviewImage, review_ids)
+    category_ratings = _by_review(db, ReviewCategory, review_ids)
+
+    return [
+        ReviewResponse(
+            id=review.id,
+            user={
+                "id": review.user_id,
+                "name": names.get(review.user_id),
+                "avatar": None  # Could add avatar URL if we had it
+            },
+            rating=review.rating,
+            title=review.title,
+            comment=review.comment,
+            is_verified_booking=review.is_verified_booking,
+            helpful_count=review.helpful_count,
+            created_at=review.created_at,
+            images=images.get(review.id, []),
+            category_ratings=category_ratings.get(review.id, [])
+        )
+        for review in reviews
+    ]
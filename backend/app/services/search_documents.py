@@ -0,0 +1,202 @@
+"""Denormalized search listing cards, one per activity and display language.
+
+A search page used to select activities, then hydrate primary images,
+categories, destinations and translations for the page (see
+app.services.activity_loader.hydrate_activity_cards). ``activity_search_documents``
+stores the finished card per (activity, language) together with the filter
+and sort keys, so /activities/search filters, orders and renders a page from
+that one table.
+
+Rows are refreshed inside the transaction of every write that changes a card
+or sort value (activity, review, status and booking-count writes), next to
+the facet refresh; rebuild_search_index.py rebuilds them all after seed,
+translation and import scripts.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Activity, ActivityCategory, ActivityDestination, ActivityImage, ActivitySearchDocument,
+    ActivityTranslation, Category, CategoryTranslation, Destination, DestinationTranslation, Vendor
+)
+from app.schemas.activity import ActivityResponse
+from app.utils.brands import brand_for_vendor
+from app.utils.translation import SUPPORTED_LANGUAGES, load_translations
+
+_UPSERT_CHUNK = 500
+# Activities assembled per pass of a full rebuild, to bound memory.
+_BATCH = 1000
+
+
+def _image(image: ActivityImage) -> Dict[str, Any]:
+    return {
+        "id": image.id,
+        "url": image.url,
+        "alt_text": image.alt_text,
+        "caption": image.caption,
+        "is_primary": bool(image.is_primary),
+        "is_hero": bool(image.is_hero),
+    }
+
+
+def _category(category: Category, name: str) -> Dict[str, Any]:
+    return {"id": category.id, "name": name, "slug": category.slug, "icon": category.icon}
+
+
+def _destination(destination: Destination, name: str) -> Dict[str, Any]:
+    return {
+        "id": destination.id,
+        "name": name,
+        "slug": destination.slug,
+        "country": destination.country,
+        "image_url": destination.image_url,
+        "is_featured": bool(destination.is_featured),
+    }
+
+
+def _translated_name(translations: Dict[int, Any], item) -> str:
+    translation = translations.get(item.id)
+    return translation.name if translation and translation.name else item.name
+
+
+def _documents(db: Session, activity_ids: List[int]) -> List[Dict[str, Any]]:
+    """Document rows, in every supported language, for one batch of activities."""
+    activities = db.query(Activity, Vendor.company_name).join(
+        Vendor, Vendor.id == Activity.vendor_id
+    ).filter(Activity.id.in_(activity_ids)).all()
+    if not activities:
+        return []
+
+    primary_images: Dict[int, ActivityImage] = {}
+    for image in db.query(ActivityImage).filter(
+        ActivityImage.activity_id.in_(activity_ids),
+        ActivityImage.is_primary == True
+    ).order_by(ActivityImage.order_index, ActivityImage.id):
+        primary_images.setdefault(image.activity_id, image)
+
+    categories: Dict[int, List[Category]] = {}
+    for activity_id, category in db.query(ActivityCategory.activity_id, Category).join(
+        Category, Category.id == ActivityCategory.category_id
+    ).filter(ActivityCategory.activity_id.in_(activity_ids)).order_by(Category.order_index, Category.id):
+        categories.setdefault(activity_id, []).append(category)
+
+    destinations: Dict[int, List[Destination]] = {}
+    for activity_id, destination in db.query(ActivityDestination.activity_id, Destination).join(
+        Destination, Destination.id == ActivityDestination.destination_id
+    ).filter(ActivityDestination.activity_id.in_(activity_ids)).order_by(Destination.name, Destination.id):
+        destinations.setdefault(activity_id, []).append(destination)
+
+    category_ids = {c.id for linked in categories.values() for c in linked}
+    destination_ids = {d.id for linked in destinations.values() for d in linked}
+
+    rows = []
+    for language in SUPPORTED_LANGUAGES:
+        if language == 'en':
+            activity_translations = category_translations = destination_translations = {}
+        else:
+            # Read the tables directly: the translation store may not have
+            # seen this transaction's writes yet.
+            activity_translations = load_translations(db, ActivityTranslation, language, activity_ids)
+            category_translations = load_translations(db, CategoryTranslation, language, category_ids)
+            destination_translations = load_translations(db, DestinationTranslation, language, destination_ids)
+
+        for activity, company_name in activities:
+            translation = activity_translations.get(activity.id)
+            image = primary_images.get(activity.id)
+            linked_categories = categories.get(activity.id, [])
+            linked_destinations = destinations.get(activity.id, [])
+            rows.append({
+                "activity_id": activity.id,
+                "language": language,
+                "title": (translation and translation.title) or activity.title,
+                "slug": activity.slug,
+                "short_description": (translation and translation.short_description) or activity.short_description,
+                "price_adult": activity.price_adult,
+                "price_child": activity.price_child,
+                "duration_minutes": activity.duration_minutes,
+                "average_rating": activity.average_rating or 0,
+                "total_reviews": activity.total_reviews or 0,
+                "is_bestseller": bool(activity.is_bestseller),
+                "is_skip_the_line": bool(activity.is_skip_the_line),
+                "is_active": bool(activity.is_active),
+                "is_available": bool(activity.is_available),
+                "free_cancellation_hours": activity.free_cancellation_hours or 0,
+                "languages": list(activity.languages or []),
+                "primary_image": _image(image) if image is not None else None,
+                "categories": [_category(c, _translated_name(category_translations, c)) for c in linked_categories],
+                "destinations": [
+                    _destination(d, _translated_name(destination_translations, d)) for d in linked_destinations
+                ],
+                "vendor_id": activity.vendor_id,
+                "brand": brand_for_vendor(company_name),
+                "category_ids": sorted({c.id for c in linked_categories}),
+                "destination_ids": sorted({d.id for d in linked_destinations}),
+                "instant_confirmation": bool(activity.instant_confirmation),
+                "total_bookings": activity.total_bookings or 0,
+            })
+    return rows
+
+
+def refresh_search_documents(db: Session, activity_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Rebuild the search documents of the given activities (or all if None).
+
+    Flushes pending changes first and upserts one row per supported language
+    inside the caller's transaction; the caller commits. Returns the number
+    of rows written.
+    """
+    db.flush()
+
+    if activity_ids is None:
+        ids = [activity_id for (activity_id,) in db.query(Activity.id).order_by(Activity.id)]
+    else:
+        ids = sorted(set(activity_ids))
+    if not ids:
+        return 0
+
+    written = 0
+    for batch_start in range(0, len(ids), _BATCH):
+        rows = _documents(db, ids[batch_start:batch_start + _BATCH])
+        for start in range(0, len(rows), _UPSERT_CHUNK):
+            stmt = insert(ActivitySearchDocument).values(rows[start:start + _UPSERT_CHUNK])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ActivitySearchDocument.activity_id, ActivitySearchDocument.language],
+                set_={
+                    **{key: stmt.excluded[key] for key in rows[0] if key not in ("activity_id", "language")},
+                    "updated_at": func.now(),
+                },
+            )
+            db.execute(stmt)
+        written += len(rows)
+    return written
+
+
+def document_cards(documents: Sequence[ActivitySearchDocument]) -> List[ActivityResponse]:
+    """Listing-card responses for a page of search documents, in order."""
+    return [
+        ActivityResponse(
+            id=document.activity_id,
+            title=document.title,
+            slug=document.slug,
+            short_description=document.short_description,
+            price_adult=document.price_adult,
+            price_child=document.price_child,
+            duration_minutes=document.duration_minutes,
+            average_rating=float(document.average_rating) if document.average_rating else 0,
+            total_reviews=document.total_reviews,
+            is_bestseller=document.is_bestseller,
+            is_skip_the_line=document.is_skip_the_line,
+            is_active=document.is_active,
+            is_available=document.is_available,
+            free_cancellation_hours=document.free_cancellation_hours,
+            languages=document.languages,
+            primary_image=document.primary_image,
+            categories=document.categories,
+            destinations=document.destinations,
+        )
+        for document in documents
+    ]
@@ -0,0 +1,111 @@
+"""Multilingual full-text search index for activities.
+
+Each activity has one row in ``activity_search_index`` holding all of its
+searchable text across languages. Matching is an OR of two GIN-indexed
+predicates: a tsvector match (word search + ranking) and a pg_trgm substring
+match on the raw document, which covers CJK queries like 桂林 / 美食 that the
+``simple`` parser does not split into words.
+
+The index is maintained on write: activity endpoints call
+``refresh_search_index`` for the ids they touched, and rebuild_search_index.py
+rebuilds everything after seed/translation scripts.
+"""
+
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import func, literal_column, or_, text
+from sqlalchemy.orm import Query, Session
+
+from app.models import Activity
+from app.models.search import ActivitySearchIndex
+
+# Language-agnostic parser: no stemming or stop words, so zh/es/fr text is
+# indexed as written.
+TEXT_SEARCH_CONFIG = "simple"
+
+_REFRESH_SQL = """
+WITH src AS (
+    SELECT
+        a.id AS activity_id,
+        concat_ws(E'\\n', a.title,
+            (SELECT string_agg(t.title, E'\\n') FROM activity_translations t
+             WHERE t.activity_id = a.id)) AS titles,
+        concat_ws(E'\\n',
+            (SELECT string_agg(concat_ws(E'\\n', d.name,
+                (SELECT string_agg(dt.name, E'\\n') FROM destination_translations dt
+                 WHERE dt.destination_id = d.id)), E'\\n')
+             FROM activity_destinations ad JOIN destinations d ON d.id = ad.destination_id
+             WHERE ad.activity_id = a.id),
+            (SELECT string_agg(concat_ws(E'\\n', c.name,
+                (SELECT string_agg(ct.name, E'\\n') FROM category_translations ct
+                 WHERE ct.category_id = c.id)), E'\\n')
+             FROM activity_categories ac JOIN categories c ON c.id = ac.category_id
+             WHERE ac.activity_id = a.id)) AS names,
+        concat_ws(E'\\n', a.short_description, a.description,
+            (SELECT string_agg(concat_ws(E'\\n', t.short_description, t.description), E'\\n')
+             FROM activity_translations t WHERE t.activity_id = a.id)) AS bodies
+    FROM activities a
+    {where}
+)
+INSERT INTO activity_search_index (activity_id, document, search_vector, updated_at)
+SELECT
+    activity_id,
+    concat_ws(E'\\n', titles, names, bodies),
+    setweight(to_tsvector(CAST(:config AS regconfig), titles), 'A')
+        || setweight(to_tsvector(CAST(:config AS regconfig), names), 'B')
+        || setweight(to_tsvector(CAST(:config AS regconfig), bodies), 'C'),
+    now()
+FROM src
+ON CONFLICT (activity_id) DO UPDATE SET
+    document = EXCLUDED.document,
+    search_vector = EXCLUDED.search_vector,
+    updated_at = EXCLUDED.updated_at
+"""
+
+
+def refresh_search_index(db: Session, activity_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Rebuild search rows for the given activities (or all activities if None).
+
+    Runs as a single INSERT ... SELECT ... ON CONFLICT statement inside the
+    caller's transaction; the caller commits. Returns the number of rows written.
+    """
+    if activity_ids is None:
+        result = db.execute(text(_REFRESH_SQL.format(where="")), {"config": TEXT_SEARCH_CONFIG})
+        return result.rowcount
+
+    ids = sorted(set(activity_ids))
+    if not ids:
+        return 0
+    result = db.execute(
+        text(_REFRESH_SQL.format(where="WHERE a.id = ANY(:ids)")),
+        {"config": TEXT_SEARCH_CONFIG, "ids": ids},
+    )
+    return result.rowcount
+
+
+def apply_text_search(query: Query, q: str, activity_id=Activity.id) -> Tuple[Query, object]:
+    """
+    Restrict an Activity query to rows matching ``q``.
+
+    For a query over a table keyed by activity id (e.g. the search documents),
+    pass that column as ``activity_id``.
+
+    Returns the filtered query and a relevance expression (ts_rank_cd over the
+    weighted vector) usable in ORDER BY.
+    """
+    term = q.strip()
+    # Escape LIKE wildcards so % and _ in the query are treated literally.
+    safe_q = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    tsquery = func.plainto_tsquery(literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"), term)
+
+    query = query.join(
+        ActivitySearchIndex, ActivitySearchIndex.activity_id == activity_id
+    ).filter(
+        or_(
+            ActivitySearchIndex.search_vector.op("@@")(tsquery),
+            ActivitySearchIndex.document.ilike(f"%{safe_q}%", escape="\\"),
+        )
+    )
+    rank = func.ts_rank_cd(ActivitySearchIndex.search_vector, tsquery)
+    return query, rank
@@ -0,0 +1,346 @@
+"""Item-to-item similarity index behind /activities/{id}/similar.
+
+For every activity the top SIMILAR_ACTIVITIES_TOP_K neighbours are
+precomputed into ``activity_similarities`` (two arrays per row, see
+app.models.search.ActivitySimilarity), so the endpoint is one primary-key
+lookup plus batched card hydration.
+
+A neighbour's score combines:
+
+* content: Jaccard overlap of categories and of destinations;
+* co-booking: users who booked both, cosine-normalised by how many users
+  booked each (cancelled and rejected bookings are ignored);
+* co-wishlisting: the same over wishlists;
+* a small popularity term (total_bookings) that breaks ties.
+
+Candidates come from the category/destination posting lists, capped to the
+SIMILAR_ACTIVITIES_POSTING_LIMIT most booked active activities each (a
+large category says little beyond "same category", and without the cap the
+work grows quadratically with category size), plus every co-booked and
+co-wishlisted activity. Each user's SIMILAR_ACTIVITIES_USER_ITEMS most
+recent interactions are counted, for the same reason.
+
+``refresh_similarities(db, ids)`` recomputes the rows of the given
+activities inside the caller's transaction (activity create/update do this).
+rebuild_similarities.py rebuilds everything, or only the activities with
+new bookings/wishlists since a given time.
+"""
+
+import heapq
+import math
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import (
+    Activity, ActivityCategory, ActivityDestination, ActivitySimilarity,
+    Booking, BookingStatus, Wishlist
+)
+
+CATEGORY_WEIGHT = 1.0
+DESTINATION_WEIGHT = 1.5
+CO_BOOKING_WEIGHT = 3.0
+CO_WISHLIST_WEIGHT = 2.0
+POPULARITY_WEIGHT = 0.05
+
+_UPSERT_CHUNK = 500
+_IN_CHUNK = 5000
+
+
+@dataclass
+class SimilarityInputs:
+    """Everything the ranking needs, loaded up front."""
+
+    categories: Dict[int, Tuple[int, ...]] = field(default_factory=dict)
+    destinations: Dict[int, Tuple[int, ...]] = field(default_factory=dict)
+    # Active activities only: activity id -> total_bookings.
+    popularity: Dict[int, int] = field(default_factory=dict)
+    category_postings: Dict[int, List[int]] = field(default_factory=dict)
+    destination_postings: Dict[int, List[int]] = field(default_factory=dict)
+    # user id -> their most recent activities, per source.
+    user_bookings: Dict[int, List[int]] = field(default_factory=dict)
+    user_wishlists: Dict[int, List[int]] = field(default_factory=dict)
+    # activity id -> distinct users, per source.
+    booked_users: Dict[int, int] = field(default_factory=dict)
+    wishlisted_users: Dict[int, int] = field(default_factory=dict)
+
+
+def _co_occurrence(user_items: Dict[int, List[int]], targets: Set[int]) -> Dict[int, Counter]:
+    """target -> other activity -> users who interacted with both."""
+    co: Dict[int, Counter] = defaultdict(Counter)
+    for items in user_items.values():
+        for a in items:
+            if a not in targets:
+                continue
+            counts = co[a]
+            for b in items:
+                if b != a:
+                    counts[b] += 1
+    return co
+
+
+def _jaccard(a: Tuple[int, ...], b: Tuple[int, ...], shared: int) -> float:
+    union = len(a) + len(b) - shared
+    return shared / union if union else 0.0
+
+
+def rank_neighbors(
+    inputs: SimilarityInputs,
+    targets: Iterable[int],
+    top_k: int
+) -> Dict[int, List[Tuple[int, float]]]:
+    """Top ``top_k`` (neighbour id, score) pairs per target, best first."""
+    target_set = set(targets)
+    co_booked = _co_occurrence(inputs.user_bookings, target_set)
+    co_wished = _co_occurrence(inputs.user_wishlists, target_set)
+    booked_users, wished_users = inputs.booked_users, inputs.wishlisted_users
+    max_popularity = math.log1p(max(inputs.popularity.values(), default=0)) or 1.0
+    popularity = inputs.popularity
+
+    ranked: Dict[int, List[Tuple[int, float]]] = {}
+    for a in target_set:
+        a_categories = inputs.categories.get(a, ())
+        a_destinations = inputs.destinations.get(a, ())
+
+        shared_categories = Counter()
+        for category_id in a_categories:
+            shared_categories.update(inputs.category_postings.get(category_id, ()))
+        shared_destinations = Counter()
+        for destination_id in a_destinations:
+            shared_destinations.update(inputs.destination_postings.get(destination_id, ()))
+
+        a_booked = co_booked.get(a, {})
+        a_wished = co_wished.get(a, {})
+        candidates = set(shared_categories) | set(shared_destinations) | set(a_booked) | set(a_wished)
+        candidates.discard(a)
+
+        scores = []
+        for b in candidates:
+            if b not in popularity:
+                continue  # inactive
+            score = POPULARITY_WEIGHT * math.log1p(popularity[b]) / max_popularity
+            if b in shared_categories:
+                score += CATEGORY_WEIGHT * _jaccard(
+                    a_categories, inputs.categories.get(b, ()), shared_categories[b])
+            if b in shared_destinations:
+                score += DESTINATION_WEIGHT * _jaccard(
+                    a_destinations, inputs.destinations.get(b, ()), shared_destinations[b])
+            if b in a_booked:
+                score += CO_BOOKING_WEIGHT * a_booked[b] / math.sqrt(booked_users[a] * booked_users[b])
+            if b in a_wished:
+                score += CO_WISHLIST_WEIGHT * a_wished[b] / math.sqrt(wished_users[a] * wished_users[b])
+            scores.append((score, -b))
+
+        ranked[a] = [(-negative_id, round(score, 6)) for score, negative_id in heapq.nlargest(top_k, scores)]
+    return ranked
+
+
+def _in_chunks(ids: Sequence[int]):
+    for start in range(0, len(ids), _IN_CHUNK):
+        yield ids[start:start + _IN_CHUNK]
+
+
+def _postings(db: Session, link, column, keys: Optional[Set[int]]) -> Dict[int, List[int]]:
+    """Most booked active activities per category/destination, capped."""
+    rank = func.row_number().over(
+        partition_by=column, order_by=(Activity.total_bookings.desc(), Activity.id)
+    ).label("rank")
+    ranked = db.query(column.label("key"), link.activity_id.label("activity_id"), rank).join(
+        Activity, Activity.id == link.activity_id
+    ).filter(Activity.is_active == True)
+    if keys is not None:
+        if not keys:
+            return {}
+        ranked = ranked.filter(column.in_(sorted(keys)))
+    ranked = ranked.subquery()
+
+    postings: Dict[int, List[int]] = defaultdict(list)
+    for key, activity_id in db.query(ranked.c.key, ranked.c.activity_id).filter(
+        ranked.c.rank <= settings.SIMILAR_ACTIVITIES_POSTING_LIMIT
+    ):
+        postings[key].append(activity_id)
+    return postings
+
+
+def _links(db: Session, link, column, activity_ids: Optional[Sequence[int]]) -> Dict[int, Tuple[int, ...]]:
+    grouped: Dict[int, List[int]] = defaultdict(list)
+    query = db.query(link.activity_id, column)
+    chunks = _in_chunks(activity_ids) if activity_ids is not None else [None]
+    for chunk in chunks:
+        rows = query.filter(link.activity_id.in_(chunk)) if chunk is not None else query
+        for activity_id, key in rows:
+            grouped[activity_id].append(key)
+    return {activity_id: tuple(sorted(set(keys))) for activity_id, keys in grouped.items()}
+
+
+def _user_items(db: Session, model, conditions, targets: Optional[Sequence[int]]) -> Dict[int, List[int]]:
+    """user id -> their most recent distinct activities (of users who touched a target)."""
+    query = db.query(
+        model.user_id, model.activity_id, func.max(model.created_at).label("last_at")
+    ).filter(model.user_id.isnot(None), *conditions)
+    if targets is not None:
+        users = db.query(model.user_id).filter(model.activity_id.in_(targets), *conditions).distinct()
+        query = query.filter(model.user_id.in_(users.subquery().select()))
+    rows = query.group_by(model.user_id, model.activity_id).all()
+
+    by_user: Dict[int, List[Tuple[datetime, int]]] = defaultdict(list)
+    for user_id, activity_id, last_at in rows:
+        by_user[user_id].append((last_at or datetime.min, activity_id))
+    limit = settings.SIMILAR_ACTIVITIES_USER_ITEMS
+    return {
+        user_id: [activity_id for _, activity_id in heapq.nlargest(limit, items)]
+        for user_id, items in by_user.items()
+        if len(items) > 1
+    }
+
+
+def _user_counts(db: Session, model, conditions, activity_ids: Optional[Sequence[int]]) -> Dict[int, int]:
+    query = db.query(model.activity_id, func.count(func.distinct(model.user_id))).filter(
+        model.user_id.isnot(None), *conditions
+    ).group_by(model.activity_id)
+    if activity_ids is None:
+        return dict(query.all())
+    counts: Dict[int, int] = {}
+    for chunk in _in_chunks(activity_ids):
+        counts.update(query.filter(model.activity_id.in_(chunk)).all())
+    return counts
+
+
+def load_inputs(db: Session, targets: Optional[Sequence[int]] = None) -> SimilarityInputs:
+    """Load what ranking ``targets`` needs (everything if None)."""
+    booking_conditions = [Booking.status.notin_([BookingStatus.CANCELLED, BookingStatus.REJECTED])]
+    user_bookings = _user_items(db, Booking, booking_conditions, targets)
+    user_wishlists = _user_items(db, Wishlist, [], targets)
+
+    if targets is None:
+        categories = _links(db, ActivityCategory, ActivityCategory.category_id, None)
+        destinations = _links(db, ActivityDestination, ActivityDestination.destination_id, None)
+        category_postings = _postings(db, ActivityCategory, ActivityCategory.category_id, None)
+        destination_postings = _postings(db, ActivityDestination, ActivityDestination.destination_id, None)
+        popularity = dict(db.query(Activity.id, func.coalesce(Activity.total_bookings, 0)).filter(
+            Activity.is_active == True
+        ))
+        co_activities = None
+    else:
+        categories = _links(db, ActivityCategory, ActivityCategory.category_id, targets)
+        destinations = _links(db, ActivityDestination, ActivityDestination.destination_id, targets)
+        category_postings = _postings(
+            db, ActivityCategory, ActivityCategory.category_id,
+            {key for keys in categories.values() for key in keys})
+        destination_postings = _postings(
+            db, ActivityDestination, ActivityDestination.destination_id,
+            {key for keys in destinations.values() for key in keys})
+
+        candidates = {a for posting in category_postings.values() for a in posting}
+        candidates |= {a for posting in destination_postings.values() for a in posting}
+        for items in list(user_bookings.values()) + list(user_wishlists.values()):
+            candidates.update(items)
+        others = sorted(candidates - set(targets))
+        categories.update(_links(db, ActivityCategory, ActivityCategory.category_id, others))
+        destinations.update(_links(db, ActivityDestination, ActivityDestination.destination_id, others))
+        co_activities = sorted(candidates | set(targets))
+        popularity = {}
+        for chunk in _in_chunks(co_activities):
+            popularity.update(db.query(Activity.id, func.coalesce(Activity.total_bookings, 0)).filter(
+                Activity.id.in_(chunk), Activity.is_active == True
+            ))
+
+    return SimilarityInputs(
+        categories=categories,
+        destinations=destinations,
+        popularity=popularity,
+        category_postings=dict(category_postings),
+        destination_postings=dict(destination_postings),
+        user_bookings=user_bookings,
+        user_wishlists=user_wishlists,
+        booked_users=_user_counts(db, Booking, booking_conditions, co_activities),
+        wishlisted_users=_user_counts(db, Wishlist, [], co_activities),
+    )
+
+
+def compute_similarities(
+    db: Session,
+    activity_ids: Optional[Iterable[int]] = None
+) -> Dict[int, List[Tuple[int, float]]]:
+    """Neighbours of the given activities (all activities if None), without storing them."""
+    if activity_ids is None:
+        targets = [activity_id for (activity_id,) in db.query(Activity.id)]
+        inputs = load_inputs(db)
+    else:
+        targets = sorted(set(activity_ids))
+        inputs = load_inputs(db, targets)
+    return rank_neighbors(inputs, targets, settings.SIMILAR_ACTIVITIES_TOP_K)
+
+
+def refresh_similarities(db: Session, activity_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute similarity rows for the given activities (or all activities if None).
+
+    Flushes pending changes first and upserts inside the caller's
+    transaction; the caller commits. Returns the number of rows written.
+    """
+    db.flush()
+    if activity_ids is not None:
+        activity_ids = sorted(set(activity_ids))
+        if not activity_ids:
+            return 0
+
+    rows = [
+        {
+            "activity_id": activity_id,
+            "neighbor_ids": [neighbor_id for neighbor_id, _ in neighbors],
+            "scores": [score for _, score in neighbors],
+        }
+        for activity_id, neighbors in compute_similarities(db, activity_ids).items()
+    ]
+
+    for start in range(0, len(rows), _UPSERT_CHUNK):
+        stmt = insert(ActivitySimilarity).values(rows[start:start + _UPSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ActivitySimilarity.activity_id],
+            set_={
+                "neighbor_ids": stmt.excluded.neighbor_ids,
+                "scores": stmt.excluded.scores,
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+    return len(rows)
+
+
+def activities_with_new_interactions(db: Session, since: datetime) -> List[int]:
+    """
+    Activities whose co-booking/co-wishlist counts may have changed since ``since``:
+    every activity of the users who booked or wishlisted something since then.
+    """
+    user_ids = db.query(Booking.user_id).filter(Booking.created_at >= since).union(
+        db.query(Wishlist.user_id).filter(Wishlist.created_at >= since)
+    ).subquery().select()
+    ids = db.query(Booking.activity_id).filter(Booking.user_id.in_(user_ids)).union(
+        db.query(Wishlist.activity_id).filter(Wishlist.user_id.in_(user_ids))
+    )
+    return sorted(activity_id for (activity_id,) in ids)
+
+
+def similar_activity_ids(db: Session, activity_id: int) -> Optional[List[int]]:
+    """
+    Stored neighbours of an activity, best first (None if the activity does not exist).
+
+    One primary-key lookup; an activity without a row yet (e.g. created
+    before the first rebuild) is ranked on the fly instead. Neighbours may
+    have been deactivated since the row was written; callers filter them.
+    """
+    neighbor_ids = db.query(ActivitySimilarity.neighbor_ids).filter(
+        ActivitySimilarity.activity_id == activity_id
+    ).scalar()
+    if neighbor_ids is not None:
+        return list(neighbor_ids)
+    if db.query(Activity.id).filter(Activity.id == activity_id).scalar() is None:
+        return None
+    return [neighbor_id for neighbor_id, _ in compute_similarities(db, [activity_id]).get(activity_id, [])]
@@ -0,0 +1,234 @@
+"""Incrementally maintained platform statistics.
+
+Write paths call the ``record_*`` helpers before committing, so counters and
+daily rows change atomically with the booking/review/user/activity they
+count. Increments are single ``INSERT ... ON CONFLICT DO UPDATE SET value =
+value + delta`` statements, so concurrent writers never lose updates.
+
+``rollup_stats`` recomputes everything from the source tables. It runs on
+container start and periodically (rollup_stats.py) to pick up rows written
+outside the API (backup restores, seed scripts) and to correct any drift.
+
+Days are UTC; the daily window of get_daily_series ends today.
+"""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Date, case, func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models import Activity, Booking, Review, User, UserRole
+from app.models.stats import DailyStat, PlatformCounter
+
+USERS = "users"
+CUSTOMERS = "customers"
+VENDORS = "vendors"
+ACTIVITIES = "activities"
+ACTIVE_ACTIVITIES = "active_activities"
+BOOKINGS = "bookings"
+REVENUE = "revenue"
+REVIEWS = "reviews"
+RATING_SUM = "rating_sum"
+
+COUNTERS = (
+    USERS, CUSTOMERS, VENDORS, ACTIVITIES, ACTIVE_ACTIVITIES,
+    BOOKINGS, REVENUE, REVIEWS, RATING_SUM,
+)
+
+_ROLE_COUNTERS = {UserRole.CUSTOMER: CUSTOMERS, UserRole.VENDOR: VENDORS}
+
+
+def _today() -> date:
+    return datetime.utcnow().date()
+
+
+def _day_of(value: Optional[datetime]) -> date:
+    return value.date() if value is not None else _today()
+
+
+def _increment_counters(db: Session, **deltas) -> None:
+    rows = [{"name": name, "value": delta} for name, delta in deltas.items() if delta]
+    if not rows:
+        return
+    stmt = insert(PlatformCounter).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[PlatformCounter.name],
+        set_={"value": PlatformCounter.value + stmt.excluded.value, "updated_at": func.now()},
+    ))
+
+
+def _increment_day(db: Session, day: date, **deltas) -> None:
+    deltas = {column: delta for column, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    stmt = insert(DailyStat).values(day=day, **deltas)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[DailyStat.day],
+        set_={
+            **{column: getattr(DailyStat, column) + stmt.excluded[column] for column in deltas},
+            "updated_at": func.now(),
+        },
+    ))
+
+
+def record_user_created(db: Session, role: UserRole) -> None:
+    """Count a new user account."""
+    counters = {USERS: 1}
+    if role in _ROLE_COUNTERS:
+        counters[_ROLE_COUNTERS[role]] = 1
+    _increment_counters(db, **counters)
+    _increment_day(db, _today(), new_users=1)
+
+
+def record_activity_created(db: Session, is_active: bool = True) -> None:
+    """Count a new activity."""
+    _increment_counters(db, **{ACTIVITIES: 1, ACTIVE_ACTIVITIES: 1 if is_active else 0})
+
+
+def record_activity_status(db: Session, is_active: bool) -> None:
+    """Count an activity moving to ``is_active`` (call only when the flag actually changed)."""
+    _increment_counters(db, **{ACTIVE_ACTIVITIES: 1 if is_active else -1})
+
+
+def record_activity_deleted(db: Session, activity: Activity) -> None:
+    """
+    Uncount a hard-deleted activity and the reviews that cascade with it.
+
+    Call before deleting; its reviews are still readable then.
+    """
+    day = func.date(Review.created_at, type_=Date)
+    review_days = db.query(day, func.count(Review.id), func.sum(Review.rating)).filter(
+        Review.activity_id == activity.id
+    ).group_by(day).all()
+    for review_day, count, rating_sum in review_days:
+        _increment_day(db, review_day or _today(), reviews=-count, rating_sum=-rating_sum)
+    _increment_counters(db, **{
+        ACTIVITIES: -1,
+        ACTIVE_ACTIVITIES: -1 if activity.is_active else 0,
+        REVIEWS: -sum(count for _, count, _ in review_days),
+        RATING_SUM: -sum(rating_sum for _, _, rating_sum in review_days),
+    })
+
+
+def record_booking_created(db: Session, total_price: Decimal) -> None:
+    """Count a new booking and its revenue."""
+    _increment_counters(db, **{BOOKINGS: 1, REVENUE: total_price or 0})
+    _increment_day(db, _today(), bookings=1, revenue=total_price or 0)
+
+
+def record_review_created(db: Session, rating: int) -> None:
+    """Count a new review."""
+    _increment_counters(db, **{REVIEWS: 1, RATING_SUM: rating})
+    _increment_day(db, _today(), reviews=1, rating_sum=rating)
+
+
+def record_review_rating_changed(db: Session, review: Review, old_rating: int) -> None:
+    """Move a review's rating contribution from ``old_rating`` to its current rating."""
+    delta = review.rating - old_rating
+    _increment_counters(db, **{RATING_SUM: delta})
+    _increment_day(db, _day_of(review.created_at), rating_sum=delta)
+
+
+def record_review_deleted(db: Session, review: Review) -> None:
+    """Uncount a deleted review on the day it was written."""
+    _increment_counters(db, **{REVIEWS: -1, RATING_SUM: -review.rating})
+    _increment_day(db, _day_of(review.created_at), reviews=-1, rating_sum=-review.rating)
+
+
+def rollup_stats(db: Session, since: Optional[date] = None) -> int:
+    """
+    Recompute every counter, and the daily rows from ``since`` on (all days if None).
+
+    Both tables are locked against concurrent increments for the duration,
+    so a write committing mid-rollup is counted exactly once. The caller
+    commits. Returns the number of daily rows written.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE platform_counters, daily_stats IN SHARE ROW EXCLUSIVE MODE"))
+
+    days: Dict[date, Dict[str, Any]] = {}
+
+    def per_day(model, *columns):
+        day = func.date(model.created_at, type_=Date)
+        query = db.query(day, *columns).group_by(day)
+        if since is not None:
+            query = query.filter(model.created_at >= since)
+        return query.all()
+
+    for day, bookings, revenue in per_day(Booking, func.count(Booking.id), func.sum(Booking.total_price)):
+        days.setdefault(day, {}).update(bookings=bookings, revenue=revenue or 0)
+    for day, reviews, rating_sum in per_day(Review, func.count(Review.id), func.sum(Review.rating)):
+        days.setdefault(day, {}).update(reviews=reviews, rating_sum=rating_sum or 0)
+    for day, new_users in per_day(User, func.count(User.id)):
+        days.setdefault(day, {}).update(new_users=new_users)
+
+    stale = db.query(DailyStat)
+    if since is not None:
+        stale = stale.filter(DailyStat.day >= since)
+    stale.delete(synchronize_session=False)
+    rows = [
+        {"day": day, "bookings": 0, "revenue": 0, "reviews": 0, "rating_sum": 0, "new_users": 0, **values}
+        for day, values in days.items()
+        if day is not None
+    ]
+    if rows:
+        db.execute(insert(DailyStat).values(rows))
+
+    role_counts = dict(db.query(User.role, func.count(User.id)).group_by(User.role).all())
+    activities, active = db.query(
+        func.count(Activity.id), func.sum(case((Activity.is_active == True, 1), else_=0))
+    ).one()
+    bookings, revenue = db.query(func.count(Booking.id), func.sum(Booking.total_price)).one()
+    reviews, rating_sum = db.query(func.count(Review.id), func.sum(Review.rating)).one()
+    totals = {
+        USERS: sum(role_counts.values()),
+        CUSTOMERS: role_counts.get(UserRole.CUSTOMER, 0),
+        VENDORS: role_counts.get(UserRole.VENDOR, 0),
+        ACTIVITIES: activities,
+        ACTIVE_ACTIVITIES: active or 0,
+        BOOKINGS: bookings,
+        REVENUE: revenue or 0,
+        REVIEWS: reviews,
+        RATING_SUM: rating_sum or 0,
+    }
+    stmt = insert(PlatformCounter).values([{"name": name, "value": value} for name, value in totals.items()])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[PlatformCounter.name],
+        set_={"value": stmt.excluded.value, "updated_at": func.now()},
+    ))
+    return len(rows)
+
+
+def get_counters(db: Session) -> Dict[str, Decimal]:
+    """Current value of every counter (0 for counters never written)."""
+    values = dict(db.query(PlatformCounter.name, PlatformCounter.value).all())
+    return {name: values.get(name, Decimal(0)) for name in COUNTERS}
+
+
+def get_window_totals(db: Session, days: int) -> Dict[str, Any]:
+    """Bookings and revenue over the last ``days`` days, today included."""
+    bookings, revenue = db.query(
+        func.coalesce(func.sum(DailyStat.bookings), 0), func.coalesce(func.sum(DailyStat.revenue), 0)
+    ).filter(DailyStat.day > _today() - timedelta(days=days)).one()
+    return {"bookings": int(bookings), "revenue": revenue}
+
+
+def get_daily_series(db: Session, days: int) -> List[Dict[str, Any]]:
+    """One entry per day for the last ``days`` days (oldest first), zero-filled."""
+    start = _today() - timedelta(days=days - 1)
+    rows = {row.day: row for row in db.query(DailyStat).filter(DailyStat.day >= start).all()}
+    series = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = rows.get(day)
+        series.append({
+            "date": day.isoformat(),
+            "bookings": row.bookings if row else 0,
+            "revenue": float(row.revenue) if row else 0.0,
+            "reviews": row.reviews if row else 0,
+            "new_users": row.new_users if row else 0,
+        })
+    return series
@@ -0,0 +1,29 @@
+"""Customer-facing display brands derived from vendors."""
+
+from typing import Optional
+
+# Every activity is presented to customers under one of three display brands,
+# derived from the underlying vendor: Finuo's own activities keep their brand,
+# Girafe activities map to "Finuo-Giraffe", and everything else (all other
+# vendors) is clubbed under "Nordic Adventure".
+BRAND_FINUO = "Finuo"
+BRAND_GIRAFFE = "Finuo-Giraffe"
+BRAND_NORDIC = "Nordic Adventure"
+
+# Negative sentinel "vendor_id" values let the providers filter select a whole
+# brand group (real vendor ids are positive).
+BRAND_SENTINELS = {-2: BRAND_FINUO, -3: BRAND_GIRAFFE, -1: BRAND_NORDIC}
+
+
+def brand_for_vendor(company_name: Optional[str]) -> str:
+    """Map a real vendor company name to its customer-facing display brand."""
+    name = (company_name or "").lower()
+    if "girafe" in name or "giraffe" in name:
+        return BRAND_GIRAFFE
+    if name.startswith("finuo"):
+        return BRAND_FINUO
+    return BRAND_NORDIC
+
+
+# Stable display order of the brand groups as (sentinel id, brand).
+BRAND_ORDER = [(-2, BRAND_FINUO), (-3, BRAND_GIRAFFE), (-1, BRAND_NORDIC)]
@@ -0,0 +1,187 @@
+"""Offset and keyset (cursor) pagination helpers for list endpoints."""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, literal, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+# (name, expression, descending). Expressions must be non-NULL (wrap nullable
+# columns in coalesce) and the last key must be unique, normally the primary key.
+SortKey = Tuple[str, Any, bool]
+
+
+class Page:
+    """One page of results plus the metadata PaginatedResponse.from_page needs."""
+
+    def __init__(self, items: List[Any], page: int, per_page: int, total: int,
+                 has_next: bool, next_cursor: Optional[str], estimated: bool, cursor_mode: bool):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.has_next = has_next
+        self.next_cursor = next_cursor
+        self.estimated = estimated
+        self.cursor_mode = cursor_mode
+
+
+def _encode_value(value: Any) -> Any:
+    """Tag values JSON cannot round-trip so the cursor decodes to the same type."""
+    if isinstance(value, Decimal):
+        return {"d": str(value)}
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "d" in value:
+            return Decimal(value["d"])
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "date" in value:
+            return date.fromisoformat(value["date"])
+    return value
+
+
+def encode_cursor(sort_keys: Sequence[SortKey], values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row into an opaque cursor."""
+    payload = {
+        "k": [name for name, _, _ in sort_keys],
+        "v": [_encode_value(value) for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_keys: Sequence[SortKey]) -> List[Any]:
+    """Decode a cursor produced by encode_cursor for the same sort order."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_value(value) for value in payload["v"]]
+        names = payload["k"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    if names != [name for name, _, _ in sort_keys] or len(values) != len(sort_keys):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not match the requested sort order"
+        )
+    return values
+
+
+def _after(sort_keys: Sequence[SortKey], values: Sequence[Any]):
+    """
+    Row-value "strictly after" predicate for a mixed-direction sort.
+
+    Expands (k1, k2, k3) > (v1, v2, v3) into
+    k1 > v1 OR (k1 = v1 AND k2 > v2) OR (k1 = v1 AND k2 = v2 AND k3 > v3),
+    flipping the comparison for descending keys.
+    """
+    # Bind values explicitly: SQLAlchemy refuses < / > against bare True/False.
+    bound = [literal(value, expression.type) for (_, expression, _), value in zip(sort_keys, values)]
+    clauses = []
+    for i, (_, expression, descending) in enumerate(sort_keys):
+        equal_prefix = [sort_keys[j][1] == bound[j] for j in range(i)]
+        step = expression < bound[i] if descending else expression > bound[i]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON) <statement>``, executable on any PostgreSQL driver."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    # Compiled by the executing dialect, so bound parameters come out in its
+    # own style (pyformat for psycopg2, positional $n for asyncpg).
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def estimate_count(db: Session, query: Query) -> Optional[int]:
+    """
+    Planner row estimate for ``query`` from EXPLAIN, without executing it.
+
+    Returns None on databases other than PostgreSQL so callers can fall back
+    to an exact count.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+
+    plan = db.execute(_Explain(query.statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def paginate(
+    db: Session,
+    query: Query,
+    sort_keys: Sequence[SortKey],
+    page: int,
+    per_page: int,
+    cursor: Optional[str] = None,
+    estimate_total: bool = False,
+) -> Page:
+    """
+    Order ``query`` by ``sort_keys`` and return one page.
+
+    With a ``cursor`` the page starts right after the row the cursor was taken
+    from (keyset pagination, no OFFSET scan); otherwise ``page`` is used as a
+    regular offset. Every page carries a ``next_cursor`` so clients can switch
+    to cursor mode after the first request. ``estimate_total`` replaces the
+    exact COUNT with the planner's estimate.
+    """
+    total = estimate_count(db, query) if estimate_total else None
+    estimated = total is not None
+    if total is None:
+        total = query.count()
+
+    paged = query.add_columns(
+        *[expression.label(f"_sort_{i}") for i, (_, expression, _) in enumerate(sort_keys)]
+    )
+    if cursor:
+        paged = paged.filter(_after(sort_keys, decode_cursor(cursor, sort_keys)))
+    paged = paged.order_by(
+        *[expression.desc() if descending else expression.asc() for _, expression, descending in sort_keys]
+    )
+    if not cursor:
+        paged = paged.offset((page - 1) * per_page)
+    rows = paged.limit(per_page + 1).all()
+
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = encode_cursor(sort_keys, list(rows[-1][1:])) if has_next else None
+
+    return Page(
+        items=[row[0] for row in rows],
+        page=page,
+        per_page=per_page,
+        total=total,
+        has_next=has_next,
+        next_cursor=next_cursor,
+        estimated=estimated,
+        cursor_mode=bool(cursor),
+    )
@@ -1,7 +1,13 @@
 """Translation utility functions for multi-language support."""
 
-from typing import Optional, Any, Dict, List
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from typing import Optional, Any, Dict, List, Iterable
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.models import (
     Activity, ActivityTranslation,
     ActivityHighlight, ActivityHighlightTranslation,
@@ -15,11 +21,162 @@ from app.models import (
     Destination, DestinationTranslation
 )
 
+logger = logging.getLogger(__name__)
 
-def get_translated_activity(activity: Activity, language: str, db: Session) -> Dict[str, Any]:
+SUPPORTED_LANGUAGES = ('en', 'es', 'zh', 'fr')
+
+
+# Foreign key column each translation model hangs off, used for batch loading.
+TRANSLATION_KEYS = {
+    ActivityTranslation: ActivityTranslation.activity_id,
+    ActivityHighlightTranslation: ActivityHighlightTranslation.highlight_id,
+    ActivityIncludeTranslation: ActivityIncludeTranslation.include_id,
+    ActivityFAQTranslation: ActivityFAQTranslation.faq_id,
+    ActivityTimelineTranslation: ActivityTimelineTranslation.timeline_id,
+    ActivityPricingTierTranslation: ActivityPricingTierTranslation.pricing_tier_id,
+    ActivityAddOnTranslation: ActivityAddOnTranslation.addon_id,
+    MeetingPointTranslation: MeetingPointTranslation.meeting_point_id,
+    CategoryTranslation: CategoryTranslation.category_id,
+    DestinationTranslation: DestinationTranslation.destination_id,
+}
+
+
+def load_translations(db: Session, model, language: str, ids: Iterable[int]) -> Dict[int, Any]:
+    """
+    Load the translation rows of one model for many parent ids in a single query.
+
+    Returns a dict keyed by parent id (activity_id, highlight_id, ...); parents
+    without a translation in ``language`` are simply absent.
+    """
+    ids = list(set(ids))
+    if not ids:
+        return {}
+    key = TRANSLATION_KEYS[model]
+    rows = db.query(model).filter(key.in_(ids), model.language == language).all()
+    return {getattr(row, key.key): row for row in rows}
+
+
+class TranslationStore:
+    """
+    In-process cache of every translation row, keyed by (model, parent id, language).
+
+    A language is loaded in bulk (one query per translation table) the first
+    time it is requested and kept for ``ttl_seconds``. Rows are copied into
+    plain namespaces so they outlive the session that loaded them.
+
+    Translations are written by offline scripts (scripts/media/apply_zh.py,
+    seed_*.py), so other processes are covered by the TTL, the
+    /admin/translations/reload endpoint and a restart; ORM writes in this
+    process invalidate the affected language on commit.
+    """
+
+    def __init__(self, ttl_seconds: int = 300, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._languages: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, language: str) -> Dict[Any, Dict[int, SimpleNamespace]]:
+        tables = {}
+        for model, key in TRANSLATION_KEYS.items():
+            columns = [attr.key for attr in inspect(model).column_attrs]
+            rows = {}
+            for row in db.query(model).filter(model.language == language).all():
+                rows[getattr(row, key.key)] = SimpleNamespace(**{c: getattr(row, c) for c in columns})
+            tables[model] = rows
+        return tables
+
+    def load(self, db: Session, language: str) -> None:
+        """(Re)load every translation table for ``language``."""
+        tables = self._load(db, language)
+        with self._lock:
+            self._languages[language] = (time.monotonic() + self.ttl_seconds, tables)
+        logger.info(
+            "Loaded %s translations for '%s'",
+            sum(len(rows) for rows in tables.values()), language
+        )
+
+    def get(self, db: Session, model, language: str) -> Dict[int, SimpleNamespace]:
+        """All ``model`` translations for ``language``, keyed by parent id."""
+        entry = self._languages.get(language)
+        if entry is None or entry[0] < time.monotonic():
+            self.load(db, language)
+            entry = self._languages[language]
+        return entry[1][model]
+
+    def invalidate(self, language: Optional[str] = None) -> None:
+        """Drop one language (or all); the next lookup reloads it."""
+        with self._lock:
+            if language is None:
+                self._languages.clear()
+            else:
+                self._languages.pop(language, None)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "languages": {
+                language: {
+                    "rows": sum(len(rows) for rows in tables.values()),
+                    "expires_in_seconds": max(0, round(expires_at - now)),
+                }
+                for language, (expires_at, tables) in list(self._languages.items())
+            },
+        }
+
+
+translation_store = TranslationStore(
+    ttl_seconds=settings.TRANSLATION_CACHE_TTL_SECONDS,
+    enabled=settings.TRANSLATION_CACHE_ENABLED
+)
+
+
+def warm_translation_store(db: Session, languages: Iterable[str] = ('es', 'zh', 'fr')) -> None:
+    """Load the translation store for all non-English languages (app startup)."""
+    if not translation_store.enabled:
+        return
+    for language in languages:
+        translation_store.load(db, language)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_translation_writes(session, flush_context):
+    """Remember which languages this transaction touched."""
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if type(instance) in TRANSLATION_KEYS:
+            session.info.setdefault("translation_languages", set()).add(instance.language)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_translation_writes(session):
+    for language in session.info.pop("translation_languages", ()):
+        translation_store.invalidate(language)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_translation_writes(session):
+    session.info.pop("translation_languages", None)
+
+
+def _translations_for(db: Session, model, language: str, ids: Iterable[int]) -> Dict[int, Any]:
+    """Translations of ``model`` for ``ids``: from the store, or one batched query if it is off."""
+    if translation_store.enabled:
+        return translation_store.get(db, model, language)
+    return load_translations(db, model, language, ids)
+
+
+def get_translated_activity(
+    activity: Activity,
+    language: str,
+    db: Session,
+    translations: Optional[Dict[int, ActivityTranslation]] = None
+) -> Dict[str, Any]:
     """
     Get translated activity data.
     If translation doesn't exist for the language, falls back to English (original data).
+    Pass ``translations`` (parent id -> row) to use preloaded rows instead of the store.
     """
     if language == 'en':
         # English is the default, no translation needed
@@ -34,10 +191,9 @@ def get_translated_activity(activity: Activity, language: str, db: Session) -> D
         }
 
     # Fetch translation for the specified language
-    translation = db.query(ActivityTranslation).filter(
-        ActivityTranslation.activity_id == activity.id,
-        ActivityTranslation.language == language
-    ).first()
+    if translations is None:
+        translations = _translations_for(db, ActivityTranslation, language, [activity.id])
+    translation = translations.get(activity.id)
 
     if translation:
         return {
@@ -62,17 +218,22 @@ def get_translated_activity(activity: Activity, language: str, db: Session) -> D
     }
 
 
-def get_translated_highlights(highlights: List[ActivityHighlight], language: str, db: Session) -> List[Dict[str, Any]]:
+def get_translated_highlights(
+    highlights: List[ActivityHighlight],
+    language: str,
+    db: Session,
+    translations: Optional[Dict[int, ActivityHighlightTranslation]] = None
+) -> List[Dict[str, Any]]:
     """Get translated highlights."""
     if language == 'en':
         return [{'id': h.id, 'text': h.text, 'order_index': h.order_index} for h in highlights]
 
+    if translations is None:
+        translations = _translations_for(db, ActivityHighlightTranslation, language, [highlight.id for highlight in highlights])
+
     result = []
     for highlight in highlights:
-        translation = db.query(ActivityHighlightTranslation).filter(
-            ActivityHighlightTranslation.highlight_id == highlight.id,
-            ActivityHighlightTranslation.language == language
-        ).first()
+        translation = translations.get(highlight.id)
 
         result.append({
             'id': highlight.id,
@@ -84,7 +245,12 @@ def get_translated_highlights(highlights: List[ActivityHighlight], language: str
     return [h for h in result if h['text'] is not None]
 
 
-def get_translated_includes(includes: List[ActivityInclude], language: str, db: Session) -> List[Dict[str, Any]]:
+def get_translated_includes(
+    includes: List[ActivityInclude],
+    language: str,
+    db: Session,
+    translations: Optional[Dict[int, ActivityIncludeTranslation]] = None
+) -> List[Dict[str, Any]]:
     """Get translated includes/excludes."""
     if language == 'en':
         return [{
@@ -94,12 +260,12 @@ def get_translated_includes(includes: List[ActivityInclude], language: str, db:
             'order_index': i.order_index
         } for i in includes]
 
+    if translations is None:
+        translations = _translations_for(db, ActivityIncludeTranslation, language, [include.id for include in includes])
+
     result = []
     for include in includes:
-        translation = db.query(ActivityIncludeTranslation).filter(
-            ActivityIncludeTranslation.include_id == include.id,
-            ActivityIncludeTranslation.language == language
-        ).first()
+        translation = translations.get(include.id)
 
         if translation and translation.item:
             result.append({
@@ -112,7 +278,12 @@ def get_translated_includes(includes: List[ActivityInclude], language: str, db:
     return result
 
 
-def get_translated_faqs(faqs: List[ActivityFAQ], language: str, db: Session) -> List[Dict[str, Any]]:
+def get_translated_faqs(
+    faqs: List[ActivityFAQ],
+    language: str,
+    db: Session,
+    translations: Optional[Dict[int, ActivityFAQTranslation]] = None
+) -> List[Dict[str, Any]]:
     """Get translated FAQs."""
     if language == 'en':
         return [{
@@ -122,12 +293,12 @@ def get_translated_faqs(faqs: List[ActivityFAQ], language: str, db: Session) ->
             'order_index': f.order_index
         } for f in faqs]
 
+    if translations is None:
+        translations = _translations_for(db, ActivityFAQTranslation, language, [faq.id for faq in faqs])
+
     result = []
     for faq in faqs:
-        translation = db.query(ActivityFAQTranslation).filter(
-            ActivityFAQTranslation.faq_id == faq.id,
-            ActivityFAQTranslation.language == language
-        ).first()
+        translation = translations.get(faq.id)
 
         if translation and translation.question and translation.answer:
             result.append({
@@ -140,7 +311,12 @@ def get_translated_faqs(faqs: List[ActivityFAQ], language: str, db: Session) ->
     return result
 
 
-def get_translated_timelines(timelines: List[ActivityTimeline], language: str, db: Session) -> List[Dict[str, Any]]:
+def get_translated_timelines(
+    timelines: List[ActivityTimeline],
+    language: str,
+    db: Session,
+    translations: Optional[Dict[int, ActivityTimelineTranslation]] = None
+) -> List[Dict[str, Any]]:
     """Get translated timelines."""
     if language == 'en':
         return [{
@@ -154,12 +330,12 @@ def get_translated_timelines(timelines: List[ActivityTimeline], language: str, d
             'sections': t.sections
         } for t in timelines]
 
+    if translations is None:
+        translations = _translations_for(db, ActivityTimelineTranslation, language, [timeline.id for timeline in timelines])
+
     result = []
     for timeline in timelines:
-        translation = db.query(ActivityTimelineTranslation).filter(
-            ActivityTimelineTranslation.timeline_id == timeline.id,
-            ActivityTimelineTranslation.language == language
-        ).first()
+        translation = translations.get(timeline.id)
 
         if translation and translation.title:
             result.append({
@@ -176,7 +352,12 @@ def get_translated_timelines(timelines: List[ActivityTimeline], language: str, d
     return result
 
 
-def get_translated_pricing_tiers(tiers: List[ActivityPricingTier], language: str, db: Session) -> List[Dict[str, Any]]:
+def get_translated_pricing_tiers(
+    tiers: List[ActivityPricingTier],
+    language: str,
+    db: Session,
+    translations: Optional[Dict[int, ActivityPricingTierTranslation]] = None
+) -> List[Dict[str, Any]]:
     """Get translated pricing tiers."""
     if language == 'en':
         return [{
@@ -189,12 +370,12 @@ def get_translated_pricing_tiers(tiers: List[ActivityPricingTier], language: str
             'is_active': t.is_active
         } for t in tiers]
 
+    if translations is None:
+        translations = _translations_for(db, ActivityPricingTierTranslation, language, [tier.id for tier in tiers])
+
     result = []
     for tier in tiers:
-        translation = db.query(ActivityPricingTierTranslation).filter(
-            ActivityPricingTierTranslation.pricing_tier_id == tier.id,
-            ActivityPricingTierTranslation.language == language
-        ).first()
+        translation = translations.get(tier.id)
 
         result.append({
             'id': tier.id,
@@ -210,7 +391,12 @@ def get_translated_pricing_tiers(tiers: List[ActivityPricingTier], language: str
     return result
 
 
-def get_translated_add_ons(add_ons: List[ActivityAddOn], language: str, db: Session) -> List[Dict[str, Any]]:
+def get_translated_add_ons(
+    add_ons: List[ActivityAddOn],
+    language: str,
+    db: Session,
+    translations: Optional[Dict[int, ActivityAddOnTranslation]] = None
+) -> List[Dict[str, Any]]:
     """Get translated add-ons."""
     if language == 'en':
         return [{
@@ -222,12 +408,12 @@ def get_translated_add_ons(add_ons: List[ActivityAddOn], language: str, db: Sess
             'order_index': a.order_index
         } for a in add_ons]
 
+    if translations is None:
+        translations = _translations_for(db, ActivityAddOnTranslation, language, [addon.id for addon in add_ons])
+
     result = []
     for addon in add_ons:
-        translation = db.query(ActivityAddOnTranslation).filter(
-            ActivityAddOnTranslation.addon_id == addon.id,
-            ActivityAddOnTranslation.language == language
-        ).first()
+        translation = translations.get(addon.id)
 
         result.append({
             'id': addon.id,
@@ -242,7 +428,12 @@ def get_translated_add_ons(add_ons: List[ActivityAddOn], language: str, db: Sess
     return result
 
 
-def get_translated_meeting_point(meeting_point: Optional[MeetingPoint], language: str, db: Session) -> Optional[Dict[str, Any]]:
+def get_translated_meeting_point(
+    meeting_point: Optional[MeetingPoint],
+    language: str,
+    db: Session,
+    translations: Optional[Dict[int, MeetingPointTranslation]] = None
+) -> Optional[Dict[str, Any]]:
     """Get translated meeting point."""
     if not meeting_point:
         return None
@@ -260,10 +451,9 @@ def get_translated_meeting_point(meeting_point: Optional[MeetingPoint], language
             'photos': meeting_point.photos if hasattr(meeting_point, 'photos') else []
         }
 
-    translation = db.query(MeetingPointTranslation).filter(
-        MeetingPointTranslation.meeting_point_id == meeting_point.id,
-        MeetingPointTranslation.language == language
-    ).first()
+    if translations is None:
+        translations = _translations_for(db, MeetingPointTranslation, language, [meeting_point.id])
+    translation = translations.get(meeting_point.id)
 
     return {
         'id': meeting_point.id,
@@ -280,8 +470,7 @@ def get_translated_meeting_point(meeting_point: Optional[MeetingPoint], language
 
 def validate_language(language: str) -> str:
     """Validate and normalize language code."""
-    valid_languages = ['en', 'es', 'zh', 'fr']
-    if language not in valid_languages:
+    if language not in SUPPORTED_LANGUAGES:
         return 'en'  # Default to English
     return language
 
@@ -298,10 +487,7 @@ def get_translated_category(category: Category, language: str, db: Session) -> D
             'order_index': category.order_index
         }
 
-    translation = db.query(CategoryTranslation).filter(
-        CategoryTranslation.category_id == category.id,
-        CategoryTranslation.language == language
-    ).first()
+    translation = _translations_for(db, CategoryTranslation, language, [category.id]).get(category.id)
 
     return {
         'id': category.id,
@@ -329,10 +515,7 @@ def get_translated_destination(destination: Destination, language: str, db: Sess
             'created_at': destination.created_at
         }
 
-    translation = db.query(DestinationTranslation).filter(
-        DestinationTranslation.destination_id == destination.id,
-        DestinationTranslation.language == language
-    ).first()
+    translation = _translations_for(db, DestinationTranslation, language, [destination.id]).get(destination.id)
 
     return {
         'id': destination.id,
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Benchmark: email rendering and sending throughput (messages per second).
+
+For the booking_confirmation and review_request templates, times:
+  legacy     the previous per-message path: template lookups with
+             modification checks on every call, a failed .txt lookup, and
+             uncompiled HTML-to-text regexes
+  render     EmailService._render_template, one message per call
+  render_many EmailService.render_many over the whole list of contexts
+  send       compose_many + send_batch in chunks of BATCH_LIMIT, through the
+             stub transport (no network; rate limit off)
+
+Also reports the cold compile time of each template with an empty and with
+a warm bytecode cache. Needs no database or network:
+    python bench_email_render.py --messages 5000
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ["EMAIL_TRANSPORT"] = "stub"
+os.environ["EMAIL_TESTING_MODE"] = "False"
+os.environ["EMAIL_RATE_LIMIT_PER_SECOND"] = "0"
+os.environ["DEBUG"] = "False"
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+from app.services.email import TEMPLATE_DIR, EmailService
+from app.services.email_transport import BATCH_LIMIT, get_transport, send_batch
+
+TEMPLATES = ["booking_confirmation", "review_request"]
+
+
+def _context(template_name: str, i: int) -> dict:
+    context = {
+        "user_name": f"Traveller {i}",
+        "booking_reference": f"BK{i:08d}",
+        "activity_title": "Li River cruise and Yangshuo countryside",
+        "app_name": "FinuoTravel",
+    }
+    if template_name == "booking_confirmation":
+        context.update(booking_date="June 01, 2026", total_amount=f"€{100 + i % 50:.2f}")
+    return context
+
+
+def _legacy_render(env: Environment, template_name: str, context: dict) -> tuple:
+    html_content = env.get_template(f"{template_name}.html").render(**context)
+    try:
+        text_content = env.get_template(f"{template_name}.txt").render(**context)
+    except Exception:
+        text_content = re.sub('<[^<]+?>', '', html_content)
+        text_content = re.sub(r'\s+', ' ', text_content).strip()
+    return html_content, text_content
+
+
+def _rate(count: int, started: float) -> str:
+    return f"{count / (time.perf_counter() - started):10.0f} msg/s"
+
+
+def _cold_compile_ms(template_name: str, cache_dir: str) -> float:
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(['html', 'xml']),
+        bytecode_cache=FileSystemBytecodeCache(cache_dir),
+    )
+    started = time.perf_counter()
+    env.get_template(f"{template_name}.html")
+    return (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    legacy_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(['html', 'xml']))
+    transport = get_transport()
+
+    for template_name in TEMPLATES:
+        contexts = [_context(template_name, i) for i in range(args.messages)]
+        print(f"{template_name}: {args.messages} messages")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold = _cold_compile_ms(template_name, cache_dir)
+            warm = _cold_compile_ms(template_name, cache_dir)
+        print(f"  compile      {cold:8.1f} ms cold, {warm:.1f} ms from bytecode cache")
+
+        started = time.perf_counter()
+        for context in contexts:
+            _legacy_render(legacy_env, template_name, context)
+        print(f"  legacy     {_rate(len(contexts), started)}")
+
+        started = time.perf_counter()
+        for context in contexts:
+            EmailService._render_template(template_name, context)
+        print(f"  render     {_rate(len(contexts), started)}")
+
+        started = time.perf_counter()
+        EmailService.render_many(template_name, contexts)
+        print(f"  render_many{_rate(len(contexts), started)}")
+
+        messages = [
+            {"to_email": f"user{i}@example.com", "to_name": context["user_name"],
+             "subject": f"Booking {context['booking_reference']}", "context": context}
+            for i, context in enumerate(contexts)
+        ]
+        transport.sent.clear()
+        started = time.perf_counter()
+        emails = EmailService.compose_many(template_name, messages)
+        calls = 0
+        for start in range(0, len(emails), BATCH_LIMIT):
+            send_batch(emails[start:start + BATCH_LIMIT])
+            calls += 1
+        print(f"  send       {_rate(len(transport.sent), started)}  ({calls} provider calls)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark: password verifications (logins) per second, per core.
+
+For each bcrypt cost, times:
+  inline     verify_password on the calling thread, one at a time: what one
+             core sustains, and what the request thread used to pay per login
+  pool       --clients coroutines on one event loop logging in concurrently
+             through app.core.password_pool with --workers processes;
+             logins/s per worker process should stay close to the inline
+             figure
+  rejected   how many of those calls got PasswordPoolBusy (a 429 in the API)
+             with the configured queue size
+
+Also prints how late a 5 ms sleep on that event loop wakes up while the pool
+is saturated, to show hashing no longer starves the API process.
+Needs no database:
+    python bench_password_hashing.py --rounds 10 12 --workers 2 --clients 16
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import bcrypt
+
+from app.core.password_pool import PasswordPool, PasswordPoolBusy
+from app.core.security import verify_password
+
+PASSWORD = "correct horse battery staple"
+
+
+def _inline(hashed: str, seconds: float) -> float:
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        verify_password(PASSWORD, hashed)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+async def _pooled(pool: PasswordPool, hashed: str, clients: int, seconds: float):
+    done = [0] * clients
+    rejected = [0] * clients
+    deadline = time.perf_counter() + seconds
+
+    async def client(i: int) -> None:
+        while time.perf_counter() < deadline:
+            try:
+                await pool.run(verify_password, PASSWORD, hashed)
+                done[i] += 1
+            except PasswordPoolBusy:
+                rejected[i] += 1
+                await asyncio.sleep(0.01)
+
+    # How late the loop wakes from a short sleep while the logins run.
+    probe = []
+
+    async def prober() -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            probe.append(time.perf_counter() - started - 0.005)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)), prober())
+    elapsed = time.perf_counter() - started
+    return sum(done) / elapsed, sum(rejected), statistics.median(probe) * 1000 if probe else 0.0
+
+
+async def _warm(pool: PasswordPool, workers: int) -> None:
+    # Spawn and import in the worker processes outside the timings.
+    warm_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode()
+    for _ in range(workers * 2):
+        await pool.run(verify_password, PASSWORD, warm_hash)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 12])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per measurement")
+    args = parser.parse_args()
+
+    pool = PasswordPool(args.workers, args.queue_size)
+    pool.start()
+    try:
+        asyncio.run(_warm(pool, args.workers))
+
+        print(f"{args.workers} workers, queue {args.queue_size}, {args.clients} clients, {args.duration:.0f}s each")
+        for rounds in args.rounds:
+            hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+            inline = _inline(hashed, args.duration)
+            pooled, rejected, probe_ms = asyncio.run(_pooled(pool, hashed, args.clients, args.duration))
+            print(f"cost {rounds:2d}: inline {inline:8.1f} logins/s (1 core)   "
+                  f"pool {pooled:8.1f} logins/s = {pooled / args.workers:7.1f}/core   "
+                  f"rejected {rejected}   loop lag p50 {probe_ms:.2f} ms")
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark: JSON serialization time and bytes on the wire for large payloads.
+
+Builds the payloads the API returns for search_activities(per_page=100) and
+for _get_activity_details of the largest activities, per language, from the
+configured database (read only). For each payload it times:
+  dump       model_dump(mode="json"), shared by both response classes
+  json       json.dumps as JSONResponse renders it (the previous default)
+  orjson     orjson.dumps as ORJSONResponse renders it
+and prints the size raw, gzip (COMPRESSION_GZIP_LEVEL) and brotli
+(COMPRESSION_BROTLI_QUALITY), with the time each compression takes:
+    python bench_serialization.py --languages en zh --details 5
+"""
+
+import argparse
+import inspect
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import orjson
+from sqlalchemy import func
+
+from app.api.v1.activities import _get_activity_details, _search_activities
+from app.config import settings
+from app.core.compression import brotli, compress
+from app.database import SessionLocal
+from app.models import Activity, ActivityFAQ
+from app.services.activity_loader import ACTIVITY_DETAIL_OPTIONS
+
+
+def _timed(fn, repeat: int) -> float:
+    """Best-of-three mean milliseconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best * 1000
+
+
+def _search_payload(db, language: str):
+    params = {name: None for name in list(inspect.signature(_search_activities).parameters)[2:]}
+    params.update(sort_by="recommended", language=language, page=1, per_page=100, estimate_total=False)
+    return _search_activities(db, None, **params)
+
+
+def _largest_activity_ids(db, count: int):
+    return [
+        activity_id for (activity_id,) in
+        db.query(Activity.id)
+        .outerjoin(ActivityFAQ, ActivityFAQ.activity_id == Activity.id)
+        .filter(Activity.is_active == True)
+        .group_by(Activity.id)
+        .order_by(func.count(ActivityFAQ.id).desc(), Activity.id)
+        .limit(count)
+        .all()
+    ]
+
+
+def _report(label: str, model, repeat: int) -> None:
+    content = model.model_dump(mode="json")
+    dump_ms = _timed(lambda: model.model_dump(mode="json"), repeat)
+    json_ms = _timed(lambda: json.dumps(content, ensure_ascii=False, allow_nan=False,
+                                        indent=None, separators=(",", ":")).encode("utf-8"), repeat)
+    orjson_ms = _timed(lambda: orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS), repeat)
+
+    body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    sizes = [f"raw {len(body) / 1024:7.1f} KB"]
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    for encoding in encodings:
+        level = dict(gzip_level=settings.COMPRESSION_GZIP_LEVEL, brotli_quality=settings.COMPRESSION_BROTLI_QUALITY)
+        compressed = compress(body, encoding, **level)
+        ms = _timed(lambda: compress(body, encoding, **level), repeat)
+        sizes.append(f"{encoding} {len(compressed) / 1024:6.1f} KB ({ms:5.2f} ms)")
+
+    print(f"{label:<28} dump {dump_ms:6.2f} ms  json {json_ms:6.2f} ms  orjson {orjson_ms:6.2f} ms "
+          f"({json_ms / orjson_ms if orjson_ms else 0:4.1f}x)  " + "  ".join(sizes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--languages", nargs="+", default=["en", "zh"])
+    parser.add_argument("--details", type=int, default=3, help="largest activities to serialize")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        activity_ids = _largest_activity_ids(db, args.details)
+        for language in args.languages:
+            _report(f"search per_page=100 [{language}]", _search_payload(db, language), args.repeat)
+            for activity_id in activity_ids:
+                activity = db.query(Activity).options(*ACTIVITY_DETAIL_OPTIONS).filter(Activity.id == activity_id).one()
+                _report(f"detail {activity_id} [{language}]", _get_activity_details(activity, db, language), args.repeat)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
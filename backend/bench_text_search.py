@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Benchmark: legacy ILIKE text search vs. activity_search_index.
+
+Generates a synthetic multilingual catalogue (activities with zh/es
+translations, destinations and categories with zh names) inside a throw-away
+schema, builds the search index, then times the search_activities text filter
+(count + first page of 20 ids) both ways for each catalogue size.
+
+Needs a PostgreSQL database where the connecting user may create schemas and
+the pg_trgm extension. Nothing outside the ``bench_text_search`` schema is
+touched and the schema is dropped afterwards:
+    python bench_text_search.py --sizes 10000 100000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, or_, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401  (register all tables on Base.metadata)
+from app.database import Base
+from app.models import (
+    Activity, ActivityTranslation, ActivityDestination, Destination,
+    DestinationTranslation, ActivityCategory, Category, CategoryTranslation
+)
+from app.services.search_index import apply_text_search, refresh_search_index
+
+SCHEMA = "bench_text_search"
+TERMS = ["Guilin", "桂林", "museum", "美食", "river cruise", "xyzzy"]
+
+_SEED_SQL = [
+    "INSERT INTO users (id, email, password_hash, full_name, role) "
+    "VALUES (1, 'bench@example.com', 'x', 'Bench', 'VENDOR')",
+    "INSERT INTO vendors (id, user_id, company_name) VALUES (1, 1, 'Bench Tours')",
+    "INSERT INTO destinations (id, name, slug) "
+    "SELECT g, (ARRAY['Guilin','Beijing','Helsinki','Lapland','Xi''an','Shanghai'])[1 + g % 6] || ' ' || g, "
+    "'dest-' || g FROM generate_series(1, 200) g",
+    "INSERT INTO destination_translations (destination_id, language, name) "
+    "SELECT g, 'zh', (ARRAY['桂林','北京','赫尔辛基','拉普兰','西安','上海'])[1 + g % 6] || g "
+    "FROM generate_series(1, 200) g",
+    "INSERT INTO categories (id, name, slug) "
+    "SELECT g, (ARRAY['Museums','Food tours','River cruise','Hiking','Nightlife'])[1 + g % 5] || ' ' || g, "
+    "'cat-' || g FROM generate_series(1, 50) g",
+    "INSERT INTO category_translations (category_id, language, name) "
+    "SELECT g, 'zh', (ARRAY['博物馆','美食','游船','徒步','夜生活'])[1 + g % 5] || g "
+    "FROM generate_series(1, 50) g",
+    "INSERT INTO activities (id, vendor_id, title, slug, short_description, description, price_adult, is_active, is_available) "
+    "SELECT g, 1, 'Tour ' || md5(g::text) || ' ' || (ARRAY['old town walk','museum pass','river cruise','food crawl'])[1 + g % 4], "
+    "'act-' || g, 'Short ' || md5((g + 1)::text), repeat(md5((g + 2)::text) || ' ', 20), 10 + g % 200, true, true "
+    "FROM generate_series(1, :n) g",
+    "INSERT INTO activity_translations (activity_id, language, title, short_description, description) "
+    "SELECT g, lang, lang || ' ' || md5(g::text), md5((g + 3)::text), repeat(md5((g + 4)::text) || ' ', 10) "
+    "FROM generate_series(1, :n) g, (VALUES ('zh'), ('es')) AS l(lang)",
+    "INSERT INTO activity_destinations (activity_id, destination_id) "
+    "SELECT g, 1 + g % 200 FROM generate_series(1, :n) g",
+    "INSERT INTO activity_categories (activity_id, category_id) "
+    "SELECT g, 1 + g % 50 FROM generate_series(1, :n) g",
+]
+
+
+def legacy_ilike_filter(db, query, q):
+    """The pre-index search_activities text filter, kept here for comparison."""
+    safe_q = q.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{safe_q}%"
+
+    def il(col):
+        return col.ilike(pattern, escape="\\")
+
+    translated_ids = db.query(ActivityTranslation.activity_id).filter(
+        or_(il(ActivityTranslation.title), il(ActivityTranslation.short_description),
+            il(ActivityTranslation.description))
+    )
+    destination_ids = (
+        db.query(ActivityDestination.activity_id)
+        .join(Destination, Destination.id == ActivityDestination.destination_id)
+        .outerjoin(DestinationTranslation, DestinationTranslation.destination_id == Destination.id)
+        .filter(or_(il(Destination.name), il(DestinationTranslation.name)))
+    )
+    category_ids = (
+        db.query(ActivityCategory.activity_id)
+        .join(Category, Category.id == ActivityCategory.category_id)
+        .outerjoin(CategoryTranslation, CategoryTranslation.category_id == Category.id)
+        .filter(or_(il(Category.name), il(CategoryTranslation.name)))
+    )
+    return query.filter(or_(
+        il(Activity.title), il(Activity.description), il(Activity.short_description),
+        Activity.id.in_(translated_ids), Activity.id.in_(destination_ids),
+        Activity.id.in_(category_ids),
+    ))
+
+
+def _time(fn, runs):
+    """Return (median_ms, p95_ms, last_result) over ``runs`` calls."""
+    samples, result = [], None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1], result
+
+
+def run_size(engine, size, runs):
+    """Seed ``size`` activities, build the index, and print timings per term."""
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.create_all(bind=engine)
+
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    for statement in _SEED_SQL:
+        db.execute(text(statement), {"n": size})
+    started = time.perf_counter()
+    refresh_search_index(db)
+    db.commit()
+    build_s = time.perf_counter() - started
+    db.execute(text("ANALYZE"))
+    db.commit()
+
+    print(f"\n== {size} activities (index build {build_s:.1f}s) ==")
+    print(f"{'term':<14}{'ILIKE p50':>11}{'p95':>9}{'index p50':>11}{'p95':>9}{'hits':>8}")
+    for term in TERMS:
+        def legacy():
+            query = legacy_ilike_filter(db, db.query(Activity).filter(Activity.is_active == True), term)
+            return query.count(), [a.id for a in query.order_by(Activity.id).limit(20)]
+
+        def indexed():
+            query, rank = apply_text_search(db.query(Activity).filter(Activity.is_active == True), term)
+            return query.count(), [a.id for a in query.order_by(rank.desc(), Activity.id).limit(20)]
+
+        legacy_p50, legacy_p95, (legacy_hits, _) = _time(legacy, runs)
+        index_p50, index_p95, (index_hits, _) = _time(indexed, runs)
+        note = "" if index_hits >= legacy_hits else f"  (ILIKE matched {legacy_hits})"
+        print(f"{term:<14}{legacy_p50:>9.1f}ms{legacy_p95:>7.1f}ms"
+              f"{index_p50:>9.1f}ms{index_p95:>7.1f}ms{index_hits:>8}{note}")
+    db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    engine = create_engine(
+        args.database_url,
+        connect_args={"options": f"-csearch_path={SCHEMA},public"},
+    )
+    try:
+        for size in args.sizes:
+            run_size(engine, size, args.runs)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
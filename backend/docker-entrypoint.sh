@@ -110,6 +110,44 @@ main() {
         print_info "Database already has data — skipping initialization."
     fi
 
+    # Add the cart-hold columns to databases created before them. Idempotent.
+    if [ -f "migrate_cart_holds.py" ]; then
+        print_info "Applying cart hold migration..."
+        python migrate_cart_holds.py || print_warn "migrate_cart_holds.py reported issues (continuing)."
+    fi
+
+    # Build indexes declared on the models that older databases lack. Idempotent.
+    if [ -f "migrate_indexes.py" ]; then
+        print_info "Applying index migration..."
+        python migrate_indexes.py || print_warn "migrate_indexes.py reported issues (continuing)."
+    fi
+
+    # Recompute review rating summaries from the reviews. Idempotent.
+    if [ -f "rebuild_rating_summaries.py" ]; then
+        print_info "Rebuilding rating summaries..."
+        python rebuild_rating_summaries.py || print_warn "rebuild_rating_summaries.py reported issues (continuing)."
+    fi
+
+    # Keep the multilingual search index and facet table in step with data
+    # written outside the API (backup restores, seed and translation scripts).
+    # Idempotent.
+    if [ -f "rebuild_search_index.py" ]; then
+        print_info "Rebuilding search index and facets..."
+        python rebuild_search_index.py || print_warn "rebuild_search_index.py reported issues (continuing)."
+    fi
+
+    # Rank "similar activities" for every activity. Idempotent.
+    if [ -f "rebuild_similarities.py" ]; then
+        print_info "Rebuilding similar-activity index..."
+        python rebuild_similarities.py || print_warn "rebuild_similarities.py reported issues (continuing)."
+    fi
+
+    # Recompute the admin dashboard counters and daily statistics. Idempotent.
+    if [ -f "rollup_stats.py" ]; then
+        print_info "Rolling up platform statistics..."
+        python rollup_stats.py || print_warn "rollup_stats.py reported issues (continuing)."
+    fi
+
     print_info "Starting Uvicorn..."
     exec "$@"
 }
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Replay a recorded /activities/search query mix through EXPLAIN ANALYZE.
+
+The mix is a text file of search requests, one per line, as they appear in
+the nginx access log (``/api/v1/activities/search?...``) or as bare query
+strings. To record one from production traffic:
+    grep -o 'GET /api/v1/activities/search[^ ]*' access.log | cut -c5- > mix.txt
+
+Each request is run through search_activities against the configured
+database (read only). Every SQL statement it issues is captured and then run
+with EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON), best of --repeat. Per request
+the report shows each statement's kind (count, page or lookup), execution
+time and plan shape: the node types and the index each scan used.
+
+--save writes the results as a baseline; --baseline compares against one
+and flags every statement whose plan shape changed, with the old and new
+times. Typical use around an index change:
+    python explain_query_mix.py --mix mix.txt --save before.json
+    python migrate_indexes.py
+    python explain_query_mix.py --mix mix.txt --baseline before.json
+"""
+
+import argparse
+import inspect
+import json
+import os
+import statistics
+import sys
+import typing
+from decimal import Decimal
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.api.v1.activities import _search_activities
+from app.database import SessionLocal, engine
+
+# Parameters of _search_activities that come from the query string.
+_PARAMETERS = list(inspect.signature(_search_activities).parameters)[2:]
+_DEFAULTS = dict(sort_by="recommended", language="en", page=1, per_page=20, estimate_total=False)
+
+
+def _coerce(annotation, values: List[str]) -> Any:
+    """Convert query-string values to the parameter's annotated type."""
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    target = args[0] if args else annotation
+    if typing.get_origin(target) is list:
+        return values
+    value = values[-1]
+    if target is bool:
+        return value.lower() in ("1", "true", "yes", "on")
+    if target in (int, float, Decimal):
+        return target(value)
+    return value
+
+
+def parse_request(line: str) -> Dict[str, Any]:
+    """search_activities keyword arguments for one recorded request line."""
+    raw = line.strip()
+    query = urlsplit(raw).query if "?" in raw or raw.startswith("/") else raw
+    hints = typing.get_type_hints(_search_activities)
+    params = {name: None for name in _PARAMETERS}
+    params.update(_DEFAULTS)
+    for name, values in parse_qs(query).items():
+        if name in hints and name in params:
+            params[name] = _coerce(hints[name], values)
+    return params
+
+
+def _capture(db, params: Dict[str, Any]) -> List[tuple]:
+    """(statement, parameters) of every SELECT search_activities issues."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        _search_activities(db, None, **params)
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
+    return statements
+
+
+def _shape(node: Dict[str, Any]) -> List[str]:
+    """Pre-order node types, with the index or relation each scan used."""
+    label = node["Node Type"]
+    target = node.get("Index Name") or node.get("Relation Name")
+    if target:
+        label += f"[{target}]"
+    shape = [label]
+    for child in node.get("Plans", []):
+        shape.extend(_shape(child))
+    return shape
+
+
+def _kind(statement: str) -> str:
+    lowered = statement.lower()
+    if "count(*)" in lowered:
+        return "count"
+    return "page" if " limit " in lowered else "lookup"
+
+
+def _explain(db, statement: str, parameters, repeat: int) -> Dict[str, Any]:
+    best = None
+    for _ in range(repeat):
+        plan = db.connection().exec_driver_sql(
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        if best is None or plan[0]["Execution Time"] < best[0]["Execution Time"]:
+            best = plan
+    root = best[0]
+    return {
+        "kind": _kind(statement),
+        "execution_ms": root["Execution Time"],
+        "planning_ms": root["Planning Time"],
+        "shared_hit": root["Plan"].get("Shared Hit Blocks", 0),
+        "shared_read": root["Plan"].get("Shared Read Blocks", 0),
+        "shape": _shape(root["Plan"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mix", required=True, help="file of recorded search requests, one per line")
+    parser.add_argument("--repeat", type=int, default=3, help="EXPLAIN ANALYZE runs per statement (best kept)")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--verbose", action="store_true", help="print every plan shape")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("explain_query_mix.py needs PostgreSQL")
+
+    with open(args.mix, encoding="utf-8") as f:
+        requests = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    changed = 0
+    ratios = []
+    db = SessionLocal()
+    try:
+        for request in requests:
+            if request in results:
+                continue
+            try:
+                statements = _capture(db, parse_request(request))
+            except (HTTPException, ValueError) as e:
+                print(f"skip {request}: {getattr(e, 'detail', e)}")
+                continue
+            results[request] = [_explain(db, sql, parameters, args.repeat) for sql, parameters in statements]
+            db.rollback()
+
+            print(request)
+            previous = baseline.get(request, [])
+            for i, result in enumerate(results[request]):
+                line = f"  {result['kind']:<6} {result['execution_ms']:9.2f} ms  plan {result['planning_ms']:6.2f} ms"
+                old = previous[i] if i < len(previous) else None
+                if old is not None:
+                    line += f"  (was {old['execution_ms']:9.2f} ms)"
+                    if old["execution_ms"] > 0:
+                        ratios.append(result["execution_ms"] / old["execution_ms"])
+                    if old["shape"] != result["shape"]:
+                        changed += 1
+                        line += "  PLAN CHANGED"
+                print(line)
+                if args.verbose or (old is not None and old["shape"] != result["shape"]):
+                    if old is not None and old["shape"] != result["shape"]:
+                        print("    before: " + " > ".join(old["shape"]))
+                    print("    now:    " + " > ".join(result["shape"]))
+    finally:
+        db.rollback()
+        db.close()
+
+    statements = [result for request in results.values() for result in request]
+    if statements:
+        times = [result["execution_ms"] for result in statements]
+        print(f"\n{len(results)} requests, {len(statements)} statements: "
+              f"median {statistics.median(times):.2f} ms, max {max(times):.2f} ms, total {sum(times):.1f} ms")
+    if ratios:
+        print(f"vs baseline: {changed} plan changes, median time ratio {statistics.median(ratios):.2f}x")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"Saved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,7 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.database import Base, engine
+from app.database import init_db
 
 # Import all models so Base.metadata knows about them
 from app.models.user import User, Vendor  # noqa: F401
@@ -24,7 +24,7 @@ from app.models.activity import (  # noqa: F401
     ActivityAddOn, MeetingPointPhoto,
 )
 from app.models.booking import Booking, Availability, CartItem  # noqa: F401
-from app.models.review import Review, ReviewImage, ReviewCategory  # noqa: F401
+from app.models.review import Review, ReviewImage, ReviewCategory, RatingSummary, RatingCategorySummary  # noqa: F401
 from app.models.wishlist import Wishlist  # noqa: F401
 from app.models.translation import (  # noqa: F401
     ActivityTranslation, ActivityHighlightTranslation,
@@ -33,11 +33,14 @@ from app.models.translation import (  # noqa: F401
     ActivityAddOnTranslation, MeetingPointTranslation,
     CategoryTranslation, DestinationTranslation,
 )
+from app.models.search import ActivitySearchIndex, ActivityFacet, ActivitySimilarity, ActivitySearchDocument  # noqa: F401
+from app.models.stats import PlatformCounter, DailyStat  # noqa: F401
+from app.models.email import EmailOutbox  # noqa: F401
 
 
 def main():
     print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    init_db()
     print("Done. Tables created successfully.")
     print("To load demo data, restore from backup:")
     print("  psql -U postgres -d findtravelmate < /backups/backup_2026-04-14_expanded.sql")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Load test: throughput and latency of the public read endpoints.
+
+Runs N concurrent clients (default 500) against each target for a fixed
+duration. Every client loops over a weighted mix of the endpoints served by
+the async engine (search, activity detail by slug, categories, destinations,
+activity reviews). Prints requests/s, p50, p99 and errors per target and per
+endpoint, so two deployments can be compared side by side. For example, the
+previous release against this one:
+    python loadtest_read_endpoints.py \\
+        --target sync=http://old-backend:8000 --target async=http://localhost:8000 \\
+        --clients 500 --duration 30
+
+Slugs and activity ids are discovered from the first target's /search.
+Point it only at a test deployment: 500 clients will saturate the database.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+
+API = "/api/v1"
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def _discover(base_url: str) -> Tuple[List[str], List[int]]:
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        response = await client.get(f"{API}/activities/search", params={"per_page": 100})
+        response.raise_for_status()
+        activities = response.json()["data"]
+    if not activities:
+        raise SystemExit(f"{base_url} has no active activities to test against")
+    return [a["slug"] for a in activities], [a["id"] for a in activities]
+
+
+def _request_mix(slugs: List[str], ids: List[int]) -> List[Tuple[str, int, callable]]:
+    """(name, weight, path factory) for each endpoint."""
+    languages = ["en", "en", "zh", "es", "fr"]
+    return [
+        ("search", 4, lambda: f"{API}/activities/search?per_page=20&language={random.choice(languages)}"
+                              f"&sort_by={random.choice(['recommended', 'price_asc', 'rating'])}"),
+        ("detail", 4, lambda: f"{API}/activities/slug/{random.choice(slugs)}?language={random.choice(languages)}"),
+        ("reviews", 2, lambda: f"{API}/reviews/activity/{random.choice(ids)}?per_page=10"),
+        ("categories", 1, lambda: f"{API}/activities/categories?language={random.choice(languages)}"),
+        ("destinations", 1, lambda: f"{API}/activities/destinations?language={random.choice(languages)}"),
+    ]
+
+
+async def _run_target(base_url: str, mix, clients: int, duration: float) -> Dict[str, Dict[str, List]]:
+    names = [name for name, weight, _ in mix for _ in range(weight)]
+    paths = {name: factory for name, _, factory in mix}
+    results: Dict[str, Dict[str, List]] = defaultdict(lambda: {"latencies": [], "errors": []})
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                name = random.choice(names)
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[name]())
+                    ok = response.status_code == 200
+                    error = None if ok else f"HTTP {response.status_code}"
+                except httpx.HTTPError as e:
+                    error = type(e).__name__
+                elapsed = time.perf_counter() - started
+                if error:
+                    results[name]["errors"].append(error)
+                else:
+                    results[name]["latencies"].append(elapsed)
+
+        await asyncio.gather(*(worker() for _ in range(clients)))
+    return results
+
+
+def _report(label: str, results, duration: float) -> None:
+    all_latencies = [v for r in results.values() for v in r["latencies"]]
+    all_errors = sum(len(r["errors"]) for r in results.values())
+    print(f"{label}: {len(all_latencies) / duration:8.1f} req/s  "
+          f"p50 {_percentile(all_latencies, 0.5) * 1000:7.1f} ms  "
+          f"p99 {_percentile(all_latencies, 0.99) * 1000:7.1f} ms  errors {all_errors}")
+    for name, r in sorted(results.items()):
+        latencies = r["latencies"]
+        mean = statistics.mean(latencies) * 1000 if latencies else 0.0
+        print(f"  {name:<13}{len(latencies) / duration:8.1f} req/s  "
+              f"p50 {_percentile(latencies, 0.5) * 1000:7.1f} ms  "
+              f"p99 {_percentile(latencies, 0.99) * 1000:7.1f} ms  mean {mean:7.1f} ms  errors {len(r['errors'])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True, metavar="NAME=URL",
+                        help="deployment to test (repeat to compare)")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per target")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds of untimed load first")
+    args = parser.parse_args()
+
+    targets = [target.split("=", 1) if "=" in target else (target, target) for target in args.target]
+    slugs, ids = asyncio.run(_discover(targets[0][1]))
+    mix = _request_mix(slugs, ids)
+    print(f"{args.clients} clients, {args.duration:.0f}s per target, {len(slugs)} activities")
+
+    for label, base_url in targets:
+        if args.warmup:
+            asyncio.run(_run_target(base_url, mix, args.clients, args.warmup))
+        results = asyncio.run(_run_target(base_url, mix, args.clients, args.duration))
+        _report(label, results, args.duration)
+
+
+if __name__ == "__main__":
+    main()
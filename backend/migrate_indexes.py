@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Create the indexes declared on the models that an existing database lacks.
+
+create_all (init_db.py) only creates indexes together with new tables, so
+indexes added later to a model's ``__table_args__`` (the activity, image and
+link-table indexes, the per-sort indexes of activity_search_documents) never
+reach a database created before them. This script builds each missing one
+with CREATE INDEX CONCURRENTLY, so writes are not blocked while it runs, and
+rebuilds any index a previously interrupted concurrent build left INVALID.
+Tables that received a new index are ANALYZEd so the planner picks it up.
+
+Idempotent — runs on every container start:
+    docker exec travel_backend python /app/migrate_indexes.py
+    docker exec travel_backend python /app/migrate_indexes.py --dry-run
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import text
+from sqlalchemy.schema import CreateIndex
+
+import app.models  # noqa: F401  (register all tables on Base.metadata)
+from app.database import Base, engine
+
+_EXISTING_SQL = """
+SELECT c.relname AS name, i.indisvalid AS valid
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+WHERE n.nspname = current_schema()
+"""
+
+
+def _declared():
+    """(table name, Index) for every named index on the models, in table order."""
+    for table in Base.metadata.sorted_tables:
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            yield table.name, index
+
+
+def main() -> None:
+    """Build missing or invalid indexes, then analyze the affected tables."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="print the statements without running them")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("Index migration skipped: PostgreSQL only.")
+        return
+
+    # CONCURRENTLY cannot run inside a transaction block.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        tables = {name for (name,) in conn.execute(text(
+            "SELECT tablename FROM pg_tables WHERE schemaname = current_schema()"
+        ))}
+        existing = {row.name: row.valid for row in conn.execute(text(_EXISTING_SQL))}
+
+        analyze = set()
+        built = 0
+        for table, index in _declared():
+            if table not in tables or existing.get(index.name) is True:
+                continue
+            if index.name in existing:
+                # Left INVALID by an interrupted concurrent build: drop and redo.
+                drop = f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'
+                print(drop)
+                if not args.dry_run:
+                    conn.exec_driver_sql(drop)
+
+            index.dialect_options["postgresql"]["concurrently"] = True
+            statement = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+            print(statement)
+            if args.dry_run:
+                continue
+            started = time.perf_counter()
+            conn.exec_driver_sql(statement)
+            print(f"  built in {time.perf_counter() - started:.1f}s")
+            analyze.add(table)
+            built += 1
+
+        for table in sorted(analyze):
+            conn.exec_driver_sql(f'ANALYZE "{table}"')
+
+    print(f"Indexes in place ({built} built).")
+
+
+if __name__ == "__main__":
+    main()
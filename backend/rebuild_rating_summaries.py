@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Rebuild the rating summaries (rating_summaries, rating_category_summaries).
+
+The review endpoints keep both tables current incrementally; this job
+recomputes them in bulk from reviews and review_categories, so reviews
+written outside the API (seed scripts, backup restores) are counted and any
+drift is corrected. Activities whose stored average_rating / total_reviews
+disagree with their reviews are corrected too, along with their facets and
+search documents. Idempotent — runs on every container start:
+    docker exec travel_backend python /app/rebuild_rating_summaries.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.models  # noqa: F401  (register all tables on Base.metadata)
+from app.database import SessionLocal, init_db
+from app.services.facets import refresh_activity_facets
+from app.services.ratings import rebuild_rating_summaries
+from app.services.search_documents import refresh_search_documents
+
+
+def main() -> None:
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        corrected = rebuild_rating_summaries(db)
+        if corrected:
+            refresh_activity_facets(db, corrected)
+            refresh_search_documents(db, corrected)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        print(f"Rating summaries rebuilt in {elapsed:.2f}s ({len(corrected)} activity ratings corrected).")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
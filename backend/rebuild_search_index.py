@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Rebuild the multilingual activity search index, search documents and facets.
+
+Idempotent — safe to run on every container start. It:
+
+  1. Ensures the pg_trgm extension and the activity_search_index table + GIN
+     indexes exist (via app.database.init_db).
+  2. Re-renders the search row of every activity from the current activity,
+     translation, destination and category data.
+  3. Re-renders the activity_search_documents rows (one search listing card
+     per activity and language) that /activities/search pages are served from.
+  4. Recomputes the activity_facets row of every activity (search sidebar
+     counts and /activities/providers).
+
+The API keeps rows current for activities edited through the vendor endpoints;
+run this after seed / translation scripts (e.g. scripts/media/apply_zh.py)
+that write those tables directly:
+    docker exec travel_backend python /app/rebuild_search_index.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.models  # noqa: F401  (register all tables on Base.metadata)
+from app.database import SessionLocal, init_db
+from app.services.facets import refresh_activity_facets
+from app.services.search_documents import refresh_search_documents
+from app.services.search_index import refresh_search_index
+
+
+def main() -> None:
+    """Create the index structures if needed and rebuild every row."""
+    init_db()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = refresh_search_index(db)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        print(f"Search index rebuilt: {rows} activities in {elapsed:.2f}s.")
+
+        started = time.perf_counter()
+        rows = refresh_search_documents(db)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        print(f"Search documents rebuilt: {rows} rows in {elapsed:.2f}s.")
+
+        started = time.perf_counter()
+        rows = refresh_activity_facets(db)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        print(f"Facets rebuilt: {rows} activities in {elapsed:.2f}s.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Rebuild the "similar activities" index (activity_similarities).
+
+Full rebuild by default. Idempotent, so it is safe to run after seed and
+import scripts:
+    docker exec travel_backend python /app/rebuild_similarities.py
+
+With --since, it refreshes incrementally. Only the activities whose
+co-booking or co-wishlist counts may have changed are recomputed. Those are
+the activities of every user who booked or wishlisted something since that
+time. Meant for a frequent cron job, e.g. hourly with --since-hours 2 so the
+runs overlap:
+    python rebuild_similarities.py --since-hours 2
+
+Activity create/update already refresh the edited activity's own row. Rows
+of other activities that rank it are only updated by a full rebuild, so run
+one nightly.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.models  # noqa: F401  (register all tables on Base.metadata)
+from app.database import SessionLocal, init_db
+from app.services.similarity import activities_with_new_interactions, refresh_similarities
+
+_BATCH = 2000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since-hours", type=float, help="only activities with interactions this recent")
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        if args.since_hours is None:
+            rows = refresh_similarities(db)
+            db.commit()
+        else:
+            since = datetime.now(timezone.utc) - timedelta(hours=args.since_hours)
+            activity_ids = activities_with_new_interactions(db, since)
+            rows = 0
+            for start in range(0, len(activity_ids), _BATCH):
+                rows += refresh_similarities(db, activity_ids[start:start + _BATCH])
+                db.commit()
+        elapsed = time.perf_counter() - started
+        print(f"Similarities rebuilt: {rows} activities in {elapsed:.2f}s.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
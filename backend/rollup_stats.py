@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Recompute platform statistics (platform_counters, daily_stats).
+
+The API increments both tables as bookings, reviews, users and activities are
+written; this job recomputes them from the source tables so rows written
+outside the API (backup restores, seed scripts) are counted and any drift is
+corrected. Idempotent — runs on every container start and is meant to be
+scheduled, e.g. nightly:
+    docker exec travel_backend python /app/rollup_stats.py --days 2
+
+Without --days every daily row is rebuilt.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app.models  # noqa: F401  (register all tables on Base.metadata)
+from app.database import SessionLocal, init_db
+from app.services.stats import rollup_stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=None,
+                        help="only rebuild daily rows for the last N days (counters are always recomputed)")
+    args = parser.parse_args()
+
+    init_db()
+    since = datetime.utcnow().date() - timedelta(days=args.days - 1) if args.days else None
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = rollup_stats(db, since=since)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        print(f"Statistics rolled up: {rows} daily rows in {elapsed:.2f}s.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
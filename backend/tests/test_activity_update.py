@@ -0,0 +1,63 @@
+"""Activity edits (PUT /activities/{id})."""
+
+from app.models import ActivityHighlight, ActivityHighlightTranslation
+from app.services.stats import ACTIVE_ACTIVITIES, get_counters
+
+from tests.conftest import auth_headers
+
+
+def test_deactivating_through_update_moves_the_active_counter(client, create_activity, vendor, db):
+    activity = create_activity()
+    assert get_counters(db)[ACTIVE_ACTIVITIES] == 1
+
+    response = client.put(f"/api/v1/activities/{activity['id']}", json={"is_active": False},
+                          headers=auth_headers(vendor))
+    assert response.status_code == 200, response.text
+    db.rollback()
+    assert get_counters(db)[ACTIVE_ACTIVITIES] == 0
+
+    # Saving the same value again is not a status change.
+    client.put(f"/api/v1/activities/{activity['id']}", json={"is_active": False}, headers=auth_headers(vendor))
+    db.rollback()
+    assert get_counters(db)[ACTIVE_ACTIVITIES] == 0
+
+
+# Tables update_activity diffs instead of rewriting.
+CHILD_TABLES = {
+    "activity_images", "activity_highlights", "activity_includes", "activity_faqs", "meeting_points",
+    "activity_categories", "activity_destinations", "activity_highlight_translations",
+    "activity_include_translations", "activity_faq_translations", "meeting_point_translations",
+}
+
+
+def test_one_field_edit_leaves_child_rows_alone(client, create_activity, vendor, db, sql):
+    activity = create_activity()
+    highlights = db.query(ActivityHighlight).filter(ActivityHighlight.activity_id == activity["id"]).all()
+    db.add(ActivityHighlightTranslation(highlight_id=highlights[0].id, language="fr", text="Les iles"))
+    db.commit()
+    highlight_ids = sorted(highlight.id for highlight in highlights)
+
+    # The edit form sends every field back; only the title differs.
+    form = {
+        "title": "Harbour tour at dusk",
+        "short_description": activity["short_description"],
+        "description": activity["description"],
+        "price_adult": activity["price_adult"],
+        "images": [{"url": image["url"]} for image in activity["images"]],
+        "highlights": [highlight["text"] for highlight in activity["highlights"]],
+        "includes": [{"item": i["item"], "is_included": i["is_included"]} for i in activity["includes"]],
+        "faqs": [{"question": f["question"], "answer": f["answer"]} for f in activity["faqs"]],
+        "meeting_point": {"address": activity["meeting_point"]["address"]},
+    }
+    sql.clear()
+    response = client.put(f"/api/v1/activities/{activity['id']}", json=form, headers=auth_headers(vendor))
+    assert response.status_code == 200, response.text
+
+    assert [write for write in sql.writes() if write[1] in CHILD_TABLES] == []
+    assert sql.writes("activities") == [("UPDATE", "activities")]
+
+    db.expire_all()
+    assert sorted(h.id for h in db.query(ActivityHighlight).filter(
+        ActivityHighlight.activity_id == activity["id"])) == highlight_ids
+    assert db.query(ActivityHighlightTranslation).filter(
+        ActivityHighlightTranslation.highlight_id == highlights[0].id).count() == 1
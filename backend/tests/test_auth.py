@@ -0,0 +1,107 @@
+"""Register and login: hashing runs in the password pool, awaited on the event loop."""
+
+import asyncio
+import threading
+
+import bcrypt
+
+from app.core.password_pool import check_password, password_pool
+from app.database import async_engine
+
+from tests.conftest import make_user
+
+
+def test_register_then_login(client):
+    response = client.post("/api/v1/auth/register", json={
+        "email": "new@example.com", "password": "secret123", "full_name": "New Customer",
+    })
+    assert response.status_code == 201, response.text
+    assert response.json()["role"] == "customer"
+
+    again = client.post("/api/v1/auth/register", json={
+        "email": "new@example.com", "password": "secret123", "full_name": "New Customer",
+    })
+    assert again.status_code == 400
+
+    login = client.post("/api/v1/auth/login", json={"email": "new@example.com", "password": "secret123"})
+    assert login.status_code == 200, login.text
+    assert login.json()["access_token"]
+
+    wrong = client.post("/api/v1/auth/login", json={"email": "new@example.com", "password": "nope"})
+    assert wrong.status_code == 401
+
+
+def test_register_vendor_returns_the_profile(client):
+    response = client.post("/api/v1/auth/register-vendor", json={
+        "email": "vendor@example.com", "password": "secret123", "full_name": "New Vendor",
+        "company_name": "Fjord Trips",
+    })
+    assert response.status_code == 201, response.text
+    assert response.json()["vendor_profile"]["company_name"] == "Fjord Trips"
+
+
+def test_login_upgrades_an_old_hash(client, db):
+    user = make_user(db)
+    user.password_hash = bcrypt.hashpw(b"secret123", bcrypt.gensalt(rounds=5)).decode()
+    db.commit()
+
+    response = client.post("/api/v1/auth/login", json={"email": user.email, "password": "secret123"})
+    assert response.status_code == 200, response.text
+    db.refresh(user)
+    assert user.password_hash.startswith("$2b$04$")
+
+
+def test_saturated_pool_answers_429(client, db, monkeypatch):
+    user = make_user(db)
+    monkeypatch.setattr(password_pool, "_slots", threading.BoundedSemaphore(1))
+    password_pool._slots.acquire()
+
+    response = client.post("/api/v1/auth/login", json={"email": user.email, "password": "secret123"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_hashing_does_not_block_the_event_loop(client):
+    hashed = bcrypt.hashpw(b"secret123", bcrypt.gensalt(rounds=10)).decode()
+
+    async def race():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        assert await check_password("secret123", hashed)
+        task.cancel()
+        return ticks
+
+    # The loop kept running other coroutines while the hash was computed.
+    assert asyncio.run(race()) > 5
+
+
+def test_no_connection_is_held_while_hashing(client, db, monkeypatch):
+    held = []
+    run = password_pool.run
+
+    async def recording_run(fn, *args):
+        held.append(async_engine.pool.checkedout())
+        return await run(fn, *args)
+
+    monkeypatch.setattr(password_pool, "run", recording_run)
+    user = make_user(db)
+    user.password_hash = bcrypt.hashpw(b"secret123", bcrypt.gensalt(rounds=5)).decode()
+    db.commit()
+
+    # Verify and rehash on login, hash on both registrations.
+    assert client.post("/api/v1/auth/login", json={"email": user.email, "password": "secret123"}).status_code == 200
+    assert client.post("/api/v1/auth/register", json={
+        "email": "pool@example.com", "password": "secret123", "full_name": "Pool Customer",
+    }).status_code == 201
+    assert client.post("/api/v1/auth/register-vendor", json={
+        "email": "poolvendor@example.com", "password": "secret123", "full_name": "Pool Vendor",
+        "company_name": "Pool Tours",
+    }).status_code == 201
+    assert held == [0, 0, 0, 0]
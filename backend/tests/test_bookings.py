@@ -0,0 +1,22 @@
+"""Direct bookings (POST /bookings/)."""
+
+from datetime import date, timedelta
+
+from app.models import ActivitySearchDocument
+
+from tests.conftest import auth_headers
+
+
+def test_booking_refreshes_the_search_documents(client, create_activity, customer, db):
+    activity = create_activity()
+
+    response = client.post("/api/v1/bookings/", json={
+        "activity_id": activity["id"], "booking_date": str(date.today() + timedelta(days=7)), "adults": 2,
+    }, headers=auth_headers(customer))
+    assert response.status_code == 201, response.text
+
+    counts = {
+        document.language: document.total_bookings
+        for document in db.query(ActivitySearchDocument).filter(ActivitySearchDocument.activity_id == activity["id"])
+    }
+    assert counts and set(counts.values()) == {1}
@@ -0,0 +1,94 @@
+"""Conditional GETs on activity detail pages are answered before the endpoint runs."""
+
+from datetime import date, timedelta
+
+from app.models import Activity
+from app.services.cache import activity_cache
+
+from tests.conftest import auth_headers
+
+
+def test_revalidation_skips_the_detail_queries(client, create_activity, sql):
+    activity = create_activity()
+    url = f"/api/v1/activities/{activity['id']}"
+
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"]
+
+    sql.clear()
+    lookups = activity_cache.hits + activity_cache.misses
+    again = client.get(url, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    # The compression middleware weakens the ETag of gzipped 200s.
+    assert again.headers["etag"] == etag.removeprefix("W/")
+    assert again.content == b""
+    # Only the updated_at lookup: the endpoint (and its cache) never ran.
+    assert len(sql) == 1
+    assert activity_cache.hits + activity_cache.misses == lookups
+
+    slug = client.get(f"/api/v1/activities/slug/{activity['slug']}")
+    assert slug.status_code == 200
+    assert client.get(f"/api/v1/activities/slug/{activity['slug']}",
+                      headers={"If-None-Match": slug.headers["etag"]}).status_code == 304
+
+    # Languages are separate representations.
+    zh = client.get(url, params={"language": "zh"}, headers={"If-None-Match": etag})
+    assert zh.status_code == 200
+
+
+def test_edits_move_the_etag(client, create_activity, vendor, admin, db):
+    activity = create_activity()
+    url = f"/api/v1/activities/{activity['id']}"
+    etag = client.get(url).headers["etag"]
+
+    response = client.put(url, json={"title": "Sunset harbour tour"}, headers=auth_headers(vendor))
+    assert response.status_code == 200, response.text
+    edited = client.get(url, headers={"If-None-Match": etag})
+    assert edited.status_code == 200
+    assert edited.json()["title"] == "Sunset harbour tour"
+    assert edited.headers["etag"] != etag
+
+    # The vendor badge is on the page too.
+    vendor_id = db.get(Activity, activity["id"]).vendor_id
+    etag = edited.headers["etag"]
+    toggled = client.patch(f"/api/v1/admin/vendors/{vendor_id}/verify", headers=auth_headers(admin))
+    assert toggled.status_code == 200, toggled.text
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_missing_activity_is_still_a_404(client):
+    response = client.get("/api/v1/activities/999999")
+    assert response.status_code == 404
+    assert "etag" not in response.headers
+
+
+def test_new_etag_never_pairs_with_a_stale_cached_body(client, create_activity, db):
+    activity = create_activity()
+    url = f"/api/v1/activities/{activity['id']}"
+    etag = client.get(url).headers["etag"]
+
+    # Another worker's edit: updated_at moves but this worker's cache was not bumped.
+    db.get(Activity, activity["id"]).title = "Edited elsewhere"
+    db.commit()
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Edited elsewhere"
+
+
+def test_a_booking_moves_the_etag(client, create_activity, customer):
+    activity = create_activity()
+    url = f"/api/v1/activities/{activity['id']}"
+    first = client.get(url)
+    assert first.json()["total_bookings"] == 0
+
+    booking = client.post("/api/v1/bookings/", json={
+        "activity_id": activity["id"], "booking_date": str(date.today() + timedelta(days=7)), "adults": 1,
+    }, headers=auth_headers(customer))
+    assert booking.status_code == 201, booking.text
+
+    response = client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 200
+    assert response.json()["total_bookings"] == 1
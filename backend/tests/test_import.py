@@ -0,0 +1,39 @@
+"""Bulk NDJSON import (POST /activities/import)."""
+
+import json
+
+from app.models import Activity
+
+from tests.conftest import auth_headers
+
+
+def _import(client, vendor, *lines):
+    body = "\n".join(json.dumps(line) for line in lines)
+    response = client.post("/api/v1/activities/import", content=body, headers=auth_headers(vendor))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_child_only_change_stamps_the_activity(client, vendor, db):
+    line = {"slug": "fjord-cruise", "title": "Fjord cruise", "price_adult": "59.00",
+            "highlights": [{"text": "Waterfalls"}, {"text": "Seals"}]}
+    assert _import(client, vendor, line)["created"] == 1
+    activity = db.query(Activity).filter(Activity.slug == "fjord-cruise").one()
+    stamped = activity.updated_at or activity.created_at
+    etag = client.get(f"/api/v1/activities/{activity.id}").headers["etag"]
+
+    line["highlights"] = [{"text": "Waterfalls"}, {"text": "Puffins"}]
+    report = _import(client, vendor, line)
+    assert report["updated"] == 1
+    assert report["rows_written"]["activities"]["updated"] == 1
+
+    db.refresh(activity)
+    assert activity.updated_at is not None and activity.updated_at > stamped
+    refreshed = client.get(f"/api/v1/activities/{activity.id}", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert [h["text"] for h in refreshed.json()["highlights"]] == ["Waterfalls", "Puffins"]
+
+    # Unchanged re-import writes nothing, the activity row included.
+    report = _import(client, vendor, line)
+    assert report["unchanged"] == 1
+    assert report["rows_written"] == {}
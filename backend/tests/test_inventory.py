@@ -0,0 +1,59 @@
+"""Slot capacity (app.services.inventory)."""
+
+import threading
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.models import Activity, Availability
+from app.services.inventory import SoldOutError, reserve
+
+
+def test_concurrent_buyers_never_oversell_a_slot(create_activity, db):
+    buyers, capacity = 100, 10
+    activity_id = create_activity(max_group_size=capacity)["id"]
+    # No availability row yet: the first-use row creation races as well.
+    slot_date = date.today() + timedelta(days=7)
+
+    # Own pool, large enough that the buyers really run at the same time.
+    engine = create_engine(settings.DATABASE_URL, pool_size=40, max_overflow=0, pool_timeout=60)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    barrier = threading.Barrier(buyers)
+    outcomes = []  # list.append is atomic
+
+    def buyer() -> None:
+        barrier.wait()
+        session = Session()
+        try:
+            reserve(session, session.get(Activity, activity_id), slot_date, None, 1)
+            session.commit()
+            outcomes.append("sold")
+        except SoldOutError:
+            session.rollback()
+            outcomes.append("sold out")
+        except Exception as e:
+            session.rollback()
+            outcomes.append(repr(e))
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=buyer) for _ in range(buyers)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        engine.dispose()
+
+    slots = db.query(Availability).filter(
+        Availability.activity_id == activity_id, Availability.date == slot_date
+    ).all()
+    assert [outcome for outcome in outcomes if outcome not in ("sold", "sold out")] == []
+    assert len(slots) == 1
+    assert slots[0].spots_available >= 0
+    assert outcomes.count("sold") == capacity
+    assert outcomes.count("sold out") == buyers - capacity
+    assert slots[0].spots_available == 0
@@ -0,0 +1,142 @@
+"""Estimated totals and keyset cursors on the async list endpoints."""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from app.database import engine
+from app.models import Activity, Review
+from app.utils.pagination import decode_cursor, encode_cursor
+
+from tests.conftest import auth_headers, make_user
+
+
+@pytest.fixture
+def analyzed():
+    """ANALYZE the tables so planner estimates reflect the rows just written."""
+    def run() -> None:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("ANALYZE"))
+    return run
+
+
+def test_search_estimate_total(client, create_activity, analyzed):
+    for price in (10, 20, 30, 40):
+        create_activity(price_adult=price)
+    analyzed()
+
+    response = client.get("/api/v1/activities/search", params={"estimate_total": True, "max_price": 25})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["pagination"]["total_estimated"] is True
+    assert len(body["data"]) == 2
+    # The estimate is for the filtered query, not the whole table.
+    assert 1 <= body["pagination"]["total"] <= 3
+
+
+def test_activity_reviews_estimate_total(client, create_activity, db, analyzed):
+    activity = create_activity()
+    vendor_id = db.get(Activity, activity["id"]).vendor_id
+    for rating in (5, 4, 5, 3):
+        user = make_user(db)
+        db.add(Review(user_id=user.id, activity_id=activity["id"], vendor_id=vendor_id, rating=rating))
+    db.commit()
+    analyzed()
+
+    response = client.get(f"/api/v1/reviews/activity/{activity['id']}",
+                          params={"estimate_total": True, "rating": 5})
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["pagination"]["total_estimated"] is True
+    assert len(body["data"]) == 2
+    assert body["pagination"]["total"] >= 1
+
+
+def test_admin_reviews_estimate_total(client, create_activity, db, admin, analyzed):
+    # Sync (psycopg2) endpoint, same helper.
+    activity = create_activity()
+    vendor_id = db.get(Activity, activity["id"]).vendor_id
+    for rating in (5, 4):
+        user = make_user(db)
+        db.add(Review(user_id=user.id, activity_id=activity["id"], vendor_id=vendor_id, rating=rating))
+    db.commit()
+    analyzed()
+
+    response = client.get("/api/v1/admin/reviews", params={"estimate_total": True}, headers=auth_headers(admin))
+    assert response.status_code == 200, response.text
+    assert response.json()["pagination"]["total_estimated"] is True
+    assert len(response.json()["data"]) == 2
+
+
+def _walk(client, url, params, per_page=2):
+    """Ids of every row of a listing, page by page through next_cursor."""
+    ids, cursor = [], None
+    while True:
+        response = client.get(url, params={**params, "per_page": per_page, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        ids += [row["id"] for row in body["data"]]
+        cursor = body["pagination"]["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("sort_by", ["price_desc", "recommended"])
+def test_search_cursor_pages_match_the_offset_order(client, create_activity, sort_by):
+    # Ties on price (and on bestseller/rating/bookings for "recommended"),
+    # with keys sorting in both directions, exercise every branch of _after.
+    for price, bestseller in ((50, False), (50, True), (40, False), (40, False), (40, True), (30, False), (60, False)):
+        create_activity(price_adult=price, is_bestseller=bestseller)
+
+    everything = client.get("/api/v1/activities/search", params={"sort_by": sort_by, "per_page": 100}).json()["data"]
+    ids = _walk(client, "/api/v1/activities/search", {"sort_by": sort_by})
+    assert len(everything) == 7
+    assert ids == [row["id"] for row in everything]
+
+
+def test_review_cursor_pages_through_equal_timestamps(client, create_activity, db):
+    activity = create_activity()
+    vendor_id = db.get(Activity, activity["id"]).vendor_id
+    # One transaction: every created_at is the same now(), so only the id
+    # tie-breaker orders them.
+    for rating in (5, 4, 5, 3, 4):
+        user = make_user(db)
+        db.add(Review(user_id=user.id, activity_id=activity["id"], vendor_id=vendor_id, rating=rating))
+    db.commit()
+
+    url = f"/api/v1/reviews/activity/{activity['id']}"
+    for sort_by in ("recent", "rating", "helpful"):
+        ids = _walk(client, url, {"sort_by": sort_by})
+        assert len(ids) == len(set(ids)) == 5
+        everything = client.get(url, params={"sort_by": sort_by, "per_page": 100}).json()["data"]
+        assert ids == [row["id"] for row in everything]
+
+
+def test_cursor_round_trips_decimal_and_dates():
+    keys = [("price", None, False), ("created_at", None, True), ("day", None, False), ("id", None, False)]
+    values = [Decimal("49.90"), datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=timezone.utc), date(2026, 3, 1), 7]
+    decoded = decode_cursor(encode_cursor(keys, values), keys)
+    assert decoded == values
+    assert [type(value) for value in decoded] == [Decimal, datetime, date, int]
+
+
+def test_bad_cursors_are_rejected(client, create_activity):
+    for price in (10, 20, 30):
+        create_activity(price_adult=price)
+    url = "/api/v1/activities/search"
+    cursor = client.get(url, params={"sort_by": "price_desc", "per_page": 1}).json()["pagination"]["next_cursor"]
+    assert cursor
+
+    tampered = client.get(url, params={"sort_by": "price_desc", "cursor": cursor[:-3] + "!!!"})
+    assert tampered.status_code == 400
+    assert tampered.json()["detail"] == "Invalid cursor"
+
+    other_sort = client.get(url, params={"sort_by": "duration", "cursor": cursor})
+    assert other_sort.status_code == 400
+    assert other_sort.json()["detail"] == "Cursor does not match the requested sort order"
+
+    with pytest.raises(HTTPException):
+        decode_cursor("not-base64-json", [("id", None, False)])
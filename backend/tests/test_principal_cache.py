@@ -0,0 +1,41 @@
+"""Principal cache: hits skip the user lookup, committed user changes invalidate it."""
+
+from app.services.principal_cache import principal_cache
+
+from tests.conftest import auth_headers
+
+
+def _principal_loads(sql) -> int:
+    return sum(1 for statement in sql.statements if "LEFT OUTER JOIN vendors" in statement)
+
+
+def test_cached_principal_skips_the_lookup(client, customer, sql):
+    assert client.get("/api/v1/auth/me", headers=auth_headers(customer)).status_code == 200
+    sql.clear()
+    assert client.get("/api/v1/auth/me", headers=auth_headers(customer)).status_code == 200
+    assert _principal_loads(sql) == 0
+
+
+def test_committed_user_change_invalidates_the_principal(client, customer, db):
+    assert client.get("/api/v1/auth/me", headers=auth_headers(customer)).status_code == 200
+
+    # A write outside the admin endpoints, e.g. a script deactivating an account.
+    customer.is_active = False
+    db.commit()
+
+    response = client.get("/api/v1/auth/me", headers=auth_headers(customer))
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_rolled_back_change_keeps_the_entry(customer, db):
+    principal_cache.get(db, customer.id)
+    hits = principal_cache.hits
+
+    customer.full_name = "Not saved"
+    db.flush()
+    db.rollback()
+
+    principal_cache.get(db, customer.id)
+    assert principal_cache.hits == hits + 1
+
@@ -0,0 +1,49 @@
+"""Activity search (/activities/search)."""
+
+import pytest
+from sqlalchemy import event
+
+from app.database import engine
+from app.models.user import UserRole
+from app.services.principal_cache import principal_cache
+
+from tests.conftest import auth_headers, make_user
+
+
+@pytest.mark.parametrize("language", ["en", "zh"])
+def test_search_query_count_does_not_grow_with_page_size(client, create_activity, sql, language):
+    for _ in range(6):
+        create_activity()
+
+    counts = {}
+    for per_page in (1, 6):
+        sql.clear()
+        response = client.get("/api/v1/activities/search", params={"per_page": per_page, "language": language})
+        assert response.status_code == 200, response.text
+        assert len(response.json()["data"]) == per_page
+        counts[per_page] = len(sql)
+
+    assert counts[1] == counts[6]
+
+
+def test_search_stays_off_the_sync_pool(client, create_activity, vendor, db):
+    create_activity()
+    other = make_user(db, UserRole.VENDOR)
+    client.post("/api/v1/activities", json={"title": "Other tour", "price_adult": 30},
+                headers=auth_headers(other))
+
+    # Force the principal lookup to hit the database.
+    principal_cache.invalidate(vendor.id)
+    checkouts = []
+    record = lambda *args: checkouts.append(args)
+    event.listen(engine, "checkout", record)
+    try:
+        anonymous = client.get("/api/v1/activities/search")
+        own = client.get("/api/v1/activities/search", params={"vendor_only": True}, headers=auth_headers(vendor))
+    finally:
+        event.remove(engine, "checkout", record)
+
+    assert anonymous.status_code == own.status_code == 200
+    assert len(anonymous.json()["data"]) == 2
+    assert [a["title"] for a in own.json()["data"]] == ["Harbour tour 1"]
+    assert checkouts == []